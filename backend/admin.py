@@ -3,14 +3,16 @@
 import asyncio
 import sys
 
-from app.db import async_session
+from sqlalchemy import select
+
+from app.cache import invalidate_principal
+from app.db import SessionLocal, close_redis
 from app.models import User, UserRole
 
 
 async def promote_to_admin(email: str) -> None:
     """Promote a user to admin role by email."""
-    async with async_session() as session:
-        from sqlalchemy import select
+    async with SessionLocal() as session:
         result = await session.execute(select(User).where(User.email == email))
         user = result.scalar_one_or_none()
         if not user:
@@ -18,7 +20,10 @@ async def promote_to_admin(email: str) -> None:
             return
         user.role = UserRole.admin
         await session.commit()
-        print(f"User '{email}' promoted to admin.")
+    # Drop the cached principal so running API processes pick up the new role.
+    await invalidate_principal(user.id)
+    await close_redis()
+    print(f"User '{email}' promoted to admin.")
 
 
 if __name__ == "__main__":
@@ -1,13 +1,32 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import Any, Callable, TypeVar
 from uuid import UUID
 from passlib.context import CryptContext
 from jose import jwt
 
 from app.config import get_settings
+from app.metrics import increment
 
 pwd_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
 
+# bcrypt releases the GIL while it works, so a small thread pool runs hashes in
+# parallel without blocking the event loop; its size caps how many run at once.
+_hash_executor: ThreadPoolExecutor | None = None
+
+T = TypeVar('T')
+
+
+def _get_hash_executor() -> ThreadPoolExecutor:
+    global _hash_executor
+    if _hash_executor is None:
+        _hash_executor = ThreadPoolExecutor(
+            max_workers=get_settings().password_hash_workers,
+            thread_name_prefix='password-hash',
+        )
+    return _hash_executor
+
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
@@ -17,6 +36,45 @@ def verify_password(password: str, hashed: str) -> bool:
     return pwd_context.verify(password, hashed)
 
 
+async def _run_hashing(fn: Callable[..., T], *args: Any) -> T:
+    """Run ``fn`` on the hashing pool, tracking queued and running calls in app.metrics."""
+    started = False
+    increment('password_hash_queued', 1)
+
+    def _job() -> T:
+        nonlocal started
+        started = True
+        increment('password_hash_queued', -1)
+        increment('password_hash_running', 1)
+        try:
+            return fn(*args)
+        finally:
+            increment('password_hash_running', -1)
+
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_get_hash_executor(), _job)
+    except asyncio.CancelledError:
+        # Cancelled while still queued: the pool drops the call and _job never runs.
+        if not started:
+            increment('password_hash_queued', -1)
+        raise
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_hashing(hash_password, password)
+
+
+async def verify_password_async(password: str, hashed: str) -> bool:
+    return await _run_hashing(verify_password, password, hashed)
+
+
+def shutdown_hashing() -> None:
+    global _hash_executor
+    executor, _hash_executor = _hash_executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
 def create_access_token(*, user_id: UUID, email: str, role: str) -> str:
     settings = get_settings()
     expire = datetime.now(timezone.utc) + timedelta(minutes=settings.access_token_expire_minutes)
@@ -1,34 +1,436 @@
+import asyncio
 import json
-from typing import Any
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Awaitable, Callable
 
-from app.db import get_redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.db import SessionLocal, get_redis
+from app.metrics import increment
+
+logger = logging.getLogger(__name__)
 
 CACHE_TTL_SECONDS = 60
+# Extra lifetime during which an expired entry is still served while one caller refreshes it.
+STALE_TTL_SECONDS = 30
+FILL_LOCK_TTL_SECONDS = 5
+FILL_POLL_SECONDS = 0.05
+INVALIDATION_CHANNEL = 'cache:invalidate'
+GENERATION_KEY_PREFIX = 'jobs:gen:'
+PRINCIPAL_KEY_PREFIX = 'principal:'
+SCREENING_KEY_PREFIX = 'screening:result:'
+# Sorted set of screening result keys scored by last use, trimmed to the size cap.
+SCREENING_INDEX_KEY = 'screening:index'
+SCREENING_JOB_KEY_PREFIX = 'screening:job:'
+RESUME_TEXT_KEY_PREFIX = 'resume:text:'
+PLATFORM_ANALYTICS_SCOPE = 'platform-analytics'
+
+
+class LocalCache:
+    """Size-bounded, TTL-aware LRU kept in process memory in front of Redis."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl_seconds: float | None = None) -> None:
+        """Store ``value``; ``ttl_seconds`` can only shorten the cache-wide TTL."""
+        if self.max_entries <= 0:
+            return
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        evicted = 0
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+        if evicted:
+            increment('cache_l1_evictions', evicted)
+
+    def invalidate_prefix(self, prefix: str) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_settings = get_settings()
+local_cache = LocalCache(_settings.cache_l1_max_entries, _settings.cache_l1_ttl_seconds)
+
+
+async def _store_raw(key: str, payload: bytes, ttl: int = CACHE_TTL_SECONDS) -> None:
+    local_cache.set(key, payload)
+    try:
+        await get_redis().setex(key, ttl + STALE_TTL_SECONDS, payload)
+    except Exception:
+        return None
+
+
+Compute = Callable[[AsyncSession], Awaitable[bytes | None]]
+
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+_inflight: dict[str, asyncio.Future] = {}
+_refresh_tasks: set[asyncio.Task] = set()
+
+
+def _fresh_for(ttl_ms: int) -> float:
+    """Seconds left in an entry's fresh window given its Redis PTTL; zero or less once stale."""
+    return float('inf') if ttl_ms < 0 else ttl_ms / 1000 - STALE_TTL_SECONDS
+
+
+def _promote(key: str, payload: bytes, fresh_for: float) -> None:
+    """Copy a Redis entry into L1 without outliving its fresh window there."""
+    if fresh_for > 0:
+        local_cache.set(key, payload, ttl_seconds=fresh_for)
 
 
-async def get_cached(key: str) -> Any | None:
+async def _read_with_freshness(key: str) -> tuple[bytes | None, bool]:
+    """Serialized payload for ``key`` and whether it is still inside its fresh window."""
+    payload = local_cache.get(key)
+    if payload is not None:
+        increment('cache_l1_hits', 1)
+        return payload, True
+    increment('cache_l1_misses', 1)
+    try:
+        async with get_redis().pipeline(transaction=False) as pipe:
+            pipe.get(key)
+            pipe.pttl(key)
+            raw, ttl_ms = await pipe.execute()
+        if not raw:
+            return None, False
+    except Exception:
+        return None, False
+    payload = raw.encode()
+    fresh_for = _fresh_for(ttl_ms)
+    _promote(key, payload, fresh_for)
+    return payload, fresh_for > 0
+
+
+async def _single_flight(key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+    """Run ``factory`` once per key in this process; concurrent callers await the same result."""
+    future = _inflight.get(key)
+    if future is not None:
+        increment('cache_coalesced', 1)
+        return await asyncio.shield(future)
+    task = asyncio.ensure_future(factory())
+    _inflight[key] = task
+    task.add_done_callback(lambda _: _inflight.pop(key, None))
+    return await asyncio.shield(task)
+
+
+async def _fill(key: str, compute: Compute, ttl: int = CACHE_TTL_SECONDS) -> bytes | None:
+    """Compute and store ``key``, letting only one process hit the database at a time.
+
+    ``compute`` runs on a session of its own: callers coalesced onto this fill
+    must not depend on whichever request happened to start it. Losers of the
+    Redis lock poll for a fresh value from the winner. Once the lock is gone
+    without one (the winner found nothing to cache, or failed), or it never
+    shows up within the lock TTL, they compute it themselves.
+    """
+    lock_key = f'lock:{key}'
+    token = uuid.uuid4().hex
+    try:
+        redis_client = get_redis()
+        acquired = bool(await redis_client.set(lock_key, token, nx=True, ex=FILL_LOCK_TTL_SECONDS))
+    except Exception:
+        redis_client, acquired = None, False
+    if redis_client is not None and not acquired:
+        deadline = time.monotonic() + FILL_LOCK_TTL_SECONDS
+        while time.monotonic() < deadline:
+            await asyncio.sleep(FILL_POLL_SECONDS)
+            try:
+                async with redis_client.pipeline(transaction=True) as pipe:
+                    pipe.get(key)
+                    pipe.pttl(key)
+                    pipe.exists(lock_key)
+                    raw, ttl_ms, locked = await pipe.execute()
+            except Exception:
+                break
+            # A stale entry is what a refresh is replacing; keep waiting for the new one.
+            fresh_for = _fresh_for(ttl_ms)
+            if raw and fresh_for > 0:
+                increment('cache_coalesced', 1)
+                payload = raw.encode()
+                _promote(key, payload, fresh_for)
+                return payload
+            if not locked:
+                break
+    try:
+        async with SessionLocal() as session:
+            payload = await compute(session)
+        if payload is not None:
+            await _store_raw(key, payload, ttl)
+        return payload
+    finally:
+        if acquired:
+            try:
+                await redis_client.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+            except Exception:
+                logger.warning('Failed to release cache fill lock %s', lock_key, exc_info=True)
+
+
+def _schedule_refresh(key: str, compute: Compute, ttl: int) -> None:
+    if key in _inflight:
+        return
+    task = asyncio.ensure_future(_single_flight(key, lambda: _fill(key, compute, ttl)))
+    _refresh_tasks.add(task)
+
+    def _done(finished: asyncio.Task) -> None:
+        _refresh_tasks.discard(finished)
+        if not finished.cancelled() and finished.exception() is not None:
+            logger.warning('Background cache refresh failed for %s', key, exc_info=finished.exception())
+
+    task.add_done_callback(_done)
+
+
+async def get_or_compute(key: str, compute: Compute, ttl: int = CACHE_TTL_SECONDS) -> bytes | None:
+    """Cached JSON payload for ``key``, computing it with ``compute(session)`` on a miss.
+
+    Payloads are stored and returned as already-serialized bytes so callers can
+    hand them to the client without decoding or re-validating anything.
+
+    Concurrent misses share one computation per process and, through a short
+    Redis lock, one per cluster. Entries past their TTL but inside the stale
+    window are returned immediately while a single background task refreshes
+    them. ``compute`` always gets a dedicated session, never the caller's.
+    ``None`` results are returned but not cached. ``ttl`` is the fresh
+    lifetime in seconds.
+    """
+    payload, fresh = await _read_with_freshness(key)
+    if payload is not None:
+        if not fresh:
+            increment('cache_stale_served', 1)
+            _schedule_refresh(key, compute, ttl)
+        return payload
+    return await _single_flight(key, lambda: _fill(key, compute, ttl))
+
+
+async def get_principal(user_id: str) -> dict | None:
+    """Cached ``{'email', 'role'}`` for an authenticated user, or None on a miss."""
+    key = f'{PRINCIPAL_KEY_PREFIX}{user_id}'
+    principal = local_cache.get(key)
+    if principal is not None:
+        increment('principal_cache_hits', 1)
+        return principal
+    try:
+        raw = await get_redis().get(key)
+    except Exception:
+        raw = None
+    if not raw:
+        increment('principal_cache_misses', 1)
+        return None
+    principal = json.loads(raw)
+    local_cache.set(key, principal)
+    increment('principal_cache_hits', 1)
+    return principal
+
+
+async def set_principal(user_id: str, principal: dict) -> None:
+    key = f'{PRINCIPAL_KEY_PREFIX}{user_id}'
+    local_cache.set(key, principal)
+    try:
+        await get_redis().setex(key, _settings.principal_cache_ttl_seconds, json.dumps(principal))
+    except Exception:
+        return None
+
+
+async def invalidate_principal(user_id: Any) -> None:
+    """Forget a cached principal everywhere; call after changing a user's role or email."""
+    key = f'{PRINCIPAL_KEY_PREFIX}{user_id}'
+    local_cache.invalidate_prefix(key)
+    try:
+        async with get_redis().pipeline(transaction=False) as pipe:
+            pipe.delete(key)
+            pipe.publish(INVALIDATION_CHANNEL, key)
+            await pipe.execute()
+    except Exception:
+        logger.warning('Failed to invalidate principal %s', user_id, exc_info=True)
+
+
+async def get_screening_result(digest: str) -> dict | None:
+    """Cached screening result for a content digest, or None on a miss."""
+    if _settings.screening_cache_ttl_seconds <= 0:
+        return None
+    key = f'{SCREENING_KEY_PREFIX}{digest}'
     try:
         redis_client = get_redis()
         raw = await redis_client.get(key)
-        if not raw:
-            return None
-        return json.loads(raw)
+        if raw:
+            await redis_client.zadd(SCREENING_INDEX_KEY, {key: time.time()}, xx=True)
     except Exception:
+        raw = None
+    if not raw:
+        increment('screening_cache_misses', 1)
         return None
+    increment('screening_cache_hits', 1)
+    return json.loads(raw)
 
 
-async def set_cached(key: str, value: Any) -> None:
+async def set_screening_result(digest: str, job_id: Any, result: dict) -> None:
+    """Store a screening result, evicting the least recently used entries past the size cap."""
+    ttl = _settings.screening_cache_ttl_seconds
+    if ttl <= 0:
+        return None
+    key = f'{SCREENING_KEY_PREFIX}{digest}'
+    job_key = f'{SCREENING_JOB_KEY_PREFIX}{job_id}'
     try:
         redis_client = get_redis()
-        await redis_client.setex(key, CACHE_TTL_SECONDS, json.dumps(value))
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.setex(key, ttl, json.dumps(result))
+            pipe.zadd(SCREENING_INDEX_KEY, {key: time.time()})
+            pipe.sadd(job_key, key)
+            pipe.expire(job_key, ttl)
+            pipe.zcard(SCREENING_INDEX_KEY)
+            *_, size = await pipe.execute()
+        overflow = size - _settings.screening_cache_max_entries
+        if overflow > 0:
+            evicted = await redis_client.zpopmin(SCREENING_INDEX_KEY, overflow)
+            await redis_client.delete(*[evicted_key for evicted_key, _ in evicted])
+            increment('screening_cache_evictions', len(evicted))
     except Exception:
         return None
 
 
-async def invalidate_jobs_cache() -> None:
+async def invalidate_screening_results(job_id: Any) -> None:
+    """Drop every cached screening result produced for a job; call after its scored fields change."""
+    job_key = f'{SCREENING_JOB_KEY_PREFIX}{job_id}'
     try:
         redis_client = get_redis()
-        async for key in redis_client.scan_iter(match='jobs:*'):
-            await redis_client.delete(key)
+        keys = list(await redis_client.smembers(job_key))
+        async with redis_client.pipeline(transaction=False) as pipe:
+            if keys:
+                pipe.delete(*keys)
+                pipe.zrem(SCREENING_INDEX_KEY, *keys)
+            pipe.delete(job_key)
+            await pipe.execute()
+    except Exception:
+        logger.warning('Failed to invalidate screening results for job %s', job_id, exc_info=True)
+
+
+async def get_resume_text(digest: str) -> str | None:
+    """Cached text extracted from a resume with this content digest, or None on a miss."""
+    if _settings.resume_text_cache_ttl_seconds <= 0:
+        return None
+    try:
+        raw = await get_redis().get(f'{RESUME_TEXT_KEY_PREFIX}{digest}')
     except Exception:
+        raw = None
+    if raw is None:
+        increment('resume_text_cache_misses', 1)
+        return None
+    increment('resume_text_cache_hits', 1)
+    return raw.decode() if isinstance(raw, bytes) else raw
+
+
+async def set_resume_text(digest: str, text: str) -> None:
+    ttl = _settings.resume_text_cache_ttl_seconds
+    if ttl <= 0:
         return None
+    try:
+        await get_redis().setex(f'{RESUME_TEXT_KEY_PREFIX}{digest}', ttl, text)
+    except Exception:
+        return None
+
+
+def jobs_cache_scope(role: str, user_id: str) -> str:
+    """Generation scope a caller's job keys live in.
+
+    Applicants share the ``global`` scope (active jobs only), employers get a
+    scope of their own and admins, who see every job, share ``admin``.
+    """
+    if role == 'employer':
+        return f'employer:{user_id}'
+    if role == 'admin':
+        return 'admin'
+    return 'global'
+
+
+async def get_generation(scope: str) -> int:
+    """Current generation for a scope; folded into cache keys so a bump orphans old entries."""
+    key = f'{GENERATION_KEY_PREFIX}{scope}'
+    generation = local_cache.get(key)
+    if generation is not None:
+        return generation
+    try:
+        generation = int(await get_redis().get(key) or 0)
+    except Exception:
+        return 0
+    local_cache.set(key, generation)
+    return generation
+
+
+async def invalidate_jobs_cache(employer_id: Any = None, public: bool = True) -> None:
+    """Bump the generations affected by a job change.
+
+    The owning employer's and the admin scope always move; the shared applicant
+    scope only moves when the job is (or was) visible to applicants. Entries
+    under old generations are never read again and expire via their TTL.
+    """
+    scopes = ['admin']
+    if employer_id is not None:
+        scopes.append(f'employer:{employer_id}')
+    if public:
+        scopes.append('global')
+    await _bump_generations(scopes)
+
+
+async def invalidate_platform_analytics() -> None:
+    """Orphan cached admin analytics; call after the platform views are refreshed."""
+    await _bump_generations([PLATFORM_ANALYTICS_SCOPE])
+
+
+async def _bump_generations(scopes: list[str]) -> None:
+    keys = [f'{GENERATION_KEY_PREFIX}{scope}' for scope in scopes]
+    for key in keys:
+        local_cache.invalidate_prefix(key)
+    try:
+        redis_client = get_redis()
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.incr(key)
+                pipe.publish(INVALIDATION_CHANNEL, key)
+            await pipe.execute()
+    except Exception:
+        return None
+
+
+async def listen_for_invalidations() -> None:
+    """Drop local entries whenever any process publishes an invalidation prefix."""
+    pubsub = get_redis().pubsub()
+    await pubsub.subscribe(INVALIDATION_CHANNEL)
+    try:
+        async for message in pubsub.listen():
+            if message.get('type') == 'message':
+                local_cache.invalidate_prefix(message['data'])
+    finally:
+        await pubsub.unsubscribe(INVALIDATION_CHANNEL)
+        await pubsub.close()
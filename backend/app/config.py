@@ -12,6 +12,42 @@ class Settings(BaseSettings):
     access_token_expire_minutes: int = Field(default=60, alias='ACCESS_TOKEN_EXPIRE_MINUTES')
     env: str = Field(default='dev', alias='ENV')
     cors_origins: str = Field(default='http://localhost:5173', alias='CORS_ORIGINS')
+    count_cache_ttl_seconds: int = Field(default=30, alias='COUNT_CACHE_TTL_SECONDS')
+    cache_l1_max_entries: int = Field(default=1024, alias='CACHE_L1_MAX_ENTRIES')
+    cache_l1_ttl_seconds: float = Field(default=5.0, alias='CACHE_L1_TTL_SECONDS')
+    principal_cache_ttl_seconds: int = Field(default=60, alias='PRINCIPAL_CACHE_TTL_SECONDS')
+    # Build the principal from the signed token's claims without any lookup; role
+    # changes then only apply once the user's existing tokens expire.
+    auth_trust_token_role: bool = Field(default=False, alias='AUTH_TRUST_TOKEN_ROLE')
+    password_hash_workers: int = Field(default=4, alias='PASSWORD_HASH_WORKERS')
+    # Run a queue consumer inside each API process instead of `python -m app.worker`.
+    embedded_worker: bool = Field(default=False, alias='EMBEDDED_WORKER')
+    worker_processes: int = Field(default=1, alias='WORKER_PROCESSES')
+    worker_concurrency: int = Field(default=1, alias='WORKER_CONCURRENCY')
+    worker_batch_size: int = Field(default=10, alias='WORKER_BATCH_SIZE')
+    # Comma-separated per-type caps, e.g. 'application.screen_resume=2'.
+    worker_type_concurrency: str = Field(default='', alias='WORKER_TYPE_CONCURRENCY')
+    # Track claimed tasks in per-worker processing lists (BLMOVE) so a crash can't lose them.
+    queue_reliable: bool = Field(default=False, alias='QUEUE_RELIABLE')
+    queue_visibility_timeout_seconds: int = Field(default=300, alias='QUEUE_VISIBILITY_TIMEOUT_SECONDS')
+    queue_reap_interval_seconds: float = Field(default=15.0, alias='QUEUE_REAP_INTERVAL_SECONDS')
+    # Comma-separated delay per retry attempt; the last value repeats.
+    worker_retry_backoff_seconds: str = Field(default='1,4,10', alias='WORKER_RETRY_BACKOFF_SECONDS')
+    # Each delay is scaled by a random factor in [1 - jitter, 1 + jitter].
+    worker_retry_jitter: float = Field(default=0.25, alias='WORKER_RETRY_JITTER')
+    worker_max_retries: int = Field(default=3, alias='WORKER_MAX_RETRIES')
+    worker_promote_interval_seconds: float = Field(default=1.0, alias='WORKER_PROMOTE_INTERVAL_SECONDS')
+    worker_shutdown_timeout_seconds: float = Field(default=30.0, alias='WORKER_SHUTDOWN_TIMEOUT_SECONDS')
+    # Seconds between a consumer publishing its metrics to Redis for /admin/metrics; 0 disables.
+    worker_metrics_publish_seconds: float = Field(default=10.0, alias='WORKER_METRICS_PUBLISH_SECONDS')
+    db_pool_size: int = Field(default=5, alias='DB_POOL_SIZE')
+    db_max_overflow: int = Field(default=10, alias='DB_MAX_OVERFLOW')
+    db_pool_timeout_seconds: float = Field(default=30.0, alias='DB_POOL_TIMEOUT_SECONDS')
+    db_pool_pre_ping: bool = Field(default=False, alias='DB_POOL_PRE_PING')
+    db_pool_recycle_seconds: int = Field(default=-1, alias='DB_POOL_RECYCLE_SECONDS')
+    # Set when DATABASE_URL points at PgBouncer in transaction pooling mode, where
+    # server-side prepared statements can't outlive a single transaction.
+    db_pgbouncer_mode: bool = Field(default=False, alias='DB_PGBOUNCER_MODE')
 
     # AI Screening settings
     ai_provider: str = Field(default='openai', alias='AI_PROVIDER')  # 'anthropic' or 'openai'
@@ -19,6 +55,37 @@ class Settings(BaseSettings):
     openai_api_key: str = Field(default='', alias='OPENAI_API_KEY')
     ai_screening_model: str = Field(default='', alias='AI_SCREENING_MODEL')
     ai_screening_enabled: bool = Field(default=True, alias='AI_SCREENING_ENABLED')
+    # Provider budget shared through Redis by every process making screening calls; 0 disables a bucket.
+    ai_requests_per_minute: int = Field(default=500, alias='AI_REQUESTS_PER_MINUTE')
+    ai_tokens_per_minute: int = Field(default=200_000, alias='AI_TOKENS_PER_MINUTE')
+    # AIMD bounds on concurrent provider calls, per process. A worker only has more than
+    # one call in flight when WORKER_CONCURRENCY (or a batch of screenings) allows it.
+    ai_initial_concurrency: int = Field(default=4, alias='AI_INITIAL_CONCURRENCY')
+    ai_min_concurrency: int = Field(default=1, alias='AI_MIN_CONCURRENCY')
+    ai_max_concurrency: int = Field(default=16, alias='AI_MAX_CONCURRENCY')
+    # Reuse results for identical resume/job/model/prompt content; 0 disables the cache.
+    screening_cache_ttl_seconds: int = Field(default=7 * 24 * 3600, alias='SCREENING_CACHE_TTL_SECONDS')
+    screening_cache_max_entries: int = Field(default=50_000, alias='SCREENING_CACHE_MAX_ENTRIES')
+    # Optional override for the provider endpoint, e.g. an OpenAI-compatible gateway.
+    ai_base_url: str = Field(default='', alias='AI_BASE_URL')
+    ai_max_connections: int = Field(default=20, alias='AI_MAX_CONNECTIONS')
+    ai_max_keepalive_connections: int = Field(default=10, alias='AI_MAX_KEEPALIVE_CONNECTIONS')
+    ai_timeout_seconds: float = Field(default=60.0, alias='AI_TIMEOUT_SECONDS')
+    ai_connect_timeout_seconds: float = Field(default=5.0, alias='AI_CONNECT_TIMEOUT_SECONDS')
+    # Resumes scored per provider call when screening several applications to one job; 1 disables batching.
+    ai_screening_batch_size: int = Field(default=1, alias='AI_SCREENING_BATCH_SIZE')
+    # Queued tasks beyond which employer rescreens stop enqueueing more work; fresh submissions are always queued.
+    screening_max_backlog: int = Field(default=1000, alias='SCREENING_MAX_BACKLOG')
+    # PDF resume extraction runs in a process pool; pages past the limit are ignored.
+    resume_max_bytes: int = Field(default=5 * 1024 * 1024, alias='RESUME_MAX_BYTES')
+    resume_max_pages: int = Field(default=10, alias='RESUME_MAX_PAGES')
+    resume_parse_timeout_seconds: float = Field(default=10.0, alias='RESUME_PARSE_TIMEOUT_SECONDS')
+    resume_parse_workers: int = Field(default=2, alias='RESUME_PARSE_WORKERS')
+    resume_text_cache_ttl_seconds: int = Field(default=24 * 3600, alias='RESUME_TEXT_CACHE_TTL_SECONDS')
+    # Seconds between passes that rebuild employer analytics rollups from the base tables; 0 disables.
+    analytics_reconcile_interval_seconds: float = Field(default=3600.0, alias='ANALYTICS_RECONCILE_INTERVAL_SECONDS')
+    # Seconds between refreshes of the admin platform analytics views; 0 disables.
+    platform_analytics_refresh_seconds: float = Field(default=900.0, alias='PLATFORM_ANALYTICS_REFRESH_SECONDS')
 
     @property
     def effective_ai_model(self) -> str:
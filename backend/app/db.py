@@ -1,17 +1,68 @@
-from typing import AsyncGenerator
+import time
+import uuid
+from typing import Any, AsyncGenerator
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 import redis.asyncio as redis
 
-from app.config import get_settings
+from app.config import Settings, get_settings
+from app.metrics import increment, register_gauge
 
 
 class Base(DeclarativeBase):
     pass
 
 
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection.
+
+    Times the public ``Pool.connect()`` entry point that every engine checkout
+    goes through, which covers queueing for a free slot as well as opening an
+    overflow connection.
+    """
+
+    def connect(self):
+        start = time.perf_counter_ns()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            increment('db_pool_timeouts', 1)
+            raise
+        finally:
+            increment('db_pool_wait_us', (time.perf_counter_ns() - start) // 1000)
+        increment('db_pool_checkouts', 1)
+        return connection
+
+
+def engine_options(settings: Settings) -> dict[str, Any]:
+    options: dict[str, Any] = {
+        'echo': False,
+        'future': True,
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': settings.db_pool_size,
+        'max_overflow': settings.db_max_overflow,
+        'pool_timeout': settings.db_pool_timeout_seconds,
+        'pool_pre_ping': settings.db_pool_pre_ping,
+        'pool_recycle': settings.db_pool_recycle_seconds,
+    }
+    if settings.db_pgbouncer_mode:
+        # PgBouncer may run each transaction on a different server connection, so
+        # turn off both statement caches and give every statement a unique name.
+        options['connect_args'] = {
+            'statement_cache_size': 0,
+            'prepared_statement_cache_size': 0,
+            'prepared_statement_name_func': lambda: f'__asyncpg_{uuid.uuid4()}__',
+        }
+    return options
+
+
 settings = get_settings()
-engine = create_async_engine(settings.database_url, echo=False, future=True)
+engine = create_async_engine(settings.database_url, **engine_options(settings))
+register_gauge('db_pool_size', engine.pool.size)
+register_gauge('db_pool_checked_out', engine.pool.checkedout)
+register_gauge('db_pool_overflow', engine.pool.overflow)
 SessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
 redis_client: redis.Redis | None = None
@@ -5,6 +5,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
+from app.cache import get_principal, set_principal
 from app.config import get_settings
 from app.db import get_session
 from app.models import User, UserRole
@@ -16,6 +17,30 @@ async def get_current_user(
     request: Request,
     credentials: HTTPAuthorizationCredentials | None = Depends(security),
     session: AsyncSession = Depends(get_session),
+) -> User:
+    """The caller, taken from the token's claims when AUTH_TRUST_TOKEN_ROLE allows it.
+
+    Trusted claims can outlive a deleted or demoted user until the token
+    expires; endpoints where that matters use ``get_verified_user``.
+    """
+    return await _authenticate(request, credentials, session, verify=False)
+
+
+async def get_verified_user(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials | None = Depends(security),
+    session: AsyncSession = Depends(get_session),
+) -> User:
+    """The caller as currently stored, never just the token's claims."""
+    return await _authenticate(request, credentials, session, verify=True)
+
+
+async def _authenticate(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials | None,
+    session: AsyncSession,
+    *,
+    verify: bool,
 ) -> User:
     if credentials is None or credentials.scheme.lower() != 'bearer':
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Not authenticated')
@@ -30,17 +55,50 @@ async def get_current_user(
     user_id = payload.get('sub')
     if not user_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Invalid token')
+    try:
+        user_uuid = UUID(user_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Invalid token') from exc
 
-    result = await session.execute(select(User).where(User.id == UUID(user_id)))
-    user = result.scalar_one_or_none()
+    trusted = not verify and settings.auth_trust_token_role and payload.get('role') in UserRole.__members__
+    if trusted:
+        user = User(id=user_uuid, email=payload.get('email'), role=UserRole(payload['role']))
+    else:
+        user = await _load_principal(session, user_uuid)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='User not found')
     request.state.user_id = str(user.id)
+    request.state.principal_verified = not trusted
+    return user
+
+
+async def _load_principal(session: AsyncSession, user_id: UUID) -> User | None:
+    """The caller as a detached ``User`` carrying id, email and role.
+
+    Served from the principal cache when possible; only a miss reads Postgres.
+    Callers must not rely on other columns or relationships being loaded.
+    """
+    principal = await get_principal(str(user_id))
+    if principal is not None:
+        return User(id=user_id, email=principal['email'], role=UserRole(principal['role']))
+    result = await session.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
+    if user:
+        await set_principal(str(user_id), {'email': user.email, 'role': user.role.value})
     return user
 
 
 def require_roles(*roles: UserRole):
-    async def _require_roles(user: User = Depends(get_current_user)) -> User:
+    async def _require_roles(
+        request: Request,
+        user: User = Depends(get_current_user),
+        session: AsyncSession = Depends(get_session),
+    ) -> User:
+        # Admin access is never granted on token claims alone, so revoking it takes effect at once.
+        if user.role == UserRole.admin and not request.state.principal_verified:
+            user = await _load_principal(session, user.id)
+            if not user:
+                raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='User not found')
         if user.role not in roles:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail='Forbidden')
         return user
@@ -9,9 +9,12 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 
+from app.auth import shutdown_hashing
 from app.config import get_settings
 from app.db import close_redis, init_redis
 from app.metrics import increment
+from app.services.resumes import shutdown_resume_parser
+from app.services.screening import close_clients
 from app.utils import get_request_id, log_event
 from routers import router as api_router
 
@@ -31,20 +34,39 @@ async def lifespan(app: FastAPI):
         from app.db import get_redis
         redis_client = get_redis()
         await redis_client.ping()
-        from app.worker import process_once
-        async def _worker_loop():
+        if settings.embedded_worker:
+            from app.worker import process_once, start_background_loops
+            start_background_loops()
+            async def _worker_loop():
+                while True:
+                    try:
+                        await process_once()
+                    except Exception:
+                        await asyncio.sleep(30)
+            asyncio.create_task(_worker_loop())
+            logger.info('Embedded background worker started (Redis available)')
+        else:
+            logger.info('Background worker not embedded; run `python -m app.worker` to consume the queue')
+
+        from app.cache import listen_for_invalidations
+        async def _invalidation_loop():
             while True:
                 try:
-                    await process_once()
+                    await listen_for_invalidations()
+                except asyncio.CancelledError:
+                    raise
                 except Exception:
-                    await asyncio.sleep(30)
-        asyncio.create_task(_worker_loop())
-        logger.info('Background worker started (Redis available)')
+                    logger.warning('Cache invalidation listener disconnected', exc_info=True)
+                    await asyncio.sleep(1)
+        asyncio.create_task(_invalidation_loop())
     except Exception:
-        logger.warning('Redis unavailable — background worker disabled. AI screening runs inline.')
+        logger.warning('Redis unavailable — background worker disabled. AI screenings stay pending until it is back.')
     yield
     # Shutdown
     await close_redis()
+    shutdown_hashing()
+    await close_clients()
+    shutdown_resume_parser()
 
 
 app = FastAPI(title='HireTrack API', lifespan=lifespan)
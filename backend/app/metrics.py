@@ -1,4 +1,10 @@
+import os
+import socket
 from threading import Lock
+from typing import Any, Callable
+
+# Hashes of per-process snapshots published by queue consumers, one per process.
+PROCESS_SNAPSHOT_KEY_PREFIX = 'metrics:process:'
 
 
 _counters = {
@@ -6,7 +12,34 @@ _counters = {
     'error_requests': 0,
     'application_submissions': 0,
     'status_transitions': 0,
+    'cache_l1_hits': 0,
+    'cache_l1_misses': 0,
+    'cache_l1_evictions': 0,
+    'cache_coalesced': 0,
+    'cache_stale_served': 0,
+    'principal_cache_hits': 0,
+    'principal_cache_misses': 0,
+    'password_hash_queued': 0,
+    'password_hash_running': 0,
+    'queue_redelivered': 0,
+    'screening_llm_calls': 0,
+    'screening_batch_fallbacks': 0,
+    'screening_throttled': 0,
+    'screening_cache_hits': 0,
+    'screening_cache_misses': 0,
+    'screening_cache_evictions': 0,
+    'resume_text_cache_hits': 0,
+    'resume_text_cache_misses': 0,
+    'resume_parse_timeouts': 0,
+    'resume_parse_ms': 0,
+    'analytics_rollup_corrections': 0,
+    'platform_views_refreshed': 0,
+    'db_pool_checkouts': 0,
+    'db_pool_timeouts': 0,
+    'db_pool_wait_us': 0,
 }
+_gauges: dict[str, Callable[[], float | None]] = {}
+_shared_gauges: set[str] = set()
 _lock = Lock()
 
 
@@ -15,6 +48,68 @@ def increment(name: str, value: int = 1) -> None:
         _counters[name] = _counters.get(name, 0) + value
 
 
+def register_gauge(name: str, read: Callable[[], float | None], shared: bool = False) -> None:
+    """Report ``read()`` under ``name`` in every snapshot, for values sampled rather than counted.
+
+    A ``read`` returning None leaves the gauge out. ``shared`` marks readings of
+    state all processes see (the Redis token buckets), which ``merge`` doesn't add up.
+    """
+    _gauges[name] = read
+    if shared:
+        _shared_gauges.add(name)
+
+
 def snapshot() -> dict:
     with _lock:
-        return dict(_counters)
+        data = dict(_counters)
+    for name, read in _gauges.items():
+        value = read()
+        if value is not None:
+            data[name] = value
+    return data
+
+
+def _process_key() -> str:
+    return f'{PROCESS_SNAPSHOT_KEY_PREFIX}{socket.gethostname()}:{os.getpid()}'
+
+
+def _number(raw: str) -> float:
+    value = float(raw)
+    return int(value) if value.is_integer() else value
+
+
+async def publish(redis_client: Any, ttl_seconds: int) -> None:
+    """Store this process's snapshot in Redis until ``ttl_seconds`` pass without another publish."""
+    key = _process_key()
+    async with redis_client.pipeline(transaction=True) as pipe:
+        pipe.delete(key)
+        pipe.hset(key, mapping=snapshot())
+        pipe.expire(key, ttl_seconds)
+        await pipe.execute()
+
+
+async def published_snapshots(redis_client: Any) -> list[dict]:
+    """Snapshots other live processes have published; this process's own is left out."""
+    own = _process_key()
+    keys = [key async for key in redis_client.scan_iter(match=f'{PROCESS_SNAPSHOT_KEY_PREFIX}*') if key != own]
+    if not keys:
+        return []
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for key in keys:
+            pipe.hgetall(key)
+        hashes = await pipe.execute()
+    return [{name: _number(value) for name, value in fields.items()} for fields in hashes if fields]
+
+
+def merge(local: dict, others: list[dict]) -> dict:
+    """Add up counters and gauges across processes; shared gauges keep the lowest reading."""
+    merged = dict(local)
+    for other in others:
+        for name, value in other.items():
+            if name not in merged:
+                merged[name] = value
+            elif name in _shared_gauges:
+                merged[name] = min(merged[name], value)
+            else:
+                merged[name] += value
+    return merged
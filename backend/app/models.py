@@ -1,11 +1,12 @@
 import enum
 import uuid
-from datetime import datetime
-from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Index, Integer, String, Text, UniqueConstraint, func
-from sqlalchemy.dialects.postgresql import JSONB, UUID
+from datetime import date, datetime
+from sqlalchemy import DDL, BigInteger, Boolean, Computed, Date, DateTime, Enum, ForeignKey, Index, Integer, String, Text, UniqueConstraint, bindparam, event, func, literal_column, text
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db import Base
+from app.platform_views import PLATFORM_VIEWS
 
 
 class UserRole(str, enum.Enum):
@@ -47,6 +48,13 @@ class ScreeningRecommendation(str, enum.Enum):
     weak_match = 'weak_match'
 
 
+# Title matches rank above description matches (weight A vs. B).
+JOB_SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+
+
 class User(Base):
     __tablename__ = 'users'
 
@@ -61,9 +69,14 @@ class User(Base):
 
 class Job(Base):
     __tablename__ = 'jobs'
+    __table_args__ = (
+        Index('ix_jobs_status_created_at_id', 'status', 'created_at', 'id'),
+        Index('ix_jobs_employer_id_created_at_id', 'employer_id', 'created_at', 'id'),
+        Index('ix_jobs_search_vector', 'search_vector', postgresql_using='gin'),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    employer_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey('users.id'), index=True, nullable=False)
+    employer_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
     title: Mapped[str] = mapped_column(Text, nullable=False)
     company: Mapped[str] = mapped_column(Text, nullable=False)
     location: Mapped[str] = mapped_column(Text, nullable=False)
@@ -72,6 +85,11 @@ class Job(Base):
     remote: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     status: Mapped[JobStatus] = mapped_column(Enum(JobStatus, name='job_status'), default=JobStatus.active, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(JOB_SEARCH_VECTOR_SQL, persisted=True),
+        deferred=True,
+    )
 
     employer = relationship('User', back_populates='jobs')
     applications = relationship('Application', back_populates='job', cascade='all, delete-orphan')
@@ -81,8 +99,9 @@ class Application(Base):
     __tablename__ = 'applications'
     __table_args__ = (
         UniqueConstraint('job_id', 'applicant_id', name='uq_applications_job_applicant'),
-        Index('ix_applications_job_id', 'job_id'),
-        Index('ix_applications_applicant_id', 'applicant_id'),
+        Index('ix_applications_job_id_created_at_id', 'job_id', 'created_at', 'id'),
+        Index('ix_applications_job_id_status_created_at_id', 'job_id', 'status', 'created_at', 'id'),
+        Index('ix_applications_applicant_id_created_at_id', 'applicant_id', 'created_at', 'id'),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -91,16 +110,27 @@ class Application(Base):
     resume_text: Mapped[str] = mapped_column(Text, nullable=False)
     cover_letter: Mapped[str | None] = mapped_column(Text, nullable=True)
     status: Mapped[ApplicationStatus] = mapped_column(Enum(ApplicationStatus, name='application_status'), default=ApplicationStatus.applied, nullable=False)
+    # Copy of ai_screenings.score, written with it, so ranked listings never join or sort the whole job.
+    ai_score: Mapped[int | None] = mapped_column(Integer, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     job = relationship('Job', back_populates='applications')
 
 
+# Unscored applications rank below every score (0-100). The -1 must stay a
+# literal: a bound parameter would stop Postgres matching the index expression.
+APPLICATION_SCORE_RANK = func.coalesce(Application.ai_score, literal_column('-1'))
+Index('ix_applications_job_id_score_rank_id', Application.job_id, APPLICATION_SCORE_RANK, Application.id)
+
+
 class StatusHistory(Base):
     __tablename__ = 'status_history'
+    __table_args__ = (
+        Index('ix_status_history_application_id_changed_at', 'application_id', 'changed_at'),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    application_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey('applications.id'), index=True, nullable=False)
+    application_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey('applications.id'), nullable=False)
     status: Mapped[ApplicationStatus] = mapped_column(Enum(ApplicationStatus, name='status_history_status'), nullable=False)
     changed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     changed_by: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
@@ -108,6 +138,15 @@ class StatusHistory(Base):
 
 class AIScreening(Base):
     __tablename__ = 'ai_screenings'
+    __table_args__ = (
+        # Only the rescreen backlog is ever looked up by status, and it stays small.
+        Index(
+            'ix_ai_screenings_unfinished_created_at',
+            'created_at',
+            postgresql_where=text("status IN ('pending', 'failed')"),
+            postgresql_include=['application_id'],
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     application_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey('applications.id'), unique=True, nullable=False)
@@ -122,13 +161,75 @@ class AIScreening(Base):
     application = relationship('Application', backref='ai_screening')
 
 
+# The rescreen backlog filter, matching ix_ai_screenings_unfinished_created_at. The
+# statuses are inlined at execution: as bound parameters, a generic plan couldn't
+# prove the partial index's predicate and would skip it.
+SCREENING_UNFINISHED = AIScreening.status.in_(bindparam(
+    'unfinished_statuses',
+    [ScreeningStatus.pending, ScreeningStatus.failed],
+    type_=AIScreening.__table__.c.status.type,
+    expanding=True,
+    literal_execute=True,
+))
+
+
 class AuditLog(Base):
     __tablename__ = 'audit_logs'
+    __table_args__ = (
+        Index('ix_audit_logs_created_at_id', 'created_at', 'id'),
+        Index('ix_audit_logs_actor_id_created_at_id', 'actor_id', 'created_at', 'id'),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    actor_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey('users.id'), index=True, nullable=True)
+    actor_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=True)
     action: Mapped[str] = mapped_column(Text, index=True, nullable=False)
     entity_type: Mapped[str] = mapped_column(Text, index=True, nullable=False)
     entity_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     metadata_: Mapped[dict] = mapped_column('metadata', JSONB, default=dict, nullable=False)
+
+
+class JobStats(Base):
+    """Per-job analytics rollup, kept current on submit, status change and screening completion."""
+
+    __tablename__ = 'job_stats'
+    __table_args__ = (
+        Index('ix_job_stats_employer_id', 'employer_id'),
+    )
+
+    job_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey('jobs.id', ondelete='CASCADE'), primary_key=True)
+    employer_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    application_count: Mapped[int] = mapped_column(Integer, default=0, server_default='0', nullable=False)
+    status_applied: Mapped[int] = mapped_column(Integer, default=0, server_default='0', nullable=False)
+    status_reviewed: Mapped[int] = mapped_column(Integer, default=0, server_default='0', nullable=False)
+    status_interview: Mapped[int] = mapped_column(Integer, default=0, server_default='0', nullable=False)
+    status_rejected: Mapped[int] = mapped_column(Integer, default=0, server_default='0', nullable=False)
+    status_accepted: Mapped[int] = mapped_column(Integer, default=0, server_default='0', nullable=False)
+    score_count: Mapped[int] = mapped_column(Integer, default=0, server_default='0', nullable=False)
+    score_sum: Mapped[int] = mapped_column(BigInteger, default=0, server_default='0', nullable=False)
+    score_0_20: Mapped[int] = mapped_column(Integer, default=0, server_default='0', nullable=False)
+    score_21_40: Mapped[int] = mapped_column(Integer, default=0, server_default='0', nullable=False)
+    score_41_60: Mapped[int] = mapped_column(Integer, default=0, server_default='0', nullable=False)
+    score_61_80: Mapped[int] = mapped_column(Integer, default=0, server_default='0', nullable=False)
+    score_81_100: Mapped[int] = mapped_column(Integer, default=0, server_default='0', nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+class JobDailyApplications(Base):
+    __tablename__ = 'job_daily_applications'
+    __table_args__ = (
+        Index('ix_job_daily_applications_employer_id_day', 'employer_id', 'day'),
+    )
+
+    job_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey('jobs.id', ondelete='CASCADE'), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    employer_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    application_count: Mapped[int] = mapped_column(Integer, default=0, server_default='0', nullable=False)
+
+
+# Lets Base.metadata.create_all/drop_all (used by the tests) manage the views
+# alongside the tables; migration 0006 creates them from the same definitions.
+for _view, (_query, _key) in PLATFORM_VIEWS.items():
+    event.listen(Base.metadata, 'after_create', DDL(f'CREATE MATERIALIZED VIEW IF NOT EXISTS {_view} AS {_query}'))
+    event.listen(Base.metadata, 'after_create', DDL(f'CREATE UNIQUE INDEX IF NOT EXISTS ux_{_view}_{_key} ON {_view} ({_key})'))
+    event.listen(Base.metadata, 'before_drop', DDL(f'DROP MATERIALIZED VIEW IF EXISTS {_view}'))
@@ -0,0 +1,213 @@
+import base64
+import binascii
+import enum
+import hashlib
+import json
+import logging
+from datetime import datetime
+from typing import Any, NamedTuple, Sequence
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, Select, func, select, tuple_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.db import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+class TotalMode(str, enum.Enum):
+    exact = 'exact'
+    estimated = 'estimated'
+    cached = 'cached'
+    none = 'none'
+
+
+class Page(NamedTuple):
+    items: list[Any]
+    page: int
+    page_size: int
+    total: int | None
+    has_more: bool
+    next_cursor: str | None
+
+
+def encode_cursor(created_at: datetime, item_id: UUID) -> str:
+    """Opaque keyset cursor for the (created_at, id) ordering used by listings."""
+    raw = json.dumps([created_at.isoformat(), str(item_id)], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def encode_score_cursor(rank: int, item_id: UUID) -> str:
+    """Opaque keyset cursor for the (score rank, id) ordering of ranked candidate lists."""
+    raw = json.dumps([rank, str(item_id)], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_score_cursor(cursor: str) -> tuple[int, UUID]:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        rank, item_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(rank, int):
+            raise TypeError('rank must be an integer')
+        return rank, UUID(item_id)
+    except (binascii.Error, ValueError, TypeError) as exc:
+        raise ValueError('invalid_cursor') from exc
+
+
+def encode_rank_cursor(rank: float, created_at: datetime, item_id: UUID) -> str:
+    """Opaque keyset cursor for the (relevance, created_at, id) ordering of ranked searches."""
+    raw = json.dumps([rank, created_at.isoformat(), str(item_id)], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_rank_cursor(cursor: str) -> tuple[float, datetime, UUID]:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        rank, created_at, item_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(rank, (int, float)):
+            raise TypeError('rank must be a number')
+        return float(rank), datetime.fromisoformat(created_at), UUID(item_id)
+    except (binascii.Error, ValueError, TypeError) as exc:
+        raise ValueError('invalid_cursor') from exc
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, item_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), UUID(item_id)
+    except (binascii.Error, ValueError, TypeError) as exc:
+        raise ValueError('invalid_cursor') from exc
+
+
+def apply_keyset(
+    stmt: Select,
+    *,
+    created_col: ColumnElement,
+    id_col: ColumnElement,
+    page: int,
+    page_size: int,
+    cursor: str | None,
+) -> Select:
+    """Order newest-first and select one window of rows.
+
+    With a cursor the window starts strictly after the cursor position, so the
+    database walks the (created_at, id) index instead of discarding OFFSET rows.
+    One extra row is fetched to detect whether another page exists.
+    """
+    stmt = stmt.order_by(created_col.desc(), id_col.desc())
+    if cursor:
+        created_at, item_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(created_col, id_col) < tuple_(created_at, item_id))
+    else:
+        stmt = stmt.offset((page - 1) * page_size)
+    return stmt.limit(page_size + 1)
+
+
+def apply_score_keyset(
+    stmt: Select,
+    *,
+    rank_col: ColumnElement,
+    id_col: ColumnElement,
+    page: int,
+    page_size: int,
+    cursor: str | None,
+) -> Select:
+    """Order best-score-first and select one window of rows.
+
+    The (rank, id) counterpart of ``apply_keyset``: with a cursor the database
+    seeks straight into the (job_id, rank, id) index, so every page costs the same.
+    """
+    stmt = stmt.order_by(rank_col.desc(), id_col.desc())
+    if cursor:
+        rank, item_id = decode_score_cursor(cursor)
+        stmt = stmt.where(tuple_(rank_col, id_col) < tuple_(rank, item_id))
+    else:
+        stmt = stmt.offset((page - 1) * page_size)
+    return stmt.limit(page_size + 1)
+
+
+def split_page(
+    rows: Sequence[Any],
+    page_size: int,
+    key: Any,
+    encode: Any = encode_cursor,
+) -> tuple[list[Any], bool, str | None]:
+    """Trim the look-ahead row and build the cursor for the following page.
+
+    ``key`` maps a row to the arguments of ``encode``: its ``(created_at, id)``
+    pair by default.
+    """
+    items = list(rows[:page_size])
+    has_more = len(rows) > page_size
+    next_cursor = encode(*key(items[-1])) if has_more and items else None
+    return items, has_more, next_cursor
+
+
+class _ExplainJSON(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON)`` of a statement, executed with the statement's own bound parameters."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select) -> None:
+        self.statement = statement
+
+
+@compiles(_ExplainJSON)
+def _compile_explain(element: _ExplainJSON, compiler: Any, **kw: Any) -> str:
+    return f'EXPLAIN (FORMAT JSON) {compiler.process(element.statement, **kw)}'
+
+
+def _count_signature(session: AsyncSession, stmt: Select) -> str:
+    """Cache key part for a filtered statement: its SQL text plus a hash of its parameter values."""
+    compiled = stmt.compile(dialect=session.get_bind().dialect)
+    params = json.dumps(sorted(compiled.params.items()), default=str)
+    return hashlib.sha1(f'{compiled}\0{params}'.encode()).hexdigest()
+
+
+async def _exact_total(session: AsyncSession, stmt: Select) -> int:
+    return (await session.execute(select(func.count()).select_from(stmt.subquery()))).scalar_one()
+
+
+async def _estimated_total(session: AsyncSession, stmt: Select) -> int:
+    """Planner row estimate for the filtered statement (driven by pg_class.reltuples and column stats)."""
+    plan = (await session.execute(_ExplainJSON(stmt))).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+async def _cached_total(session: AsyncSession, stmt: Select) -> int:
+    key = f'count:{_count_signature(session, stmt)}'
+    try:
+        cached = await get_redis().get(key)
+        if cached is not None:
+            return int(cached)
+    except Exception:
+        logger.warning('Count cache lookup failed', exc_info=True)
+    total = await _exact_total(session, stmt)
+    try:
+        await get_redis().setex(key, get_settings().count_cache_ttl_seconds, total)
+    except Exception:
+        logger.warning('Count cache store failed', exc_info=True)
+    return total
+
+
+async def count_total(session: AsyncSession, stmt: Select, mode: TotalMode) -> int | None:
+    """Total row count for a filtered listing according to the requested strategy.
+
+    ``exact`` runs COUNT(*), ``estimated`` asks the planner, ``cached`` keeps an
+    exact count per filter signature in Redis and ``none`` skips it entirely
+    (clients rely on ``hasMore``).
+    """
+    if mode == TotalMode.none:
+        return None
+    if mode == TotalMode.estimated:
+        return await _estimated_total(session, stmt)
+    if mode == TotalMode.cached:
+        return await _cached_total(session, stmt)
+    return await _exact_total(session, stmt)
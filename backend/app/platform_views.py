@@ -0,0 +1,32 @@
+"""Materialized views behind the admin platform analytics.
+
+Migration 0006 creates the views from these definitions and the models use
+them for ``Base.metadata.create_all``, so both stay in step. Treat them as
+frozen: changing a view means a new migration, not an edit here.
+"""
+
+# Platform-wide analytics for admins, refreshed concurrently by the worker. Each
+# view needs a unique index for REFRESH MATERIALIZED VIEW CONCURRENTLY.
+# view name -> (defining query, unique key column)
+PLATFORM_VIEWS: dict[str, tuple[str, str]] = {
+    'mv_daily_applications': (
+        "SELECT CAST(a.created_at AS date) AS day, count(*) AS applications, "
+        "count(DISTINCT a.applicant_id) AS applicants, count(DISTINCT j.employer_id) AS employers "
+        "FROM applications a JOIN jobs j ON j.id = a.job_id GROUP BY 1",
+        'day',
+    ),
+    'mv_daily_screenings': (
+        "SELECT CAST(coalesce(s.completed_at, s.created_at) AS date) AS day, "
+        "count(*) FILTER (WHERE s.status = 'completed') AS completed, "
+        "count(*) FILTER (WHERE s.status = 'failed') AS failed, "
+        "round(avg(s.score), 1) AS avg_score, "
+        "percentile_cont(0.5) WITHIN GROUP (ORDER BY s.score) AS median_score "
+        "FROM ai_screenings s GROUP BY 1",
+        'day',
+    ),
+    'mv_application_funnel': (
+        "SELECT CAST(h.status AS text) AS stage, count(DISTINCT h.application_id) AS applications "
+        "FROM status_history h GROUP BY 1",
+        'stage',
+    ),
+}
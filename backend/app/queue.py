@@ -1,35 +1,236 @@
 import json
+import os
+import socket
+import time
 import uuid
+from dataclasses import dataclass
 from typing import Any
 
+from app.config import get_settings
 from app.db import get_redis
+from app.metrics import increment
 
 QUEUE_KEY = 'queue:tasks'
+LOW_PRIORITY_QUEUE_KEY = 'queue:tasks:low'
+# Lanes in the order workers drain them; a low-priority task only runs when the normal lane is empty.
+QUEUE_KEYS = [QUEUE_KEY, LOW_PRIORITY_QUEUE_KEY]
 DLQ_KEY = 'queue:dlq'
+PROCESSING_KEY_PREFIX = 'queue:processing:'
+# Sorted set of claims (JSON [consumer, raw task]) scored by visibility deadline.
+CLAIMS_KEY = 'queue:claims'
+# Sorted set of tasks waiting to be retried, scored by the time they are due.
+DELAYED_KEY = 'queue:delayed'
+# Marker keys (one per application) for screenings that are already queued.
+SCREENING_QUEUED_KEY_PREFIX = 'queue:screening:'
+SCREENING_QUEUED_TTL_SECONDS = 3600
 
 
-async def enqueue(task_type: str, payload: dict[str, Any]) -> dict[str, Any]:
+def _queue_for(task: dict[str, Any]) -> str:
+    return LOW_PRIORITY_QUEUE_KEY if task.get('priority') == 'low' else QUEUE_KEY
+
+
+async def enqueue(task_type: str, payload: dict[str, Any], priority: str = 'normal') -> dict[str, Any]:
     """Redis list-based queue using RPUSH/BLPOP for durability."""
     task = {
         'id': str(uuid.uuid4()),
         'type': task_type,
         'payload': payload,
         'attempts': 0,
+        'priority': priority,
     }
     redis_client = get_redis()
-    await redis_client.rpush(QUEUE_KEY, json.dumps(task))
+    await redis_client.rpush(_queue_for(task), json.dumps(task))
     return task
 
 
 async def dequeue(timeout: int = 5) -> dict[str, Any] | None:
     redis_client = get_redis()
-    item = await redis_client.blpop(QUEUE_KEY, timeout=timeout)
+    item = await redis_client.blpop(QUEUE_KEYS, timeout=timeout)
     if not item:
         return None
     _, raw = item
     return json.loads(raw)
 
 
+async def dequeue_batch(max_items: int, timeout: int = 5) -> list[dict[str, Any]]:
+    """Block for the first task, then take up to ``max_items - 1`` more without waiting."""
+    first = await dequeue(timeout=timeout)
+    if first is None:
+        return []
+    tasks = [first]
+    redis_client = get_redis()
+    for key in QUEUE_KEYS:
+        if len(tasks) >= max_items:
+            break
+        rest = await redis_client.lpop(key, max_items - len(tasks))
+        tasks.extend(json.loads(raw) for raw in rest or [])
+    return tasks
+
+
+@dataclass
+class Claim:
+    """A task moved into a consumer's processing list; it stays there until acked."""
+
+    task: dict[str, Any]
+    raw: str
+    consumer: str
+    # The ``queue:claims`` entry exactly as the claim script wrote it.
+    member: str
+
+
+def new_consumer_id() -> str:
+    return f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+
+
+def _visibility_deadline() -> float:
+    return time.time() + get_settings().queue_visibility_timeout_seconds
+
+
+_CLAIM_SCRIPT = """
+local claimed = {}
+local count = 0
+local limit = tonumber(ARGV[1])
+for i = 3, #KEYS do
+    while count < limit do
+        local raw = redis.call('lmove', KEYS[i], KEYS[2], 'LEFT', 'RIGHT')
+        if not raw then
+            break
+        end
+        local member = cjson.encode({ARGV[3], raw})
+        redis.call('zadd', KEYS[1], ARGV[2], member)
+        claimed[#claimed + 1] = raw
+        claimed[#claimed + 1] = member
+        count = count + 1
+    end
+end
+return claimed
+"""
+
+
+async def _claim_available(consumer: str, max_items: int) -> list[Claim]:
+    flat = await get_redis().eval(
+        _CLAIM_SCRIPT,
+        2 + len(QUEUE_KEYS),
+        CLAIMS_KEY,
+        f'{PROCESSING_KEY_PREFIX}{consumer}',
+        *QUEUE_KEYS,
+        max_items,
+        _visibility_deadline(),
+        consumer,
+    )
+    return [
+        Claim(task=json.loads(raw), raw=raw, consumer=consumer, member=member)
+        for raw, member in zip(flat[::2], flat[1::2])
+    ]
+
+
+async def claim_batch(consumer: str, max_items: int, timeout: int = 5) -> list[Claim]:
+    """Reliable counterpart of ``dequeue_batch``.
+
+    One Lua call moves each task into ``queue:processing:<consumer>`` and
+    registers it in ``queue:claims`` with a visibility deadline, so a consumer
+    that dies at any point leaves its tasks for ``reap_expired_claims``.
+    """
+    redis_client = get_redis()
+    deadline = time.monotonic() + timeout
+    while True:
+        claims = await _claim_available(consumer, max_items)
+        remaining = deadline - time.monotonic()
+        if claims or remaining <= 0:
+            return claims
+        # Wait for work by rotating the normal lane's head back onto itself, which
+        # leaves the task queued for the claim script. Low-priority work is picked
+        # up by the script on the next call, at most ``timeout`` later.
+        # (A timeout that rounds down to 0 ms would block forever, hence the floor.)
+        await redis_client.blmove(QUEUE_KEY, QUEUE_KEY, max(remaining, 0.01), 'LEFT', 'LEFT')
+
+
+async def ack(claim: Claim) -> None:
+    """Forget a claim once its task has been handled (including retry or dead-lettering)."""
+    redis_client = get_redis()
+    async with redis_client.pipeline(transaction=True) as pipe:
+        pipe.lrem(f'{PROCESSING_KEY_PREFIX}{claim.consumer}', 1, claim.raw)
+        pipe.zrem(CLAIMS_KEY, claim.member)
+        await pipe.execute()
+
+
+async def extend_claims(claims: list[Claim]) -> None:
+    """Push the visibility deadline of claims that are still being worked on."""
+    if not claims:
+        return
+    deadline = _visibility_deadline()
+    await get_redis().zadd(CLAIMS_KEY, {claim.member: deadline for claim in claims}, xx=True)
+
+
+_REAP_SCRIPT = """
+local expired = redis.call('zrangebyscore', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[4]))
+local returned = 0
+for _, member in ipairs(expired) do
+    local claim = cjson.decode(member)
+    if redis.call('lrem', ARGV[2] .. claim[1], 1, claim[2]) > 0 then
+        local queue = ARGV[3]
+        if cjson.decode(claim[2])['priority'] == 'low' then
+            queue = ARGV[5]
+        end
+        redis.call('rpush', queue, claim[2])
+        returned = returned + 1
+    end
+    redis.call('zrem', KEYS[1], member)
+end
+return returned
+"""
+
+
+async def reap_expired_claims(now: float | None = None, limit: int = 100) -> int:
+    """Return tasks whose claim outlived its visibility timeout to the queue.
+
+    Safe to run from every worker at once: each claim is moved in one Lua call.
+    """
+    now = time.time() if now is None else now
+    returned = int(await get_redis().eval(
+        _REAP_SCRIPT, 1, CLAIMS_KEY, now, PROCESSING_KEY_PREFIX, QUEUE_KEY, limit, LOW_PRIORITY_QUEUE_KEY,
+    ))
+    if returned:
+        increment('queue_redelivered', returned)
+    return returned
+
+
+async def inflight_count() -> int:
+    return int(await get_redis().zcard(CLAIMS_KEY))
+
+
+async def schedule_retry(task: dict[str, Any], delay: float) -> None:
+    """Park ``task`` until ``delay`` seconds from now without holding a worker."""
+    if delay <= 0:
+        await requeue(task)
+        return
+    await get_redis().zadd(DELAYED_KEY, {json.dumps(task): time.time() + delay})
+
+
+_PROMOTE_SCRIPT = """
+local due = redis.call('zrangebyscore', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+for _, raw in ipairs(due) do
+    local queue = KEYS[2]
+    if cjson.decode(raw)['priority'] == 'low' then
+        queue = KEYS[3]
+    end
+    redis.call('rpush', queue, raw)
+    redis.call('zrem', KEYS[1], raw)
+end
+return #due
+"""
+
+
+async def promote_due_tasks(now: float | None = None, limit: int = 100) -> int:
+    """Move retries whose due time has passed back onto the main queue."""
+    now = time.time() if now is None else now
+    return int(await get_redis().eval(_PROMOTE_SCRIPT, 3, DELAYED_KEY, QUEUE_KEY, LOW_PRIORITY_QUEUE_KEY, now, limit))
+
+
+async def scheduled_count() -> int:
+    return int(await get_redis().zcard(DELAYED_KEY))
+
+
 async def push_dlq(task: dict[str, Any]) -> None:
     redis_client = get_redis()
     await redis_client.rpush(DLQ_KEY, json.dumps(task))
@@ -37,7 +238,10 @@ async def push_dlq(task: dict[str, Any]) -> None:
 
 async def queue_depth() -> int:
     redis_client = get_redis()
-    return int(await redis_client.llen(QUEUE_KEY))
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for key in QUEUE_KEYS:
+            pipe.llen(key)
+        return sum(int(depth) for depth in await pipe.execute())
 
 
 async def dlq_size() -> int:
@@ -47,4 +251,26 @@ async def dlq_size() -> int:
 
 async def requeue(task: dict[str, Any]) -> None:
     redis_client = get_redis()
-    await redis_client.rpush(QUEUE_KEY, json.dumps(task))
+    await redis_client.rpush(_queue_for(task), json.dumps(task))
+
+
+async def reserve_screenings(application_ids: list[str]) -> list[str]:
+    """Mark applications as queued for screening, returning only those not already queued.
+
+    The markers expire on their own, so a task lost outside reliable mode can't
+    block its application from being screened again for long.
+    """
+    if not application_ids:
+        return []
+    redis_client = get_redis()
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for application_id in application_ids:
+            pipe.set(f'{SCREENING_QUEUED_KEY_PREFIX}{application_id}', 1, nx=True, ex=SCREENING_QUEUED_TTL_SECONDS)
+        reserved = await pipe.execute()
+    return [application_id for application_id, ok in zip(application_ids, reserved) if ok]
+
+
+async def release_screenings(application_ids: list[str]) -> None:
+    """Clear queued markers once a worker has picked the screenings up."""
+    if application_ids:
+        await get_redis().delete(*[f'{SCREENING_QUEUED_KEY_PREFIX}{application_id}' for application_id in application_ids])
@@ -78,7 +78,9 @@ class PaginatedResponse(BaseModel):
     items: list[Any]
     page: int
     pageSize: int
-    total: int
+    total: int | None
+    hasMore: bool = False
+    nextCursor: str | None = None
 
 
 class ApplicationCreate(BaseModel):
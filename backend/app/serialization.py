@@ -0,0 +1,48 @@
+from typing import Any
+
+import orjson
+
+from app.models import Job
+from app.pagination import Page
+
+# Matches pydantic's JSON mode for timezone-aware datetimes ("...Z" for UTC).
+_ORJSON_OPTIONS = orjson.OPT_UTC_Z
+
+
+def dumps(value: Any) -> bytes:
+    return orjson.dumps(value, option=_ORJSON_OPTIONS)
+
+
+def job_to_dict(job: Job) -> dict:
+    """Same shape as ``JobResponse`` (by alias) without a model round trip.
+
+    asyncpg hands back its own ``UUID`` subclass, which orjson does not accept,
+    so ids are stringified here.
+    """
+    return {
+        'id': str(job.id),
+        'title': job.title,
+        'company': job.company,
+        'location': job.location,
+        'description': job.description,
+        'employmentType': job.employment_type,
+        'remote': job.remote,
+        'status': job.status,
+        'createdAt': job.created_at,
+    }
+
+
+def serialize_job(job: Job) -> bytes:
+    return dumps(job_to_dict(job))
+
+
+def serialize_jobs_page(page: Page) -> bytes:
+    """Encode a jobs listing in the ``PaginatedResponse`` shape straight to JSON bytes."""
+    return dumps({
+        'items': [job_to_dict(job) for job in page.items],
+        'page': page.page,
+        'pageSize': page.page_size,
+        'total': page.total,
+        'hasMore': page.has_more,
+        'nextCursor': page.next_cursor,
+    })
@@ -0,0 +1,380 @@
+import asyncio
+import logging
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import BigInteger, Date, Numeric, String, and_, case, cast, func, literal, null, or_, select, tuple_, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import SessionLocal, get_redis
+from app.metrics import increment
+from app.models import AIScreening, Application, ApplicationStatus, Job, JobDailyApplications, JobStats
+
+logger = logging.getLogger('hiretrack.analytics')
+
+RECONCILE_LOCK_KEY = 'analytics:reconcile:lock'
+
+STATUS_COLUMNS = {status: f'status_{status.value}' for status in ApplicationStatus}
+# (label, rollup column, inclusive upper bound); the last bucket takes everything above 80.
+SCORE_BUCKETS: list[tuple[str, str, int | None]] = [
+    ('0-20', 'score_0_20', 20),
+    ('21-40', 'score_21_40', 40),
+    ('41-60', 'score_41_60', 60),
+    ('61-80', 'score_61_80', 80),
+    ('81-100', 'score_81_100', None),
+]
+JOB_STATS_COUNTERS = [
+    'application_count',
+    *STATUS_COLUMNS.values(),
+    'score_count',
+    'score_sum',
+    *[column for _, column, _ in SCORE_BUCKETS],
+]
+
+
+def score_bucket(score: int) -> str:
+    for _, column, upper in SCORE_BUCKETS:
+        if upper is None or score <= upper:
+            return column
+    return SCORE_BUCKETS[-1][1]
+
+
+def _rounded_avg(total: int, count: int) -> int:
+    """Average rounded half up, matching Postgres round(avg(...)) for non-negative scores."""
+    return (2 * total + count) // (2 * count)
+
+
+async def _bump_job_stats(session: AsyncSession, job_id: UUID, deltas: dict[str, int]) -> None:
+    """Add ``deltas`` to a job's rollup row, creating it on first use."""
+    deltas = {column: delta for column, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    employer_id = select(Job.employer_id).where(Job.id == job_id).scalar_subquery()
+    stmt = pg_insert(JobStats).values(job_id=job_id, employer_id=employer_id, **deltas)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[JobStats.job_id],
+        set_={column: getattr(JobStats, column) + stmt.excluded[column] for column in deltas} | {'updated_at': func.now()},
+    )
+    await session.execute(stmt)
+
+
+async def record_job_created(session: AsyncSession, job: Job) -> None:
+    """Start a job's rollup row at zero, so a missing row always means "not backfilled yet"."""
+    stmt = pg_insert(JobStats).values(job_id=job.id, employer_id=job.employer_id).on_conflict_do_nothing()
+    await session.execute(stmt)
+
+
+async def record_application_created(session: AsyncSession, application: Application) -> None:
+    await _bump_job_stats(session, application.job_id, {
+        'application_count': 1,
+        STATUS_COLUMNS[application.status]: 1,
+    })
+    employer_id = select(Job.employer_id).where(Job.id == application.job_id).scalar_subquery()
+    # created_at defaults to now(), so today's date in the database's time zone is its day.
+    stmt = pg_insert(JobDailyApplications).values(
+        job_id=application.job_id,
+        day=cast(func.now(), Date),
+        employer_id=employer_id,
+        application_count=1,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[JobDailyApplications.job_id, JobDailyApplications.day],
+        set_={'application_count': JobDailyApplications.application_count + 1},
+    )
+    await session.execute(stmt)
+
+
+async def record_status_change(
+    session: AsyncSession,
+    job_id: UUID,
+    old_status: ApplicationStatus,
+    new_status: ApplicationStatus,
+) -> None:
+    if old_status == new_status:
+        return
+    await _bump_job_stats(session, job_id, {STATUS_COLUMNS[old_status]: -1, STATUS_COLUMNS[new_status]: 1})
+
+
+async def record_score_change(session: AsyncSession, job_id: UUID, old_score: int | None, new_score: int | None) -> None:
+    deltas: dict[str, int] = {}
+    for score, sign in ((old_score, -1), (new_score, 1)):
+        if score is None:
+            continue
+        deltas['score_count'] = deltas.get('score_count', 0) + sign
+        deltas['score_sum'] = deltas.get('score_sum', 0) + sign * score
+        bucket = score_bucket(score)
+        deltas[bucket] = deltas.get(bucket, 0) + sign
+    await _bump_job_stats(session, job_id, deltas)
+
+
+def _bucket_condition(lower: int | None, upper: int | None):
+    score = AIScreening.score
+    if lower is None:
+        return score <= upper
+    if upper is None:
+        return score > lower
+    return (score > lower) & (score <= upper)
+
+
+def _rollup_statements(employer_id: UUID | None) -> list[tuple[Any, list[str], list[str], Any]]:
+    """(model, key columns, value columns, recompute query) for each rollup table."""
+    lowers = [None] + [upper for _, _, upper in SCORE_BUCKETS[:-1]]
+    job_columns = [
+        Job.id,
+        Job.employer_id,
+        func.count(Application.id),
+        *[func.count(Application.id).filter(Application.status == status) for status in STATUS_COLUMNS],
+        func.count(AIScreening.score),
+        func.coalesce(func.sum(AIScreening.score), 0),
+        *[
+            func.count(AIScreening.score).filter(_bucket_condition(lower, upper))
+            for lower, (_, _, upper) in zip(lowers, SCORE_BUCKETS)
+        ],
+    ]
+    job_rollup = (
+        select(*[column.label(name) for name, column in zip(['job_id', 'employer_id', *JOB_STATS_COUNTERS], job_columns)])
+        .select_from(Job)
+        .outerjoin(Application, Application.job_id == Job.id)
+        .outerjoin(AIScreening, AIScreening.application_id == Application.id)
+        .group_by(Job.id)
+    )
+    daily_rollup = (
+        select(
+            Application.job_id.label('job_id'),
+            cast(Application.created_at, Date).label('day'),
+            Job.employer_id.label('employer_id'),
+            func.count().label('application_count'),
+        )
+        .join(Job, Job.id == Application.job_id)
+        .group_by(Application.job_id, cast(Application.created_at, Date), Job.employer_id)
+    )
+    if employer_id is not None:
+        job_rollup = job_rollup.where(Job.employer_id == employer_id)
+        daily_rollup = daily_rollup.where(Job.employer_id == employer_id)
+    return [
+        (JobStats, ['job_id'], ['employer_id', *JOB_STATS_COUNTERS], job_rollup),
+        (JobDailyApplications, ['job_id', 'day'], ['employer_id', 'application_count'], daily_rollup),
+    ]
+
+
+async def _reconcile_table(session: AsyncSession, model: Any, key_columns: list[str], value_columns: list[str], rollup: Any) -> int:
+    """Add the difference between recomputed and stored counts to each drifted rollup row.
+
+    The difference is taken within one snapshot, and applied as ``col + delta``
+    to whatever the row holds when it is written, so a bump committed while the
+    pass runs is kept rather than overwritten.
+    """
+    expected = rollup.subquery('expected')
+    counters = [column for column in value_columns if column != 'employer_id']
+    stored = [func.coalesce(getattr(model, column), 0) for column in counters]
+    missing = getattr(model, key_columns[0]).is_(None)
+    drifted = (
+        select(
+            *[expected.c[column] for column in key_columns],
+            expected.c.employer_id,
+            *[(expected.c[column] - current).label(column) for column, current in zip(counters, stored)],
+        )
+        .select_from(expected.outerjoin(model, and_(*[getattr(model, column) == expected.c[column] for column in key_columns])))
+        .where(or_(missing, tuple_(*stored).is_distinct_from(tuple_(*[expected.c[column] for column in counters]))))
+    )
+    stmt = pg_insert(model).from_select([*key_columns, 'employer_id', *counters], drifted)
+    set_ = {column: getattr(model, column) + stmt.excluded[column] for column in counters}
+    if model is JobStats:
+        set_['updated_at'] = func.now()
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[getattr(model, column) for column in key_columns],
+        set_=set_,
+    ).returning(getattr(model, key_columns[0]))
+    return len((await session.execute(stmt)).all())
+
+
+def _record_corrections(corrected: int, employer_id: UUID | None) -> None:
+    if corrected:
+        increment('analytics_rollup_corrections', corrected)
+        logger.info({'message': 'analytics.reconciled', 'corrected': corrected, 'employerId': str(employer_id) if employer_id else None})
+
+
+async def reconcile_rollups(session: AsyncSession, employer_id: UUID | None = None) -> int:
+    """Recompute rollups from the base tables and correct rows that drifted.
+
+    Returns how many rows were inserted or corrected. Corrections are applied
+    as deltas, so updates committed while a pass is running are kept.
+    """
+    corrected = 0
+    for statement in _rollup_statements(employer_id):
+        corrected += await _reconcile_table(session, *statement)
+    _record_corrections(corrected, employer_id)
+    return corrected
+
+
+async def _reconcile_in_own_session(statement: tuple[Any, list[str], list[str], Any]) -> int:
+    async with SessionLocal() as session:
+        corrected = await _reconcile_table(session, *statement)
+        await session.commit()
+    return corrected
+
+
+async def reconcile_if_due(interval: float) -> int | None:
+    """Run a reconciliation pass unless another process ran one in the last ``interval`` seconds.
+
+    The rollup tables are independent, so each is rebuilt on its own pooled
+    connection and the two scans run in parallel.
+    """
+    acquired = await get_redis().set(RECONCILE_LOCK_KEY, 1, nx=True, ex=max(int(interval), 1))
+    if not acquired:
+        return None
+    corrected = sum(await asyncio.gather(*(_reconcile_in_own_session(statement) for statement in _rollup_statements(None))))
+    _record_corrections(corrected, None)
+    return corrected
+
+
+async def get_employer_dashboard(session: AsyncSession, employer_id: UUID) -> dict[str, Any]:
+    """Dashboard analytics assembled from the per-job rollups: two indexed reads, O(jobs) rows."""
+    rows = (await session.execute(
+        select(Job.id, Job.title, Job.company, JobStats)
+        .outerjoin(JobStats, JobStats.job_id == Job.id)
+        .where(Job.employer_id == employer_id)
+    )).all()
+    day_rows = (await session.execute(
+        select(JobDailyApplications.day, func.sum(JobDailyApplications.application_count))
+        .where(JobDailyApplications.employer_id == employer_id)
+        .group_by(JobDailyApplications.day)
+        .order_by(JobDailyApplications.day)
+    )).all()
+
+    stats = [row[3] for row in rows if row[3] is not None]
+    if len(stats) < len(rows):
+        # Some job predates the rollups and hasn't been backfilled yet (first
+        # reconciliation pass hasn't run, or reconciliation is off); new jobs get
+        # their row on creation, so the rollups would silently leave it out.
+        return await get_employer_dashboard_live(session, employer_id)
+    total_apps = sum(stat.application_count for stat in stats)
+    score_count = sum(stat.score_count for stat in stats)
+    score_sum = sum(stat.score_sum for stat in stats)
+
+    status_breakdown = []
+    for status, column in STATUS_COLUMNS.items():
+        count = sum(getattr(stat, column) for stat in stats)
+        if count:
+            status_breakdown.append({'status': status.value, 'count': count})
+
+    ranked = sorted((row for row in rows if row[3] is not None and row[3].application_count > 0), key=lambda row: -row[3].application_count)
+    top_jobs = [
+        {
+            'jobId': str(job_id),
+            'title': title,
+            'company': company,
+            'applicationCount': stat.application_count,
+            'avgAiScore': _rounded_avg(stat.score_sum, stat.score_count) if stat.score_count else None,
+        }
+        for job_id, title, company, stat in ranked[:8]
+    ]
+
+    return {
+        'summary': {
+            'totalJobs': len(rows),
+            'totalApplications': total_apps,
+            'avgAiScore': _rounded_avg(score_sum, score_count) if score_count else 0,
+        },
+        'statusBreakdown': status_breakdown,
+        'topJobs': top_jobs,
+        'applicationsOverTime': [{'date': day.isoformat(), 'count': int(count)} for day, count in day_rows],
+        'scoreDistribution': [
+            {'range': label, 'count': sum(getattr(stat, column) for stat in stats)}
+            for label, column, _ in SCORE_BUCKETS
+        ],
+    }
+
+
+def _section(name: str, key: Any = None, count: Any = None, avg: Any = None, title: Any = None, company: Any = None):
+    """One branch of the live dashboard UNION ALL, padded to the shared column types."""
+    return (
+        literal(name).label('section'),
+        cast(key if key is not None else null(), String).label('key'),
+        cast(count if count is not None else null(), BigInteger).label('total'),
+        cast(avg if avg is not None else null(), Numeric).label('avg'),
+        cast(title if title is not None else null(), String).label('title'),
+        cast(company if company is not None else null(), String).label('company'),
+    )
+
+
+async def get_employer_dashboard_live(session: AsyncSession, employer_id: UUID) -> dict[str, Any]:
+    """Dashboard analytics computed from the base tables in a single statement.
+
+    The employer's applications are scanned once into a CTE, every section is
+    aggregated from it in the database (scores are bucketed with a CASE and
+    GROUP BY) and the sections come back as rows of one UNION ALL.
+    """
+    bucket = case(
+        *[(AIScreening.score <= upper, label) for label, _, upper in SCORE_BUCKETS[:-1]],
+        else_=SCORE_BUCKETS[-1][0],
+    )
+    apps = (
+        select(
+            Application.job_id,
+            Application.status,
+            cast(Application.created_at, Date).label('day'),
+            AIScreening.score,
+            bucket.label('bucket'),
+        )
+        .join(Job, Job.id == Application.job_id)
+        .outerjoin(AIScreening, AIScreening.application_id == Application.id)
+        .where(Job.employer_id == employer_id)
+        .cte('employer_apps')
+    )
+    stmt = union_all(
+        select(*_section('jobs', count=func.count())).select_from(Job).where(Job.employer_id == employer_id),
+        select(*_section('score', count=func.count(apps.c.score), avg=func.round(func.avg(apps.c.score)))),
+        select(*_section('status', key=apps.c.status, count=func.count())).group_by(apps.c.status),
+        select(*_section('day', key=apps.c.day, count=func.count())).group_by(apps.c.day),
+        select(*_section('bucket', key=apps.c.bucket, count=func.count()))
+        .where(apps.c.score.isnot(None))
+        .group_by(apps.c.bucket),
+        select(*_section(
+            'job',
+            key=Job.id,
+            count=func.count(),
+            avg=func.round(func.avg(apps.c.score)),
+            title=Job.title,
+            company=Job.company,
+        ))
+        .join(Job, Job.id == apps.c.job_id)
+        .group_by(Job.id, Job.title, Job.company),
+    )
+    rows = (await session.execute(stmt)).all()
+
+    sections: dict[str, list[Any]] = {}
+    for row in rows:
+        sections.setdefault(row.section, []).append(row)
+    jobs = sorted(sections.get('job', []), key=lambda row: -row.total)
+    score = sections['score'][0]
+    buckets = {row.key: row.total for row in sections.get('bucket', [])}
+    status_counts = {row.key: row.total for row in sections.get('status', [])}
+
+    return {
+        'summary': {
+            'totalJobs': sections['jobs'][0].total,
+            'totalApplications': sum(row.total for row in jobs),
+            'avgAiScore': int(score.avg) if score.avg is not None else 0,
+        },
+        'statusBreakdown': [
+            {'status': status.value, 'count': status_counts[status.value]}
+            for status in STATUS_COLUMNS
+            if status.value in status_counts
+        ],
+        'topJobs': [
+            {
+                'jobId': row.key,
+                'title': row.title,
+                'company': row.company,
+                'applicationCount': row.total,
+                'avgAiScore': int(row.avg) if row.avg is not None else None,
+            }
+            for row in jobs[:8]
+        ],
+        'applicationsOverTime': [
+            {'date': row.key, 'count': row.total} for row in sorted(sections.get('day', []), key=lambda row: row.key)
+        ],
+        'scoreDistribution': [{'range': label, 'count': buckets.get(label, 0)} for label, _, _ in SCORE_BUCKETS],
+    }
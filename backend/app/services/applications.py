@@ -1,14 +1,16 @@
 import logging
 from datetime import timedelta
 from uuid import UUID
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 logger = logging.getLogger(__name__)
 
 from app.db import get_redis
-from app.models import Application, ApplicationStatus, Job, JobStatus, StatusHistory, User, UserRole
+from app.models import APPLICATION_SCORE_RANK, Application, ApplicationStatus, Job, JobStatus, StatusHistory, User, UserRole
+from app.pagination import Page, TotalMode, apply_keyset, apply_score_keyset, count_total, encode_score_cursor, split_page
+from app.services.analytics import record_application_created, record_status_change
 from app.services.audit import create_audit_log
 from app.utils import paginate
 
@@ -80,6 +82,7 @@ async def apply_for_job(
         changed_by=user.id,
     )
     session.add(status_history)
+    await record_application_created(session, application)
 
     await create_audit_log(
         session,
@@ -106,15 +109,24 @@ async def list_applications(
     user: User,
     page: int | None,
     page_size: int | None,
-) -> tuple[list[Application], int, int, int]:
+    cursor: str | None = None,
+    total_mode: TotalMode = TotalMode.exact,
+) -> Page:
     page, page_size = paginate(page, page_size)
     stmt = select(Application).where(Application.applicant_id == user.id)
-    total_stmt = select(func.count()).select_from(stmt.subquery())
-    total = (await session.execute(total_stmt)).scalar_one()
-    items = (await session.execute(
-        stmt.order_by(Application.created_at.desc()).offset((page - 1) * page_size).limit(page_size)
+    total = await count_total(session, stmt, total_mode)
+    rows = (await session.execute(
+        apply_keyset(
+            stmt,
+            created_col=Application.created_at,
+            id_col=Application.id,
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+        )
     )).scalars().all()
-    return items, page, page_size, total
+    items, has_more, next_cursor = split_page(rows, page_size, lambda app: (app.created_at, app.id))
+    return Page(items, page, page_size, total, has_more, next_cursor)
 
 
 async def get_application_details(session: AsyncSession, *, application_id: UUID) -> Application | None:
@@ -128,17 +140,50 @@ async def list_applications_for_job(
     status: ApplicationStatus | None,
     page: int | None,
     page_size: int | None,
-) -> tuple[list[Application], int, int, int]:
+    cursor: str | None = None,
+    total_mode: TotalMode = TotalMode.exact,
+    sort_by: str | None = None,
+    min_score: int | None = None,
+) -> Page:
+    """One page of a job's applications, newest first or (``sort_by='ai_score'``) best score first.
+
+    Scores are read from ``Application.ai_score``, so neither the filter nor the
+    ranking joins ai_screenings.
+    """
     page, page_size = paginate(page, page_size)
     stmt = select(Application).where(Application.job_id == job_id)
     if status:
         stmt = stmt.where(Application.status == status)
-    total_stmt = select(func.count()).select_from(stmt.subquery())
-    total = (await session.execute(total_stmt)).scalar_one()
-    items = (await session.execute(
-        stmt.order_by(Application.created_at.desc()).offset((page - 1) * page_size).limit(page_size)
+    if min_score is not None:
+        stmt = stmt.where(Application.ai_score >= min_score)
+    total = await count_total(session, stmt, total_mode)
+    if sort_by == 'ai_score':
+        rows = (await session.execute(
+            apply_score_keyset(
+                stmt,
+                rank_col=APPLICATION_SCORE_RANK,
+                id_col=Application.id,
+                page=page,
+                page_size=page_size,
+                cursor=cursor,
+            )
+        )).scalars().all()
+        items, has_more, next_cursor = split_page(
+            rows, page_size, lambda app: (-1 if app.ai_score is None else app.ai_score, app.id), encode=encode_score_cursor
+        )
+        return Page(items, page, page_size, total, has_more, next_cursor)
+    rows = (await session.execute(
+        apply_keyset(
+            stmt,
+            created_col=Application.created_at,
+            id_col=Application.id,
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+        )
     )).scalars().all()
-    return items, page, page_size, total
+    items, has_more, next_cursor = split_page(rows, page_size, lambda app: (app.created_at, app.id))
+    return Page(items, page, page_size, total, has_more, next_cursor)
 
 
 async def update_application_status(
@@ -152,6 +197,7 @@ async def update_application_status(
     if new_status not in allowed:
         raise ValueError('invalid_transition')
 
+    old_status = application.status
     application.status = new_status
     status_history = StatusHistory(
         application_id=application.id,
@@ -160,6 +206,7 @@ async def update_application_status(
     )
     session.add(status_history)
     await session.flush()
+    await record_status_change(session, application.job_id, old_status, new_status)
 
     await create_audit_log(
         session,
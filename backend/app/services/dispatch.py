@@ -0,0 +1,210 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from app.config import get_settings
+from app.db import get_redis
+from app.metrics import increment, register_gauge
+
+logger = logging.getLogger('hiretrack.dispatch')
+
+# Provider status codes that mean "slow down": rate limited, or Anthropic's overloaded.
+OVERLOAD_STATUS_CODES = {429, 529}
+BUCKET_KEY_PREFIX = 'dispatch:bucket:'
+
+# Refill from the server clock, then take ARGV[3] tokens if that many are
+# available. Returns {seconds to wait before retrying (0 when taken), tokens left}.
+_TAKE_TOKENS_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local amount = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'available', 'updated')
+local available = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+available = math.min(capacity, available + math.max(now - updated, 0) * rate)
+local wait = 0
+if available >= amount then
+    available = available - amount
+else
+    wait = (amount - available) / rate
+end
+redis.call('HSET', KEYS[1], 'available', available, 'updated', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+return {tostring(wait), tostring(available)}
+"""
+
+
+class TokenBucket:
+    """Refills ``rate_per_minute`` tokens per minute up to one minute's worth."""
+
+    def __init__(self, rate_per_minute: float) -> None:
+        self.rate_per_second = rate_per_minute / 60
+        self.capacity = rate_per_minute
+        self.available = rate_per_minute
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self._updated) * self.rate_per_second)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1) -> None:
+        # A request larger than the bucket could never be served; let it through at full capacity.
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            self._refill()
+            while self.available < amount:
+                await asyncio.sleep((amount - self.available) / self.rate_per_second)
+                self._refill()
+            self.available -= amount
+
+
+class SharedTokenBucket:
+    """``TokenBucket`` kept in Redis, so every process draws from one provider budget.
+
+    While Redis is unreachable each process falls back to a local bucket of its own.
+    """
+
+    def __init__(self, name: str, rate_per_minute: float) -> None:
+        self.key = f'{BUCKET_KEY_PREFIX}{name}'
+        self.rate_per_second = rate_per_minute / 60
+        self.capacity = rate_per_minute
+        # Last level seen in Redis; only reported as a gauge.
+        self.available = float(rate_per_minute)
+        self._local = TokenBucket(rate_per_minute)
+
+    async def acquire(self, amount: float = 1) -> None:
+        amount = min(amount, self.capacity)
+        while True:
+            try:
+                wait, available = await get_redis().eval(
+                    _TAKE_TOKENS_SCRIPT, 1, self.key, self.rate_per_second, self.capacity, amount
+                )
+            except Exception:
+                logger.warning('Shared token bucket %s unavailable; pacing locally', self.key, exc_info=True)
+                await self._local.acquire(amount)
+                return
+            self.available = float(available)
+            if float(wait) <= 0:
+                return
+            await asyncio.sleep(float(wait))
+
+
+class AIMDLimiter:
+    """Concurrency limit that grows by one per window of successes and halves on overload."""
+
+    def __init__(self, initial: int, minimum: int, maximum: int) -> None:
+        self.minimum = max(minimum, 1)
+        self.maximum = max(maximum, self.minimum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.inflight = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.inflight < int(self.limit))
+            self.inflight += 1
+
+    async def release(self, overloaded: bool | None) -> None:
+        """Free a slot; ``overloaded`` True/False adjusts the limit, None leaves it alone."""
+        async with self._condition:
+            self.inflight -= 1
+            if overloaded:
+                self.limit = max(self.minimum, self.limit / 2)
+            elif overloaded is False:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+
+def is_overload(exc: BaseException) -> bool:
+    if getattr(exc, 'status_code', None) in OVERLOAD_STATUS_CODES:
+        return True
+    return isinstance(exc, TimeoutError) or 'Timeout' in type(exc).__name__
+
+
+class ScreeningDispatcher:
+    """Admission control for LLM provider calls.
+
+    Every call waits for an AIMD concurrency slot, then for request and token
+    budget from per-minute token buckets. Rate-limit and timeout errors halve
+    the concurrency limit; successes grow it back one slot at a time.
+
+    The buckets live in Redis and are shared by every process, so the
+    configured budget holds however many workers run. The concurrency limit is
+    per process: it bounds the screenings one process runs at once
+    (WORKER_CONCURRENCY, or the batch consumer's in-flight tasks).
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        initial_concurrency: int,
+        min_concurrency: int,
+        max_concurrency: int,
+    ) -> None:
+        self.requests = SharedTokenBucket('requests', requests_per_minute) if requests_per_minute > 0 else None
+        self.tokens = SharedTokenBucket('tokens', tokens_per_minute) if tokens_per_minute > 0 else None
+        self.limiter = AIMDLimiter(initial_concurrency, min_concurrency, max_concurrency)
+
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: int) -> AsyncIterator[None]:
+        await self.limiter.acquire()
+        overloaded: bool | None = None
+        try:
+            if self.requests is not None:
+                await self.requests.acquire(1)
+            if self.tokens is not None:
+                await self.tokens.acquire(estimated_tokens)
+            yield
+            overloaded = False
+        except Exception as exc:
+            if is_overload(exc):
+                overloaded = True
+                increment('screening_throttled', 1)
+                logger.warning({'message': 'screening.throttled', 'limit': self.limiter.limit, 'error': str(exc)})
+            raise
+        finally:
+            await self.limiter.release(overloaded)
+
+    def snapshot(self) -> dict[str, float]:
+        return {
+            'screening_concurrency_limit': int(self.limiter.limit),
+            'screening_inflight': self.limiter.inflight,
+            'screening_rpm_available': int(self.requests.available) if self.requests else -1,
+            'screening_tpm_available': int(self.tokens.available) if self.tokens else -1,
+        }
+
+
+_dispatcher: ScreeningDispatcher | None = None
+
+
+def get_dispatcher() -> ScreeningDispatcher:
+    global _dispatcher
+    if _dispatcher is None:
+        settings = get_settings()
+        _dispatcher = ScreeningDispatcher(
+            requests_per_minute=settings.ai_requests_per_minute,
+            tokens_per_minute=settings.ai_tokens_per_minute,
+            initial_concurrency=settings.ai_initial_concurrency,
+            min_concurrency=settings.ai_min_concurrency,
+            max_concurrency=settings.ai_max_concurrency,
+        )
+    return _dispatcher
+
+
+def _dispatcher_gauge(name: str) -> float | None:
+    # A process that has never screened anything (the API without an embedded worker) reports nothing.
+    return _dispatcher.snapshot()[name] if _dispatcher is not None else None
+
+
+for _name in ('screening_concurrency_limit', 'screening_inflight'):
+    register_gauge(_name, lambda name=_name: _dispatcher_gauge(name))
+for _name in ('screening_rpm_available', 'screening_tpm_available'):
+    register_gauge(_name, lambda name=_name: _dispatcher_gauge(name), shared=True)
+
@@ -1,15 +1,39 @@
-from sqlalchemy import Select, func, or_, select
+import re
+
+from sqlalchemy import ColumnElement, Select, String, and_, bindparam, func, or_, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
 from app.models import Job, JobStatus, User, UserRole
+from app.pagination import Page, TotalMode, apply_keyset, count_total, decode_rank_cursor, encode_rank_cursor, split_page
 from app.utils import paginate
+from app.services.analytics import record_job_created
 from app.services.audit import create_audit_log
 
 
+def build_search_query(query: str | None) -> ColumnElement | None:
+    """Prefix-matching tsquery for the free-text job search, or None if the input has no words."""
+    terms = re.findall(r'\w+', query or '')
+    if not terms:
+        return None
+    # Inlined at execution so the planner can fold the stopword check in apply_job_filters.
+    expression = bindparam(None, ' & '.join(f'{term}:*' for term in terms), type_=String, literal_execute=True)
+    return func.to_tsquery('english', expression)
+
+
 def apply_job_filters(stmt: Select, *, query: str | None, location: str | None, company: str | None) -> Select:
     if query:
-        stmt = stmt.where(or_(Job.title.ilike(f'%{query}%'), Job.description.ilike(f'%{query}%')))
+        substring = or_(Job.title.ilike(f'%{query}%'), Job.description.ilike(f'%{query}%'))
+        search_query = build_search_query(query)
+        if search_query is not None:
+            # A query made only of stopwords normalizes to an empty tsquery,
+            # which matches nothing; those fall back to the substring match.
+            stmt = stmt.where(or_(
+                Job.search_vector.op('@@')(search_query),
+                and_(func.numnode(search_query) == 0, substring),
+            ))
+        else:
+            stmt = stmt.where(substring)
     if location:
         stmt = stmt.where(Job.location.ilike(f'%{location}%'))
     if company:
@@ -26,7 +50,9 @@ async def list_jobs(
     company: str | None,
     page: int | None,
     page_size: int | None,
-) -> tuple[list[Job], int, int, int]:
+    cursor: str | None = None,
+    total_mode: TotalMode = TotalMode.exact,
+) -> Page:
     page, page_size = paginate(page, page_size)
     stmt = select(Job)
 
@@ -37,12 +63,42 @@ async def list_jobs(
 
     stmt = apply_job_filters(stmt, query=query, location=location, company=company)
 
-    total_stmt = select(func.count()).select_from(stmt.subquery())
-    total = (await session.execute(total_stmt)).scalar_one()
+    total = await count_total(session, stmt, total_mode)
+
+    search_query = build_search_query(query)
+    if search_query is not None:
+        return await _list_ranked_jobs(session, stmt, search_query, page, page_size, cursor, total)
+
+    stmt = apply_keyset(stmt, created_col=Job.created_at, id_col=Job.id, page=page, page_size=page_size, cursor=cursor)
+    rows = (await session.execute(stmt)).scalars().all()
+    items, has_more, next_cursor = split_page(rows, page_size, lambda job: (job.created_at, job.id))
+    return Page(items, page, page_size, total, has_more, next_cursor)
 
-    stmt = stmt.order_by(Job.created_at.desc()).offset((page - 1) * page_size).limit(page_size)
-    items = (await session.execute(stmt)).scalars().all()
-    return items, page, page_size, total
+
+async def _list_ranked_jobs(
+    session: AsyncSession,
+    stmt: Select,
+    search_query: ColumnElement,
+    page: int,
+    page_size: int,
+    cursor: str | None,
+    total: int | None,
+) -> Page:
+    """One page of search results, most relevant first, newest first among equals.
+
+    Cursors carry the row's relevance too, so cursor and page mode walk the same order.
+    """
+    rank = func.ts_rank_cd(Job.search_vector, search_query)
+    stmt = stmt.add_columns(rank.label('rank')).order_by(rank.desc(), Job.created_at.desc(), Job.id.desc())
+    if cursor:
+        stmt = stmt.where(tuple_(rank, Job.created_at, Job.id) < tuple_(*decode_rank_cursor(cursor)))
+    else:
+        stmt = stmt.offset((page - 1) * page_size)
+    rows = (await session.execute(stmt.limit(page_size + 1))).all()
+    rows, has_more, next_cursor = split_page(
+        rows, page_size, lambda row: (row.rank, row.Job.created_at, row.Job.id), encode=encode_rank_cursor
+    )
+    return Page([row.Job for row in rows], page, page_size, total, has_more, next_cursor)
 
 
 async def get_job(session: AsyncSession, *, job_id: UUID, user: User) -> Job | None:
@@ -67,6 +123,7 @@ async def create_job(session: AsyncSession, *, user: User, data: dict) -> Job:
     )
     session.add(job)
     await session.flush()
+    await record_job_created(session, job)
     await create_audit_log(
         session,
         actor_id=user.id,
@@ -0,0 +1,89 @@
+import logging
+from typing import Any
+
+from sqlalchemy import column, func, select, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import invalidate_platform_analytics
+from app.db import SessionLocal, get_redis
+from app.metrics import increment
+from app.models import PLATFORM_VIEWS, ApplicationStatus
+
+logger = logging.getLogger('hiretrack.platform_analytics')
+
+REFRESH_LOCK_KEY = 'analytics:platform:refresh:lock'
+# Stages an application moves through on the way to an offer, in order.
+FUNNEL_STAGES = [ApplicationStatus.applied, ApplicationStatus.reviewed, ApplicationStatus.interview, ApplicationStatus.accepted]
+
+daily_applications = table('mv_daily_applications', column('day'), column('applications'), column('applicants'), column('employers'))
+daily_screenings = table('mv_daily_screenings', column('day'), column('completed'), column('failed'), column('avg_score'), column('median_score'))
+application_funnel = table('mv_application_funnel', column('stage'), column('applications'))
+
+
+async def refresh_platform_views(session: AsyncSession) -> None:
+    """Refresh every platform view without blocking readers, then orphan cached responses."""
+    for view in PLATFORM_VIEWS:
+        await session.execute(text(f'REFRESH MATERIALIZED VIEW CONCURRENTLY {view}'))
+    await session.commit()
+    await invalidate_platform_analytics()
+    increment('platform_views_refreshed', 1)
+
+
+async def refresh_if_due(interval: float) -> bool:
+    """Refresh the views unless another process did so in the last ``interval`` seconds."""
+    acquired = await get_redis().set(REFRESH_LOCK_KEY, 1, nx=True, ex=max(int(interval), 1))
+    if not acquired:
+        return False
+    async with SessionLocal() as session:
+        await refresh_platform_views(session)
+    logger.info({'message': 'platform_views.refreshed'})
+    return True
+
+
+def _number(value: Any) -> float | None:
+    return float(value) if value is not None else None
+
+
+async def get_platform_analytics(session: AsyncSession, days: int) -> dict[str, Any]:
+    """Platform-wide trends for the last ``days`` days, read from the materialized views."""
+    # The views bucket by the database's date, so the window starts from it too.
+    since = func.current_date() - (days - 1)
+    application_rows = (await session.execute(
+        select(daily_applications).where(daily_applications.c.day >= since).order_by(daily_applications.c.day)
+    )).all()
+    screening_rows = (await session.execute(
+        select(daily_screenings).where(daily_screenings.c.day >= since).order_by(daily_screenings.c.day)
+    )).all()
+    stage_counts = dict((await session.execute(select(application_funnel.c.stage, application_funnel.c.applications))).all())
+
+    applied = stage_counts.get(ApplicationStatus.applied.value, 0)
+    funnel = []
+    previous = None
+    for stage in FUNNEL_STAGES:
+        count = stage_counts.get(stage.value, 0)
+        funnel.append({
+            'stage': stage.value,
+            'applications': count,
+            'fromApplied': round(count / applied, 4) if applied else None,
+            'fromPrevious': round(count / previous, 4) if previous else None,
+        })
+        previous = count
+
+    return {
+        'applicationsPerDay': [
+            {'date': row.day.isoformat(), 'applications': row.applications, 'applicants': row.applicants, 'employers': row.employers}
+            for row in application_rows
+        ],
+        'screeningScores': [
+            {
+                'date': row.day.isoformat(),
+                'completed': row.completed,
+                'failed': row.failed,
+                'avgScore': _number(row.avg_score),
+                'medianScore': _number(row.median_score),
+            }
+            for row in screening_rows
+        ],
+        'funnel': funnel,
+        'rejected': stage_counts.get(ApplicationStatus.rejected.value, 0),
+    }
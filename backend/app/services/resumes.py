@@ -0,0 +1,171 @@
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import os
+import signal
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO
+
+from app.cache import get_resume_text, set_resume_text
+from app.config import get_settings
+from app.metrics import increment
+
+logger = logging.getLogger('hiretrack.resumes')
+
+# Bump when extraction output changes so cached text from the old parser is ignored.
+PARSER_VERSION = '1'
+SPOOL_CHUNK_BYTES = 64 * 1024
+# Extra time past the per-parse budget before the pool is assumed stuck on one page and recycled.
+HARD_TIMEOUT_GRACE_SECONDS = 2.0
+
+_executor: ProcessPoolExecutor | None = None
+# Pool workers report their pids here so a wedged pool can be killed without executor internals.
+_worker_pids: multiprocessing.SimpleQueue | None = None
+
+
+def extract_pdf_text(path: str, max_pages: int, budget_seconds: float) -> str:
+    """Extract text from at most ``max_pages`` pages, giving up after ``budget_seconds``.
+
+    Runs in a pool process, so it only takes picklable arguments and reads the
+    PDF from disk rather than receiving its bytes.
+    """
+    from pypdf import PdfReader
+
+    deadline = time.monotonic() + budget_seconds
+    reader = PdfReader(path)
+    text_parts = []
+    for page in reader.pages[:max_pages]:
+        if time.monotonic() > deadline:
+            raise ValueError('parse_timeout')
+        page_text = page.extract_text()
+        if page_text:
+            text_parts.append(page_text)
+    return '\n'.join(text_parts).strip()
+
+
+def _register_worker(pids: multiprocessing.SimpleQueue) -> None:
+    pids.put(os.getpid())
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor, _worker_pids
+    if _executor is None:
+        # spawn, not fork: the parent has an event loop, threads and open sockets.
+        context = multiprocessing.get_context('spawn')
+        _worker_pids = context.SimpleQueue()
+        _executor = ProcessPoolExecutor(
+            max_workers=get_settings().resume_parse_workers,
+            mp_context=context,
+            initializer=_register_worker,
+            initargs=(_worker_pids,),
+        )
+    return _executor
+
+
+def _detach_executor() -> tuple[ProcessPoolExecutor | None, multiprocessing.SimpleQueue | None]:
+    global _executor, _worker_pids
+    executor, pids = _executor, _worker_pids
+    _executor, _worker_pids = None, None
+    return executor, pids
+
+
+def _recycle_executor() -> None:
+    """Kill the pool after a hard timeout; a page stuck in pypdf can't be interrupted any other way.
+
+    The next parse starts a fresh pool.
+    """
+    executor, pids = _detach_executor()
+    if executor is None:
+        return
+    executor.shutdown(wait=False, cancel_futures=True)
+    while not pids.empty():
+        try:
+            os.kill(pids.get(), signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    pids.close()
+
+
+def shutdown_resume_parser() -> None:
+    executor, pids = _detach_executor()
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+        pids.close()
+
+
+def spool_upload(source: BinaryIO, max_bytes: int) -> tuple[str, str]:
+    """Copy an upload to a temporary file in chunks, returning ``(path, sha256 hex)``.
+
+    Raises ValueError('file_too_large') as soon as ``max_bytes`` is exceeded, so
+    an oversized upload is never read in full. Blocking; call it off the event loop.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    fd, path = tempfile.mkstemp(suffix='.pdf', prefix='resume-')
+    try:
+        with os.fdopen(fd, 'wb') as spool:
+            while chunk := source.read(SPOOL_CHUNK_BYTES):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise ValueError('file_too_large')
+                digest.update(chunk)
+                spool.write(chunk)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path, digest.hexdigest()
+
+
+def resume_cache_key(content_digest: str, max_pages: int) -> str:
+    return hashlib.sha256(f'{PARSER_VERSION}\0{max_pages}\0{content_digest}'.encode()).hexdigest()
+
+
+async def parse_resume_upload(source: BinaryIO) -> str:
+    """Extract resume text from an uploaded PDF without blocking the event loop.
+
+    The upload is spooled to disk and hashed in a thread, looked up in the text
+    cache by content hash, and otherwise parsed in the process pool within the
+    configured page and time limits. Raises ValueError with 'file_too_large',
+    'parse_timeout' or 'unreadable'.
+    """
+    settings = get_settings()
+    path, content_digest = await asyncio.to_thread(spool_upload, source, settings.resume_max_bytes)
+    try:
+        cache_key = resume_cache_key(content_digest, settings.resume_max_pages)
+        cached = await get_resume_text(cache_key)
+        if cached is not None:
+            return cached
+
+        budget = settings.resume_parse_timeout_seconds
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        try:
+            text = await asyncio.wait_for(
+                loop.run_in_executor(_get_executor(), extract_pdf_text, path, settings.resume_max_pages, budget),
+                timeout=budget + HARD_TIMEOUT_GRACE_SECONDS,
+            )
+        except asyncio.TimeoutError as exc:
+            # The pool process didn't return at all; it may be wedged on a single page.
+            _recycle_executor()
+            increment('resume_parse_timeouts', 1)
+            raise ValueError('parse_timeout') from exc
+        except ValueError as exc:
+            if str(exc) != 'parse_timeout':
+                logger.warning('PDF parse failed: %s', exc)
+                raise ValueError('unreadable') from exc
+            increment('resume_parse_timeouts', 1)
+            raise
+        except Exception as exc:
+            logger.warning('PDF parse failed: %s', exc)
+            raise ValueError('unreadable') from exc
+        finally:
+            increment('resume_parse_ms', int((time.perf_counter() - start) * 1000))
+
+        if text:
+            await set_resume_text(cache_key, text)
+        return text
+    finally:
+        await asyncio.to_thread(os.unlink, path)
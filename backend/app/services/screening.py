@@ -1,13 +1,20 @@
+import hashlib
 import json
 import logging
+import re
 from datetime import datetime, timezone
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache import get_screening_result, set_screening_result
 from app.config import get_settings
+from app.metrics import increment
 from app.models import AIScreening, Application, Job, ScreeningRecommendation, ScreeningStatus
+from app.services.analytics import record_score_change
+from app.services.dispatch import get_dispatcher
 
 logger = logging.getLogger('hiretrack.screening')
 
@@ -43,15 +50,105 @@ Analyze this resume against the job description. Return a JSON object with exact
 
 Return ONLY the JSON object, no other text."""
 
+BATCH_USER_PROMPT_TEMPLATE = """Job Title: {title}
+Company: {company}
+Job Description:
+{description}
 
-async def _call_anthropic(system_prompt: str, user_prompt: str, model: str, api_key: str) -> str:
-    """Call Anthropic Claude API and return the text response."""
-    import anthropic
+---
+
+{candidates}
+
+---
+
+Analyze each candidate's resume against the job description independently. Return a JSON object with exactly this shape:
+{{
+  "results": [
+    {{
+      "candidate_id": "<the candidate id exactly as given above>",
+      "score": <integer 0-100, where 100 is perfect match>,
+      "recommendation": "<one of: strong_match, good_match, partial_match, weak_match>",
+      "skills_match": {{
+        "matched": ["skill1", "skill2"],
+        "missing": ["skill1", "skill2"],
+        "bonus": ["skill1", "skill2"]
+      }},
+      "experience_assessment": "<brief 1-2 sentence assessment of experience level and relevance>",
+      "strengths": ["strength1", "strength2", "strength3"],
+      "concerns": ["concern1", "concern2"]
+    }}
+  ]
+}}
+
+Include exactly one entry per candidate. Return ONLY the JSON object, no other text."""
+
+BATCH_CANDIDATE_TEMPLATE = """Candidate {candidate_id} Resume:
+{resume_text}"""
+
+# Bump whenever the prompts or result schema change so cached results are not reused.
+PROMPT_VERSION = '1'
+
+MAX_TOKENS_PER_RESULT = 1024
+MAX_BATCH_TOKENS = 8192
+
+
+# Provider SDK clients keyed by (provider, api_key). Each owns an httpx pool, so
+# reusing them keeps TLS connections alive across screenings.
+_clients: dict[tuple[str, str], Any] = {}
+
+
+def _http_client() -> Any:
+    import httpx
+
+    settings = get_settings()
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.ai_max_connections,
+            max_keepalive_connections=settings.ai_max_keepalive_connections,
+        ),
+        timeout=httpx.Timeout(settings.ai_timeout_seconds, connect=settings.ai_connect_timeout_seconds),
+    )
+
+
+def get_client(provider: str, api_key: str) -> Any:
+    """Process-wide SDK client for ``provider``, created on first use."""
+    key = (provider, api_key)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    base_url = get_settings().ai_base_url or None
+    http_client = _http_client()
+    if provider == 'anthropic':
+        import anthropic
+
+        client = anthropic.AsyncAnthropic(api_key=api_key, base_url=base_url, http_client=http_client, timeout=http_client.timeout)
+    elif provider == 'openai':
+        from openai import AsyncOpenAI
+
+        client = AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=http_client, timeout=http_client.timeout)
+    else:
+        raise ValueError(f'Unknown AI provider: {provider}')
+    _clients[key] = client
+    return client
 
-    client = anthropic.AsyncAnthropic(api_key=api_key)
+
+async def close_clients() -> None:
+    """Close every cached provider client and its connection pool."""
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        try:
+            await client.close()
+        except Exception:
+            logger.warning('Failed to close AI provider client', exc_info=True)
+
+
+async def _call_anthropic(system_prompt: str, user_prompt: str, model: str, api_key: str, max_tokens: int = MAX_TOKENS_PER_RESULT) -> str:
+    """Call Anthropic Claude API and return the text response."""
+    client = get_client('anthropic', api_key)
     response = await client.messages.create(
         model=model,
-        max_tokens=1024,
+        max_tokens=max_tokens,
         temperature=0,
         system=system_prompt,
         messages=[{'role': 'user', 'content': user_prompt}],
@@ -59,14 +156,12 @@ async def _call_anthropic(system_prompt: str, user_prompt: str, model: str, api_
     return response.content[0].text
 
 
-async def _call_openai(system_prompt: str, user_prompt: str, model: str, api_key: str) -> str:
+async def _call_openai(system_prompt: str, user_prompt: str, model: str, api_key: str, max_tokens: int = MAX_TOKENS_PER_RESULT) -> str:
     """Call OpenAI API and return the text response."""
-    from openai import AsyncOpenAI
-
-    client = AsyncOpenAI(api_key=api_key)
+    client = get_client('openai', api_key)
     response = await client.chat.completions.create(
         model=model,
-        max_tokens=1024,
+        max_tokens=max_tokens,
         temperature=0,
         messages=[
             {'role': 'system', 'content': system_prompt},
@@ -76,7 +171,7 @@ async def _call_openai(system_prompt: str, user_prompt: str, model: str, api_key
     return response.choices[0].message.content
 
 
-async def _call_llm(system_prompt: str, user_prompt: str) -> str:
+async def _call_llm(system_prompt: str, user_prompt: str, max_tokens: int = MAX_TOKENS_PER_RESULT) -> str:
     """Route to the configured LLM provider."""
     settings = get_settings()
     provider = settings.ai_provider
@@ -87,25 +182,36 @@ async def _call_llm(system_prompt: str, user_prompt: str) -> str:
         raise ValueError(f'No API key configured for provider: {provider}')
 
     if provider == 'anthropic':
-        return await _call_anthropic(system_prompt, user_prompt, model, api_key)
+        call = _call_anthropic
     elif provider == 'openai':
-        return await _call_openai(system_prompt, user_prompt, model, api_key)
+        call = _call_openai
     else:
         raise ValueError(f'Unknown AI provider: {provider}')
 
+    # Rough prompt size (~4 characters per token) plus the completion budget.
+    estimated_tokens = (len(system_prompt) + len(user_prompt)) // 4 + max_tokens
+    async with get_dispatcher().slot(estimated_tokens):
+        increment('screening_llm_calls', 1)
+        return await call(system_prompt, user_prompt, model, api_key, max_tokens)
 
-def _parse_screening_result(raw_text: str) -> dict:
-    """Parse LLM response into structured screening result."""
-    # Strip markdown code fences if present
+
+def _strip_code_fences(raw_text: str) -> str:
     text = raw_text.strip()
     if text.startswith('```'):
         lines = text.split('\n')
         # Remove first and last lines (code fences)
         lines = [l for l in lines if not l.strip().startswith('```')]
         text = '\n'.join(lines)
+    return text
 
-    result = json.loads(text)
 
+def _parse_screening_result(raw_text: str) -> dict:
+    """Parse LLM response into structured screening result."""
+    return _normalize_result(json.loads(_strip_code_fences(raw_text)))
+
+
+def _normalize_result(result: dict) -> dict:
+    """Validate and fill in the fields of one screening result."""
     # Validate required fields
     score = int(result.get('score', 0))
     score = max(0, min(100, score))
@@ -131,6 +237,111 @@ def _parse_screening_result(raw_text: str) -> dict:
     return result
 
 
+def build_user_prompt(job: Job, application: Application) -> str:
+    return USER_PROMPT_TEMPLATE.format(
+        title=job.title,
+        company=job.company,
+        description=job.description,
+        resume_text=application.resume_text,
+    )
+
+
+def build_batch_prompt(job: Job, applications: list[Application]) -> tuple[str, dict[str, Application]]:
+    """Prompt scoring every application against ``job`` at once, plus the candidate ids it uses.
+
+    Candidates get short positional ids (C1, C2, ...) rather than UUIDs so the
+    model has less to copy back and fewer ways to get it wrong.
+    """
+    candidates = {f'C{index}': application for index, application in enumerate(applications, start=1)}
+    blocks = '\n\n---\n\n'.join(
+        BATCH_CANDIDATE_TEMPLATE.format(candidate_id=candidate_id, resume_text=application.resume_text)
+        for candidate_id, application in candidates.items()
+    )
+    prompt = BATCH_USER_PROMPT_TEMPLATE.format(
+        title=job.title,
+        company=job.company,
+        description=job.description,
+        candidates=blocks,
+    )
+    return prompt, candidates
+
+
+def _parse_batch_result(raw_text: str, candidate_ids: set[str]) -> dict[str, dict]:
+    """Per-candidate results from a batch response; unusable entries are left out."""
+    try:
+        entries = json.loads(_strip_code_fences(raw_text)).get('results', [])
+    except (ValueError, AttributeError):
+        return {}
+    results = {}
+    for entry in entries if isinstance(entries, list) else []:
+        if not isinstance(entry, dict):
+            continue
+        candidate_id = str(entry.pop('candidate_id', ''))
+        if candidate_id not in candidate_ids or candidate_id in results:
+            continue
+        try:
+            results[candidate_id] = _normalize_result(entry)
+        except (TypeError, ValueError, AttributeError):
+            continue
+    return results
+
+
+async def score_batch(job: Job, applications: list[Application]) -> dict[UUID, dict]:
+    """Score several applications for one job in a single provider call.
+
+    Returns the parsed result for each application the model answered for;
+    applications missing from the response are simply absent.
+    """
+    prompt, candidates = build_batch_prompt(job, applications)
+    max_tokens = min(MAX_TOKENS_PER_RESULT * len(applications), MAX_BATCH_TOKENS)
+    raw_response = await _call_llm(SYSTEM_PROMPT, prompt, max_tokens=max_tokens)
+    results = _parse_batch_result(raw_response, set(candidates))
+    return {candidates[candidate_id].id: result for candidate_id, result in results.items()}
+
+
+def _normalize_text(text: str | None) -> str:
+    return re.sub(r'\s+', ' ', text or '').strip()
+
+
+def screening_cache_key(job: Job, resume_text: str) -> str:
+    """Content hash identifying a screening result: same inputs, same model and prompts."""
+    parts = [
+        PROMPT_VERSION,
+        get_settings().effective_ai_model,
+        _normalize_text(job.title),
+        _normalize_text(job.company),
+        _normalize_text(job.description),
+        _normalize_text(resume_text),
+    ]
+    return hashlib.sha256('\x1f'.join(parts).encode()).hexdigest()
+
+
+async def _apply_result(session: AsyncSession, screening: AIScreening, job_id: UUID, result: dict) -> None:
+    await record_score_change(session, job_id, screening.score, result['score'])
+    screening.status = ScreeningStatus.completed
+    screening.score = result['score']
+    screening.recommendation = ScreeningRecommendation(result['recommendation'])
+    screening.result = result
+    screening.completed_at = datetime.now(timezone.utc)
+    screening.error_message = None
+    await session.execute(
+        update(Application).where(Application.id == screening.application_id).values(ai_score=result['score'])
+    )
+
+
+async def _start_screening(session: AsyncSession, application_id: UUID) -> AIScreening:
+    """Get or create the screening record for an application and mark it processing."""
+    stmt = select(AIScreening).where(AIScreening.application_id == application_id)
+    screening = (await session.execute(stmt)).scalar_one_or_none()
+    if not screening:
+        screening = AIScreening(application_id=application_id, status=ScreeningStatus.pending)
+        session.add(screening)
+
+    screening.status = ScreeningStatus.processing
+    await session.flush()
+    return screening
+
+
 async def run_screening(session: AsyncSession, application_id: UUID) -> AIScreening:
     """Run AI screening for an application. Called by the worker."""
     # Load application and job
@@ -142,39 +353,21 @@ async def run_screening(session: AsyncSession, application_id: UUID) -> AIScreen
     if not job:
         raise ValueError(f'Job not found for application: {application_id}')
 
-    # Get or create screening record
-    stmt = select(AIScreening).where(AIScreening.application_id == application_id)
-    screening = (await session.execute(stmt)).scalar_one_or_none()
-    if not screening:
-        screening = AIScreening(application_id=application_id, status=ScreeningStatus.pending)
-        session.add(screening)
-
-    screening.status = ScreeningStatus.processing
-    await session.flush()
+    screening = await _start_screening(session, application_id)
 
     try:
-        # Build prompt
-        user_prompt = USER_PROMPT_TEMPLATE.format(
-            title=job.title,
-            company=job.company,
-            description=job.description,
-            resume_text=application.resume_text,
-        )
-
-        # Call LLM
-        raw_response = await _call_llm(SYSTEM_PROMPT, user_prompt)
-        logger.info({'message': 'screening.llm_response', 'application_id': str(application_id), 'length': len(raw_response)})
-
-        # Parse result
-        result = _parse_screening_result(raw_response)
-
-        # Update screening record
-        screening.status = ScreeningStatus.completed
-        screening.score = result['score']
-        screening.recommendation = ScreeningRecommendation(result['recommendation'])
-        screening.result = result
-        screening.completed_at = datetime.now(timezone.utc)
-        screening.error_message = None
+        cache_key = screening_cache_key(job, application.resume_text)
+        result = await get_screening_result(cache_key)
+        if result is None:
+            # Call LLM
+            raw_response = await _call_llm(SYSTEM_PROMPT, build_user_prompt(job, application))
+            logger.info({'message': 'screening.llm_response', 'application_id': str(application_id), 'length': len(raw_response)})
+
+            # Parse result and cache it for identical resume/job pairs
+            result = _parse_screening_result(raw_response)
+            await set_screening_result(cache_key, job.id, result)
+
+        await _apply_result(session, screening, job.id, result)
 
         logger.info({
             'message': 'screening.completed',
@@ -192,6 +385,64 @@ async def run_screening(session: AsyncSession, application_id: UUID) -> AIScreen
     return screening
 
 
+async def run_batch_screening(session: AsyncSession, job_id: UUID, application_ids: list[UUID]) -> list[AIScreening]:
+    """Screen several applications to one job with a single batched provider call.
+
+    Applications the batch response doesn't cover (or the whole batch, if the
+    call or its parsing fails) fall back to one ``run_screening`` call each.
+    Single-call failures are recorded on their screening rows and don't abort
+    the rest of the batch.
+    """
+    job = await session.get(Job, job_id)
+    if not job:
+        raise ValueError(f'Job not found: {job_id}')
+    stmt = select(Application).where(Application.id.in_(application_ids), Application.job_id == job_id)
+    applications = list((await session.execute(stmt)).scalars().all())
+    if not applications:
+        return []
+
+    screenings = {application.id: await _start_screening(session, application.id) for application in applications}
+    cache_keys = {application.id: screening_cache_key(job, application.resume_text) for application in applications}
+    results: dict[UUID, dict] = {}
+    for application in applications:
+        cached = await get_screening_result(cache_keys[application.id])
+        if cached is not None:
+            results[application.id] = cached
+    uncached = [application for application in applications if application.id not in results]
+    if len(uncached) > 1:
+        try:
+            scored = await score_batch(job, uncached)
+        except Exception as exc:
+            logger.warning({'message': 'screening.batch_failed', 'job_id': str(job_id), 'error': str(exc)})
+        else:
+            for application_id, result in scored.items():
+                await set_screening_result(cache_keys[application_id], job.id, result)
+            results.update(scored)
+
+    completed = []
+    for application in applications:
+        result = results.get(application.id)
+        if result is not None:
+            await _apply_result(session, screenings[application.id], job.id, result)
+            completed.append(screenings[application.id])
+            logger.info({
+                'message': 'screening.completed',
+                'application_id': str(application.id),
+                'score': result['score'],
+                'recommendation': result['recommendation'],
+                'batched': True,
+            })
+            continue
+        if len(uncached) > 1:
+            increment('screening_batch_fallbacks', 1)
+        try:
+            completed.append(await run_screening(session, application.id))
+        except Exception:
+            # run_screening has already marked the row failed and logged why.
+            pass
+    return completed
+
+
 async def get_screening_for_application(session: AsyncSession, application_id: UUID) -> AIScreening | None:
     """Load screening result for an application."""
     stmt = select(AIScreening).where(AIScreening.application_id == application_id)
@@ -1,18 +1,44 @@
+import argparse
 import asyncio
 import logging
+import multiprocessing
+import multiprocessing.connection
+import random
+import signal
+import time
+from datetime import datetime, timezone
 from typing import Any, Callable
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db import SessionLocal
-from app.queue import dequeue, push_dlq, requeue
+from app import metrics
+from app.config import get_settings
+from app.db import SessionLocal, get_redis
+from app.queue import (
+    Claim,
+    ack,
+    claim_batch,
+    dequeue,
+    dequeue_batch,
+    extend_claims,
+    new_consumer_id,
+    promote_due_tasks,
+    push_dlq,
+    reap_expired_claims,
+    release_screenings,
+    requeue,
+    schedule_retry,
+)
+from app.services.analytics import reconcile_if_due
 from app.services.audit import create_audit_log
-from app.services.screening import run_screening
+from app.services.platform_analytics import refresh_if_due
+from app.services.screening import close_clients, run_batch_screening, run_screening
 
 logger = logging.getLogger('hiretrack.worker')
 
-BACKOFF_SECONDS = [1, 4, 10]
-MAX_RETRIES = 3
+_settings = get_settings()
+BACKOFF_SECONDS = [float(delay) for delay in _settings.worker_retry_backoff_seconds.split(',') if delay.strip()]
+MAX_RETRIES = _settings.worker_max_retries
 
 
 async def handle_application_submitted(session: AsyncSession, payload: dict[str, Any]) -> None:
@@ -46,6 +72,8 @@ async def handle_screen_resume(session: AsyncSession, payload: dict[str, Any]) -
     application_id = payload.get('applicationId')
     if not application_id:
         raise ValueError('Missing applicationId in screen_resume payload')
+    # Clear the queued marker up front so a rescreen requested after a failure isn't deduplicated away.
+    await release_screenings([application_id])
     await run_screening(session, UUID(application_id))
     await create_audit_log(
         session,
@@ -58,10 +86,31 @@ async def handle_screen_resume(session: AsyncSession, payload: dict[str, Any]) -
     logger.info({'message': 'screening.task.completed', 'applicationId': application_id})
 
 
+async def handle_screen_batch(session: AsyncSession, payload: dict[str, Any]) -> None:
+    from uuid import UUID
+    job_id = payload.get('jobId')
+    application_ids = payload.get('applicationIds') or []
+    if not job_id or not application_ids:
+        raise ValueError('Missing jobId or applicationIds in screen_batch payload')
+    await release_screenings(application_ids)
+    screenings = await run_batch_screening(session, UUID(job_id), [UUID(app_id) for app_id in application_ids])
+    for screening in screenings:
+        await create_audit_log(
+            session,
+            actor_id=None,
+            action='application.ai_screened',
+            entity_type='application',
+            entity_id=screening.application_id,
+            metadata={'applicationId': str(screening.application_id), 'async': True, 'batched': True},
+        )
+    logger.info({'message': 'screening.batch_task.completed', 'jobId': job_id, 'screened': len(screenings)})
+
+
 TASK_HANDLERS: dict[str, Callable[[AsyncSession, dict[str, Any]], Any]] = {
     'application.submitted': handle_application_submitted,
     'application.status_changed': handle_application_status_changed,
     'application.screen_resume': handle_screen_resume,
+    'application.screen_batch': handle_screen_batch,
 }
 
 
@@ -76,11 +125,68 @@ async def process_task(task: dict[str, Any]) -> None:
         await session.commit()
 
 
+CONSUMER_ID = new_consumer_id()
+_last_reap = 0.0
+
+
+async def _maybe_reap() -> None:
+    global _last_reap
+    if time.monotonic() - _last_reap < get_settings().queue_reap_interval_seconds:
+        return
+    _last_reap = time.monotonic()
+    returned = await reap_expired_claims()
+    if returned:
+        logger.warning({'message': 'queue.reaped', 'tasks': returned})
+
+
+async def _keep_claimed(claims: list[Claim], interval: float) -> None:
+    """Extend ``claims`` every ``interval`` seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await extend_claims(claims)
+        except Exception:
+            logger.warning('Failed to extend queue claims', exc_info=True)
+
+
 async def process_once() -> bool:
+    settings = get_settings()
+    await promote_due_tasks()
+    if settings.queue_reliable:
+        await _maybe_reap()
+        claims = await claim_batch(CONSUMER_ID, 1)
+        if not claims:
+            return False
+        # A slow task must not outlive its visibility timeout and be redelivered mid-run.
+        keepalive = asyncio.create_task(_keep_claimed(claims, settings.queue_reap_interval_seconds))
+        try:
+            handled = await handle_task(claims[0].task)
+        finally:
+            keepalive.cancel()
+        await ack(claims[0])
+        return handled
+
     task = await dequeue()
     if not task:
         return False
+    return await handle_task(task)
+
 
+def retry_delay(attempts: int) -> float:
+    """Backoff before retry number ``attempts``, spread by WORKER_RETRY_JITTER."""
+    if not BACKOFF_SECONDS:
+        return 0.0
+    delay = BACKOFF_SECONDS[min(attempts - 1, len(BACKOFF_SECONDS) - 1)]
+    jitter = get_settings().worker_retry_jitter
+    return max(delay * random.uniform(1 - jitter, 1 + jitter), 0.0)
+
+
+async def handle_task(task: dict[str, Any]) -> bool:
+    """Run one dequeued task, scheduling a retry or dead-lettering it on failure.
+
+    Retries go to the delayed queue instead of sleeping here, so the worker
+    slot is free for other tasks while a failed one waits out its backoff.
+    """
     attempts = int(task.get('attempts', 0))
     try:
         await process_task(task)
@@ -89,26 +195,304 @@ async def process_once() -> bool:
         attempts += 1
         task['attempts'] = attempts
         task['error'] = str(exc)
+        task.setdefault('history', []).append({
+            'attempt': attempts,
+            'error': str(exc),
+            'failedAt': datetime.now(timezone.utc).isoformat(),
+        })
         if attempts >= MAX_RETRIES:
             await push_dlq(task)
             logger.error({'message': 'task.failed', 'task': task})
         else:
-            delay = BACKOFF_SECONDS[min(attempts - 1, len(BACKOFF_SECONDS) - 1)]
-            logger.warning({'message': 'task.retry', 'task': task, 'delay': delay})
-            await asyncio.sleep(delay)
-            await requeue(task)
+            delay = retry_delay(attempts)
+            logger.warning({'message': 'task.retry', 'task': task, 'delay': round(delay, 2)})
+            await schedule_retry(task, delay)
         return False
 
 
-async def run() -> None:
+async def _reconcile_analytics(interval: float) -> None:
     while True:
-        await process_once()
+        try:
+            await reconcile_if_due(interval)
+        except Exception:
+            logger.warning('Failed to reconcile analytics rollups', exc_info=True)
+        await asyncio.sleep(interval)
+
+
+async def _refresh_platform_views(interval: float) -> None:
+    while True:
+        try:
+            await refresh_if_due(interval)
+        except Exception:
+            logger.warning('Failed to refresh platform analytics views', exc_info=True)
+        await asyncio.sleep(interval)
+
+
+async def _publish_metrics(interval: float) -> None:
+    # Outlives a couple of missed publishes, then drops out of /admin/metrics.
+    ttl = max(int(interval * 3), 1)
+    while True:
+        try:
+            await metrics.publish(get_redis(), ttl)
+        except Exception:
+            logger.warning('Failed to publish worker metrics', exc_info=True)
+        await asyncio.sleep(interval)
+
+
+def start_background_loops() -> list[asyncio.Task]:
+    """Start the configured metrics publishing, rollup reconciliation and platform view refresh loops.
+
+    Both the dedicated worker and the embedded one (EMBEDDED_WORKER) run them;
+    the Redis locks in ``reconcile_if_due``/``refresh_if_due`` keep the passes
+    of several processes from overlapping.
+    """
+    settings = get_settings()
+    loops = []
+    if settings.worker_metrics_publish_seconds > 0:
+        loops.append(asyncio.create_task(_publish_metrics(settings.worker_metrics_publish_seconds)))
+    if settings.analytics_reconcile_interval_seconds > 0:
+        loops.append(asyncio.create_task(_reconcile_analytics(settings.analytics_reconcile_interval_seconds)))
+    if settings.platform_analytics_refresh_seconds > 0:
+        loops.append(asyncio.create_task(_refresh_platform_views(settings.platform_analytics_refresh_seconds)))
+    return loops
+
+
+def parse_type_limits(raw: str) -> dict[str, int]:
+    """Parse ``'type=n,type=n'`` into per-task-type concurrency caps."""
+    limits = {}
+    for item in raw.split(','):
+        if not item.strip():
+            continue
+        task_type, _, limit = item.partition('=')
+        limits[task_type.strip()] = int(limit)
+    return limits
+
+
+class ConcurrentWorker:
+    """Pulls tasks in batches and runs up to ``concurrency`` of them at once.
+
+    Only as many tasks as there are free slots are dequeued, so a worker never
+    holds more work than it is running. Tasks whose type has its own cap wait
+    for a slot of that type while still counting against ``concurrency``.
+
+    With ``reliable`` set, tasks are claimed into this worker's processing list
+    and acked only after they are handled. A background loop extends the
+    claims of running tasks and returns expired claims (from crashed workers,
+    or tasks cancelled at shutdown) to the queue.
+    """
+
+    def __init__(
+        self,
+        concurrency: int,
+        batch_size: int,
+        type_limits: dict[str, int] | None = None,
+        dequeue_timeout: int = 1,
+        reliable: bool = False,
+        consumer: str | None = None,
+    ) -> None:
+        self.concurrency = max(concurrency, 1)
+        self.batch_size = max(batch_size, 1)
+        self.dequeue_timeout = dequeue_timeout
+        self._type_slots = {
+            task_type: asyncio.Semaphore(limit) for task_type, limit in (type_limits or {}).items()
+        }
+        self.reliable = reliable
+        self.consumer = consumer or new_consumer_id()
+        self._inflight: set[asyncio.Task] = set()
+        self._claims: dict[asyncio.Task, Claim] = {}
+        self._stopping = asyncio.Event()
 
+    @property
+    def inflight(self) -> int:
+        return len(self._inflight)
 
-def main() -> None:
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def _run_task(self, task: dict[str, Any], claim: Claim | None) -> None:
+        slot = self._type_slots.get(task.get('type'))
+        try:
+            if slot is None:
+                await handle_task(task)
+            else:
+                async with slot:
+                    await handle_task(task)
+        except asyncio.CancelledError:
+            # Without a claim nothing else remembers this task, so hand it back before going.
+            if claim is None:
+                await requeue(task)
+                logger.warning({'message': 'task.requeued_on_cancel', 'taskId': task.get('id')})
+            raise
+        if claim is not None:
+            await ack(claim)
+
+    def _start(self, task: dict[str, Any], claim: Claim | None = None) -> None:
+        running = asyncio.create_task(self._run_task(task, claim))
+        self._inflight.add(running)
+        if claim is not None:
+            self._claims[running] = claim
+        running.add_done_callback(self._finished)
+
+    def _finished(self, running: asyncio.Task) -> None:
+        self._inflight.discard(running)
+        self._claims.pop(running, None)
+        if not running.cancelled() and running.exception() is not None:
+            logger.error({'message': 'task.unhandled', 'error': str(running.exception())})
+
+    async def _fetch(self, count: int) -> None:
+        if self.reliable:
+            for claim in await claim_batch(self.consumer, count, timeout=self.dequeue_timeout):
+                self._start(claim.task, claim)
+            return
+        for task in await dequeue_batch(count, timeout=self.dequeue_timeout):
+            self._start(task)
+
+    async def _promote_retries(self, interval: float) -> None:
+        while True:
+            try:
+                await promote_due_tasks()
+            except Exception:
+                logger.warning('Failed to promote due retries', exc_info=True)
+            await asyncio.sleep(interval)
+
+    async def _maintain_claims(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await extend_claims(list(self._claims.values()))
+                returned = await reap_expired_claims()
+                if returned:
+                    logger.warning({'message': 'queue.reaped', 'tasks': returned})
+            except Exception:
+                logger.warning('Failed to maintain queue claims', exc_info=True)
+
+    async def run(self, shutdown_timeout: float | None = None) -> None:
+        """Consume until ``stop()`` is called, then wait for in-flight tasks to finish."""
+        settings = get_settings()
+        background = [asyncio.create_task(self._promote_retries(settings.worker_promote_interval_seconds))]
+        background.extend(start_background_loops())
+        if self.reliable:
+            await reap_expired_claims()
+            background.append(asyncio.create_task(self._maintain_claims(settings.queue_reap_interval_seconds)))
+        try:
+            while not self._stopping.is_set():
+                free = self.concurrency - len(self._inflight)
+                if free <= 0:
+                    await asyncio.wait(self._inflight, return_when=asyncio.FIRST_COMPLETED)
+                    continue
+                await self._fetch(min(free, self.batch_size))
+        finally:
+            await self.drain(shutdown_timeout)
+            for loop in background:
+                loop.cancel()
+
+    async def drain(self, timeout: float | None = None) -> None:
+        """Wait up to ``timeout`` for in-flight tasks, then cancel the rest.
+
+        Cancelled tasks go back to the queue: claimed ones through the reaper
+        once their claim expires, unclaimed ones are requeued on their lane.
+        """
+        if not self._inflight:
+            return
+        logger.info({'message': 'worker.draining', 'inflight': len(self._inflight)})
+        _, pending = await asyncio.wait(set(self._inflight), timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning({'message': 'worker.drain_timeout', 'cancelled': len(pending)})
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+def build_worker() -> ConcurrentWorker:
+    settings = get_settings()
+    return ConcurrentWorker(
+        concurrency=settings.worker_concurrency,
+        batch_size=settings.worker_batch_size,
+        type_limits=parse_type_limits(settings.worker_type_concurrency),
+        reliable=settings.queue_reliable,
+    )
+
+
+async def run() -> None:
+    worker = build_worker()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+    try:
+        await worker.run(shutdown_timeout=get_settings().worker_shutdown_timeout_seconds)
+    finally:
+        await close_clients()
+
+
+def _run_process() -> None:
     logging.basicConfig(level=logging.INFO)
     asyncio.run(run())
 
 
+def supervise(processes: int, restart_delay: float = 1.0) -> None:
+    """Run ``processes`` worker processes, each with its own event loop, restarting any that die.
+
+    SIGINT/SIGTERM are forwarded to the children, which drain their in-flight
+    tasks before exiting; children still alive after the drain timeout are killed.
+    """
+    ctx = multiprocessing.get_context('spawn')
+    children: dict[int, multiprocessing.Process] = {}
+    stopping = False
+
+    def _spawn(slot: int) -> None:
+        process = ctx.Process(target=_run_process, name=f'hiretrack-worker-{slot}')
+        process.start()
+        children[slot] = process
+        logger.info({'message': 'worker.process.started', 'slot': slot, 'pid': process.pid})
+
+    def _stop(signum: int, _frame: Any) -> None:
+        nonlocal stopping
+        stopping = True
+        for process in children.values():
+            if process.is_alive():
+                process.terminate()
+
+    signal.signal(signal.SIGINT, _stop)
+    signal.signal(signal.SIGTERM, _stop)
+    for slot in range(processes):
+        _spawn(slot)
+
+    while not stopping:
+        multiprocessing.connection.wait([process.sentinel for process in children.values()], timeout=1)
+        for slot, process in list(children.items()):
+            if process.is_alive() or stopping:
+                continue
+            logger.error({'message': 'worker.process.died', 'slot': slot, 'exitcode': process.exitcode})
+            time.sleep(restart_delay)
+            _spawn(slot)
+
+    deadline = time.monotonic() + get_settings().worker_shutdown_timeout_seconds + 5
+    for process in children.values():
+        process.join(timeout=max(deadline - time.monotonic(), 0))
+        if process.is_alive():
+            process.kill()
+            process.join()
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Run HireTrack queue workers.')
+    parser.add_argument(
+        '--processes',
+        type=int,
+        default=get_settings().worker_processes,
+        help='worker processes to run (default: WORKER_PROCESSES)',
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args(argv)
+    if args.processes <= 1:
+        asyncio.run(run())
+        return
+    supervise(args.processes)
+
+
 if __name__ == '__main__':
     main()
@@ -0,0 +1,89 @@
+"""
+Provider calls and prompt tokens saved by batched AI screening.
+Run: python -m benchmarks.bench_batch_screening [APPLICATIONS]
+
+Scores APPLICATIONS in-memory applications (default 300) to one job against a
+fake provider that answers instantly, so no database or API key is needed.
+Batch size 1 is the one-call-per-application path. Tokens are estimated at
+four characters each over the prompts actually sent.
+"""
+import asyncio
+import json
+import re
+import sys
+import uuid
+
+from app.models import Application, EmploymentType, Job, JobStatus
+from app.services import screening
+
+BATCH_SIZES = [1, 5, 10, 20]
+RESULT = {
+    'score': 72,
+    'recommendation': 'good_match',
+    'skills_match': {'matched': ['python'], 'missing': ['go'], 'bonus': []},
+    'experience_assessment': 'Solid backend experience.',
+    'strengths': ['APIs'],
+    'concerns': [],
+}
+
+
+class FakeProvider:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.prompt_chars = 0
+
+    async def __call__(self, system_prompt: str, user_prompt: str, max_tokens: int = 1024) -> str:
+        self.calls += 1
+        self.prompt_chars += len(system_prompt) + len(user_prompt)
+        candidate_ids = re.findall(r'^Candidate (C\d+) Resume:', user_prompt, flags=re.MULTILINE)
+        if not candidate_ids:
+            return json.dumps(RESULT)
+        return json.dumps({'results': [{'candidate_id': candidate_id, **RESULT} for candidate_id in candidate_ids]})
+
+
+def make_fixtures(count: int) -> tuple[Job, list[Application]]:
+    job = Job(
+        id=uuid.uuid4(),
+        employer_id=uuid.uuid4(),
+        title='Senior Backend Engineer',
+        company='Acme',
+        location='Remote',
+        description='Design, build and operate high-traffic Python services. ' * 40,
+        employment_type=EmploymentType.full_time,
+        remote=True,
+        status=JobStatus.active,
+    )
+    applications = [
+        Application(id=uuid.uuid4(), job_id=job.id, applicant_id=uuid.uuid4(), resume_text='Experienced engineer. ' * 60)
+        for _ in range(count)
+    ]
+    return job, applications
+
+
+async def run(job: Job, applications: list[Application], batch_size: int) -> FakeProvider:
+    provider = FakeProvider()
+    screening._call_llm = provider
+    for start in range(0, len(applications), batch_size):
+        chunk = applications[start:start + batch_size]
+        if batch_size == 1:
+            screening._parse_screening_result(await provider(screening.SYSTEM_PROMPT, screening.build_user_prompt(job, chunk[0])))
+        else:
+            scored = await screening.score_batch(job, chunk)
+            assert len(scored) == len(chunk)
+    return provider
+
+
+async def main(count: int) -> None:
+    job, applications = make_fixtures(count)
+    print(f'{count} applications to one job')
+    print(f"{'batch size':>11} {'calls':>7} {'prompt tokens':>14} {'tokens saved':>13}")
+    baseline = None
+    for batch_size in BATCH_SIZES:
+        provider = await run(job, applications, batch_size)
+        tokens = provider.prompt_chars // 4
+        baseline = baseline or tokens
+        print(f'{batch_size:>11} {provider.calls:>7} {tokens:>14} {1 - tokens / baseline:>12.0%}')
+
+
+if __name__ == '__main__':
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 300))
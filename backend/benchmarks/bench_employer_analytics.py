@@ -0,0 +1,154 @@
+"""
+Employer dashboard analytics at 1k, 100k and 1M applications.
+Run: python -m benchmarks.bench_employer_analytics [SIZES]
+
+For each size (comma separated, default 1000,100000,1000000) seeds one
+employer with that many applications spread over jobs of 10k applications
+each, about 70% of them scored, in the database pointed to by DATABASE_URL.
+It then times, as the median of a few runs:
+  legacy - the previous handler: seven sequential aggregates, with every
+           score fetched and bucketed in Python
+  live   - get_employer_dashboard_live(): one CTE scan with the histogram
+           bucketed in SQL
+  rollup - get_employer_dashboard(): reads of the job_stats rollups
+Seeded rows are deleted afterwards.
+"""
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+
+from sqlalchemy import Date, cast, delete, func, select, text
+
+from app.db import SessionLocal, engine
+from app.models import AIScreening, Application, Job, User, UserRole
+from app.services.analytics import get_employer_dashboard, get_employer_dashboard_live, reconcile_rollups
+
+APPLICATIONS_PER_JOB = 10_000
+REPEATS = 3
+
+
+async def seed(size: int) -> tuple[User, list[uuid.UUID]]:
+    jobs = max(1, size // APPLICATIONS_PER_JOB)
+    per_job = size // jobs
+    async with SessionLocal() as session:
+        employer = User(email=f'bench-{uuid.uuid4()}@example.com', password_hash='x', role=UserRole.employer)
+        session.add(employer)
+        await session.flush()
+        applicant_ids = (await session.execute(
+            text("""
+                INSERT INTO users (id, email, password_hash, role)
+                SELECT gen_random_uuid(), 'bench-' || gen_random_uuid() || '@example.com', 'x', 'applicant'
+                FROM generate_series(1, :count)
+                RETURNING id
+            """),
+            {'count': per_job},
+        )).scalars().all()
+        await session.execute(
+            text("""
+                INSERT INTO jobs (id, employer_id, title, company, location, description, employment_type, remote, status)
+                SELECT gen_random_uuid(), :employer_id, 'Bench role ' || i, 'Bench Co', 'Remote', 'Bench', 'full_time', true, 'active'
+                FROM generate_series(1, :jobs) AS i
+            """),
+            {'employer_id': employer.id, 'jobs': jobs},
+        )
+        await session.execute(
+            text("""
+                INSERT INTO applications (id, job_id, applicant_id, resume_text, status, created_at)
+                SELECT gen_random_uuid(), j.id, u.id, 'Resume',
+                       (ARRAY['applied', 'reviewed', 'interview', 'rejected', 'accepted'])[1 + floor(random() * 5)::int]::application_status,
+                       now() - random() * interval '180 days'
+                FROM jobs j CROSS JOIN unnest(CAST(:applicants AS uuid[])) AS u(id)
+                WHERE j.employer_id = :employer_id
+            """),
+            {'employer_id': employer.id, 'applicants': applicant_ids},
+        )
+        await session.execute(
+            text("""
+                INSERT INTO ai_screenings (id, application_id, status, score)
+                SELECT gen_random_uuid(), a.id, 'completed', floor(random() * 101)::int
+                FROM applications a JOIN jobs j ON j.id = a.job_id
+                WHERE j.employer_id = :employer_id AND random() < 0.7
+            """),
+            {'employer_id': employer.id},
+        )
+        await reconcile_rollups(session, employer.id)
+        await session.commit()
+        for table in ('users', 'jobs', 'applications', 'ai_screenings', 'job_stats', 'job_daily_applications'):
+            await session.execute(text(f'ANALYZE {table}'))
+        return employer, list(applicant_ids)
+
+
+async def legacy(session, employer_id: uuid.UUID) -> None:
+    employer_jobs = select(Job.id).where(Job.employer_id == employer_id).scalar_subquery()
+    scored = (
+        select(AIScreening.score)
+        .join(Application, AIScreening.application_id == Application.id)
+        .where(Application.job_id.in_(employer_jobs))
+        .where(AIScreening.score.isnot(None))
+    )
+    await session.execute(select(func.count()).select_from(Job).where(Job.employer_id == employer_id))
+    await session.execute(select(func.count()).select_from(Application).where(Application.job_id.in_(employer_jobs)))
+    await session.execute(select(func.round(func.avg(scored.subquery().c.score))))
+    await session.execute(
+        select(Application.status, func.count()).where(Application.job_id.in_(employer_jobs)).group_by(Application.status)
+    )
+    await session.execute(
+        select(Job.id, func.count(Application.id), func.round(func.avg(AIScreening.score)))
+        .join(Application, Application.job_id == Job.id)
+        .outerjoin(AIScreening, AIScreening.application_id == Application.id)
+        .where(Job.employer_id == employer_id)
+        .group_by(Job.id)
+        .order_by(func.count(Application.id).desc())
+        .limit(8)
+    )
+    day = cast(Application.created_at, Date)
+    await session.execute(
+        select(day, func.count()).where(Application.job_id.in_(employer_jobs)).group_by(day).order_by(day)
+    )
+    buckets = [0] * 5
+    for score in (await session.execute(scored)).scalars().all():
+        buckets[min(max(score - 1, 0) // 20, 4)] += 1
+
+
+async def timed(fn, employer_id: uuid.UUID) -> float:
+    samples = []
+    for _ in range(REPEATS):
+        async with SessionLocal() as session:
+            start = time.perf_counter()
+            await fn(session, employer_id)
+            samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def cleanup(employer: User, applicant_ids: list[uuid.UUID]) -> None:
+    async with SessionLocal() as session:
+        job_ids = select(Job.id).where(Job.employer_id == employer.id)
+        application_ids = select(Application.id).where(Application.job_id.in_(job_ids))
+        await session.execute(delete(AIScreening).where(AIScreening.application_id.in_(application_ids)))
+        await session.execute(delete(Application).where(Application.job_id.in_(job_ids)))
+        await session.execute(delete(Job).where(Job.employer_id == employer.id))
+        await session.execute(delete(User).where(User.id.in_([employer.id, *applicant_ids])))
+        await session.commit()
+
+
+async def main(sizes: list[int]) -> None:
+    print(f"{'applications':>13} {'legacy ms':>10} {'live ms':>9} {'rollup ms':>10}")
+    try:
+        for size in sizes:
+            employer, applicant_ids = await seed(size)
+            try:
+                legacy_ms = await timed(legacy, employer.id)
+                live_ms = await timed(get_employer_dashboard_live, employer.id)
+                rollup_ms = await timed(get_employer_dashboard, employer.id)
+                print(f'{size:>13} {legacy_ms:>10.1f} {live_ms:>9.1f} {rollup_ms:>10.1f}')
+            finally:
+                await cleanup(employer, applicant_ids)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == '__main__':
+    raw = sys.argv[1] if len(sys.argv) > 1 else '1000,100000,1000000'
+    asyncio.run(main([int(size) for size in raw.split(',')]))
@@ -0,0 +1,106 @@
+"""
+Job search benchmark: leading-wildcard ILIKE vs. the tsvector/GIN index.
+Run: python -m benchmarks.bench_job_search [ROWS]
+
+Seeds ROWS synthetic active jobs (default 500000) whose descriptions mix a small
+vocabulary of common words with a long, roughly Zipf-distributed tail of rare
+terms, in the database pointed to by DATABASE_URL, times the legacy ILIKE filter against
+the full-text filter used by list_jobs() for a few search terms (count + first
+ranked page), then deletes the seeded rows.
+"""
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+
+from sqlalchemy import delete, func, or_, select, text
+
+from app.db import SessionLocal, engine
+from app.models import Job, JobStatus, User, UserRole
+from app.services.jobs import build_search_query
+
+TERMS = ['term3', 'kubernetes', 'platform engineer', 'term2500', 'term41234', 'zeppelin']
+PAGE_SIZE = 20
+REPEATS = 3
+WORDS = [
+    'python', 'golang', 'kubernetes', 'platform', 'engineer', 'data', 'pipeline', 'react', 'design',
+    'backend', 'frontend', 'security', 'cloud', 'distributed', 'systems', 'analytics', 'product',
+    'manager', 'customer', 'support', 'sales', 'finance', 'mobile', 'android', 'ios', 'testing',
+    'remote', 'team', 'startup', 'scale', 'performance', 'database', 'postgres', 'redis', 'api',
+]
+
+
+async def seed(rows: int) -> User:
+    async with SessionLocal() as session:
+        employer = User(email=f'bench-{uuid.uuid4()}@example.com', password_hash='x', role=UserRole.employer)
+        session.add(employer)
+        await session.flush()
+        await session.execute(
+            text("""
+                WITH vocab AS (SELECT CAST(:words AS text[]) AS w)
+                INSERT INTO jobs (id, employer_id, title, company, location, description, employment_type, remote, status)
+                SELECT gen_random_uuid(), :employer_id,
+                       initcap(w[1 + (i * 7) % cardinality(w)] || ' ' || w[1 + (i * 13) % cardinality(w)]),
+                       'Bench Co', 'Remote',
+                       array_to_string(ARRAY(
+                           SELECT CASE WHEN random() < 0.1 THEN w[1 + floor(random() * cardinality(w))::int]
+                                       ELSE 'term' || floor(exp(random() * ln(50000)))::int END
+                           FROM generate_series(1, 80) WHERE i > 0
+                       ), ' '),
+                       'full_time', true, 'active'
+                FROM generate_series(1, :rows) AS i, vocab
+            """),
+            {'employer_id': employer.id, 'rows': rows, 'words': WORDS},
+        )
+        await session.commit()
+        await session.execute(text('ANALYZE jobs'))
+        return employer
+
+
+def ilike_stmt(term: str):
+    return select(Job).where(
+        Job.status == JobStatus.active,
+        or_(Job.title.ilike(f'%{term}%'), Job.description.ilike(f'%{term}%')),
+    )
+
+
+def fts_stmt(term: str):
+    return select(Job).where(Job.status == JobStatus.active, Job.search_vector.op('@@')(build_search_query(term)))
+
+
+async def time_search(term: str, ranked: bool) -> tuple[float, int]:
+    stmt = fts_stmt(term) if ranked else ilike_stmt(term)
+    page_stmt = stmt.order_by(Job.created_at.desc(), Job.id.desc())
+    if ranked:
+        page_stmt = stmt.order_by(func.ts_rank_cd(Job.search_vector, build_search_query(term)).desc())
+    samples = []
+    total = 0
+    for _ in range(REPEATS):
+        async with SessionLocal() as session:
+            start = time.perf_counter()
+            total = (await session.execute(select(func.count()).select_from(stmt.subquery()))).scalar_one()
+            (await session.execute(page_stmt.limit(PAGE_SIZE))).scalars().all()
+            samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), total
+
+
+async def main(rows: int) -> None:
+    employer = await seed(rows)
+    try:
+        print(f'{rows} synthetic jobs, median of {REPEATS} runs (count + first page)')
+        print(f"{'term':<20} {'ilike ms':>10} {'fts ms':>10} {'ilike rows':>11} {'fts rows':>9}")
+        for term in TERMS:
+            ilike_ms, ilike_total = await time_search(term, ranked=False)
+            fts_ms, fts_total = await time_search(term, ranked=True)
+            print(f'{term:<20} {ilike_ms:>10.1f} {fts_ms:>10.1f} {ilike_total:>11} {fts_total:>9}')
+    finally:
+        async with SessionLocal() as session:
+            await session.execute(delete(Job).where(Job.employer_id == employer.id))
+            await session.execute(delete(User).where(User.id == employer.id))
+            await session.commit()
+        await engine.dispose()
+
+
+if __name__ == '__main__':
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000))
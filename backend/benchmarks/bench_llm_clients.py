@@ -0,0 +1,102 @@
+"""
+Per-call overhead of building a provider client per screening vs. reusing one.
+Run: python -m benchmarks.bench_llm_clients [CALLS]
+
+Starts a local stub of the OpenAI chat completions endpoint that answers
+immediately, then makes CALLS requests (default 200) through the OpenAI SDK:
+  fresh   - a new AsyncOpenAI client per call, as screening used to do
+  pooled  - the shared client from app.services.screening.get_client
+The stub does no work, so the difference is client setup plus connection
+establishment. Against a real provider each new connection also pays a TLS
+handshake, which this local plain-HTTP stub does not capture.
+"""
+import asyncio
+import json
+import statistics
+import sys
+import time
+
+from openai import AsyncOpenAI
+
+from app.config import get_settings
+from app.services import screening
+
+RESPONSE = json.dumps({
+    'id': 'chatcmpl-bench',
+    'object': 'chat.completion',
+    'created': 0,
+    'model': 'bench',
+    'choices': [{'index': 0, 'finish_reason': 'stop', 'message': {'role': 'assistant', 'content': '{"score": 50}'}}],
+    'usage': {'prompt_tokens': 1, 'completion_tokens': 1, 'total_tokens': 2},
+}).encode()
+
+
+async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        while True:
+            head = await reader.readuntil(b'\r\n\r\n')
+            length = 0
+            for line in head.split(b'\r\n'):
+                if line.lower().startswith(b'content-length:'):
+                    length = int(line.split(b':', 1)[1])
+            await reader.readexactly(length)
+            writer.write(
+                b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n'
+                + f'Content-Length: {len(RESPONSE)}\r\n\r\n'.encode()
+                + RESPONSE
+            )
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionResetError):
+        pass
+    finally:
+        writer.close()
+
+
+async def call(client: AsyncOpenAI) -> None:
+    await client.chat.completions.create(
+        model='bench',
+        max_tokens=16,
+        messages=[{'role': 'user', 'content': 'ping'}],
+    )
+
+
+async def time_calls(calls: int, make_client) -> list[float]:
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        client = make_client()
+        await call(client)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+async def main(calls: int) -> None:
+    server = await asyncio.start_server(handle, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    base_url = f'http://127.0.0.1:{port}/v1'
+    get_settings().ai_base_url = base_url
+    try:
+        fresh_clients = []
+
+        def fresh() -> AsyncOpenAI:
+            client = AsyncOpenAI(api_key='bench', base_url=base_url)
+            fresh_clients.append(client)
+            return client
+
+        fresh_ms = await time_calls(calls, fresh)
+        for client in fresh_clients:
+            await client.close()
+        pooled_ms = await time_calls(calls, lambda: screening.get_client('openai', 'bench'))
+
+        print(f'{calls} sequential calls against a local stub, ms per call')
+        print(f"{'mode':>8} {'p50':>8} {'mean':>8} {'max':>8}")
+        for name, samples in (('fresh', fresh_ms), ('pooled', pooled_ms)):
+            print(f'{name:>8} {statistics.median(samples):>8.2f} {statistics.mean(samples):>8.2f} {max(samples):>8.2f}')
+    finally:
+        await screening.close_clients()
+        server.close()
+        await server.wait_closed()
+
+
+if __name__ == '__main__':
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200))
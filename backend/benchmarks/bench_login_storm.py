@@ -0,0 +1,93 @@
+"""
+GET /jobs latency during a login storm.
+Run: python -m benchmarks.bench_login_storm [LOGINS]
+
+Registers a throwaway applicant in the database pointed to by DATABASE_URL,
+then drives the app in-process: one client polls GET /jobs back to back while
+LOGINS concurrent POST /auth/login requests run. Each scenario reports the
+/jobs latency percentiles next to an idle baseline:
+  inline - bcrypt runs on the event loop, as the handlers used to do
+  pool   - bcrypt runs on the password hashing thread pool
+"""
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from unittest import mock
+
+from httpx import AsyncClient
+from sqlalchemy import delete, select
+
+from app import auth
+from app.db import SessionLocal, close_redis, engine
+from app.main import app
+from app.models import AuditLog, User
+
+PASSWORD = 'password123'
+
+
+async def _inline(fn, *args):
+    return fn(*args)
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def poll_jobs(client: AsyncClient, token: str, stop: asyncio.Event) -> list[float]:
+    samples = []
+    headers = {'Authorization': f'Bearer {token}'}
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get('/jobs', headers=headers)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+async def scenario(client: AsyncClient, email: str, token: str, logins: int) -> list[float]:
+    stop = asyncio.Event()
+    poller = asyncio.create_task(poll_jobs(client, token, stop))
+    if logins:
+        await asyncio.gather(*(
+            client.post('/auth/login', json={'email': email, 'password': PASSWORD}) for _ in range(logins)
+        ))
+    else:
+        await asyncio.sleep(1)
+    stop.set()
+    return await poller
+
+
+async def main(logins: int) -> None:
+    email = f'bench-{uuid.uuid4()}@example.com'
+    try:
+        async with AsyncClient(app=app, base_url='http://bench') as client:
+            await client.post('/auth/register', json={'email': email, 'password': PASSWORD, 'role': 'applicant'})
+            login = await client.post('/auth/login', json={'email': email, 'password': PASSWORD})
+            token = login.json()['accessToken']
+
+            print(f'{logins} concurrent logins, GET /jobs latency in ms')
+            print(f"{'scenario':>10} {'requests':>9} {'p50':>8} {'p99':>8} {'max':>8}")
+            runs = [('idle', 0, auth._run_hashing), ('inline', logins, _inline), ('pool', logins, auth._run_hashing)]
+            for name, count, runner in runs:
+                with mock.patch.object(auth, '_run_hashing', runner):
+                    samples = await scenario(client, email, token, count)
+                print(
+                    f'{name:>10} {len(samples):>9} {statistics.median(samples):>8.1f} '
+                    f'{percentile(samples, 0.99):>8.1f} {max(samples):>8.1f}'
+                )
+    finally:
+        async with SessionLocal() as session:
+            user_id = (await session.execute(select(User.id).where(User.email == email))).scalar_one_or_none()
+            if user_id is not None:
+                await session.execute(delete(AuditLog).where(AuditLog.actor_id == user_id))
+                await session.execute(delete(User).where(User.id == user_id))
+                await session.commit()
+        auth.shutdown_hashing()
+        await close_redis()
+        await engine.dispose()
+
+
+if __name__ == '__main__':
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 50))
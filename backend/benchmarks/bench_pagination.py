@@ -0,0 +1,99 @@
+"""
+Offset vs. keyset pagination benchmark for GET /jobs.
+Run: python -m benchmarks.bench_pagination [ROWS]
+
+Seeds ROWS synthetic jobs (default 200000) under a throwaway employer in the
+database pointed to by DATABASE_URL, times list_jobs() at increasing depths
+in page mode and cursor mode, then deletes the seeded rows. Only the page
+query is timed; the COUNT(*) that list_jobs() also runs is the same in both
+modes and is excluded so the comparison isolates OFFSET vs. keyset cost.
+"""
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+
+from sqlalchemy import delete, select, text
+
+from app.db import SessionLocal, engine
+from app.models import Job, User, UserRole
+from app.pagination import apply_keyset, encode_cursor
+
+PAGE_SIZE = 20
+DEPTHS = [1, 10, 100, 500, 2000]
+REPEATS = 5
+
+
+async def seed(rows: int) -> User:
+    async with SessionLocal() as session:
+        employer = User(email=f'bench-{uuid.uuid4()}@example.com', password_hash='x', role=UserRole.employer)
+        session.add(employer)
+        await session.flush()
+        await session.execute(
+            text("""
+                INSERT INTO jobs (id, employer_id, title, company, location, description, employment_type, remote, status, created_at)
+                SELECT gen_random_uuid(), :employer_id, 'Job ' || i, 'Bench Co', 'Remote', 'Synthetic job ' || i,
+                       'full_time', true, 'active', now() - (i || ' seconds')::interval
+                FROM generate_series(1, :rows) AS i
+            """),
+            {'employer_id': employer.id, 'rows': rows},
+        )
+        await session.commit()
+        await session.execute(text('ANALYZE jobs'))
+        return employer
+
+
+async def cursor_at(employer: User, page: int) -> str | None:
+    if page == 1:
+        return None
+    async with SessionLocal() as session:
+        row = (await session.execute(
+            select(Job.created_at, Job.id)
+            .where(Job.employer_id == employer.id)
+            .order_by(Job.created_at.desc(), Job.id.desc())
+            .offset((page - 1) * PAGE_SIZE - 1)
+            .limit(1)
+        )).one()
+        return encode_cursor(row.created_at, row.id)
+
+
+async def time_page(employer: User, page: int, cursor: str | None) -> float:
+    samples = []
+    for _ in range(REPEATS):
+        async with SessionLocal() as session:
+            stmt = apply_keyset(
+                select(Job).where(Job.employer_id == employer.id),
+                created_col=Job.created_at,
+                id_col=Job.id,
+                page=page,
+                page_size=PAGE_SIZE,
+                cursor=cursor,
+            )
+            start = time.perf_counter()
+            (await session.execute(stmt)).scalars().all()
+            samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def main(rows: int) -> None:
+    employer = await seed(rows)
+    try:
+        print(f'{rows} jobs, pageSize={PAGE_SIZE}, median of {REPEATS} runs')
+        print(f"{'page':>6} {'offset ms':>10} {'cursor ms':>10}")
+        for page in DEPTHS:
+            if (page - 1) * PAGE_SIZE >= rows:
+                break
+            offset_ms = await time_page(employer, page, None)
+            cursor_ms = await time_page(employer, page, await cursor_at(employer, page))
+            print(f'{page:>6} {offset_ms:>10.2f} {cursor_ms:>10.2f}')
+    finally:
+        async with SessionLocal() as session:
+            await session.execute(delete(Job).where(Job.employer_id == employer.id))
+            await session.execute(delete(User).where(User.id == employer.id))
+            await session.commit()
+        await engine.dispose()
+
+
+if __name__ == '__main__':
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000))
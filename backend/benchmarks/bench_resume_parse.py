@@ -0,0 +1,123 @@
+"""
+PDF resume extraction cost and event-loop stalls for 1, 10 and 50 page resumes.
+Run: python -m benchmarks.bench_resume_parse [ITERATIONS]
+
+Generates text-only PDFs (no database or Redis needed) and, per page count,
+reports the median extraction time and the worst event-loop stall seen by a
+1 ms ticker running alongside it:
+  inline - pypdf extraction of every page on the event loop, as the handler used to do
+  pool   - extract_pdf_text() of every page on the resume parsing process pool
+  capped - the same, limited to RESUME_MAX_PAGES as parse_resume_upload() does
+A repeat upload of the same file is a single Redis GET on the text cache.
+"""
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from app.config import get_settings
+from app.services import resumes
+
+PAGE_COUNTS = [1, 10, 50]
+LINE = 'Senior backend engineer, eight years of Python, PostgreSQL, Redis and AWS.'
+
+
+def make_pdf(pages: int, lines_per_page: int = 40) -> bytes:
+    """A minimal PDF with ``pages`` pages of Helvetica text."""
+    objects = [b'<< /Type /Catalog /Pages 2 0 R >>', b'', b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    kids = []
+    for page in range(pages):
+        body = ['BT /F1 10 Tf 50 770 Td 12 TL']
+        body += [f'({LINE} Page {page + 1}, line {line + 1}.) Tj T*' for line in range(lines_per_page)]
+        body.append('ET')
+        stream = '\n'.join(body).encode()
+        objects.append(b'<< /Length %d >>\nstream\n%s\nendstream' % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+            b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % content_id
+        )
+        kids.append(b'%d 0 R' % len(objects))
+    objects[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (b' '.join(kids), pages)
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n%s\nendobj\n' % (number, obj)
+    xref = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    out += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    out += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+async def _ticker(stop: asyncio.Event) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        worst = max(worst, (time.perf_counter() - start) * 1000 - 1)
+    return worst
+
+
+async def timed(run, iterations: int) -> tuple[float, float]:
+    samples, stalls = [], []
+    for _ in range(iterations):
+        stop = asyncio.Event()
+        ticker = asyncio.create_task(_ticker(stop))
+        await asyncio.sleep(0.005)
+        start = time.perf_counter()
+        await run()
+        samples.append((time.perf_counter() - start) * 1000)
+        stop.set()
+        stalls.append(await ticker)
+    return statistics.median(samples), max(stalls)
+
+
+async def main_async(iterations: int) -> None:
+    settings = get_settings()
+    budget = settings.resume_parse_timeout_seconds
+    loop = asyncio.get_running_loop()
+    executor = resumes._get_executor()
+    # Warm the pool so process start-up isn't counted against the first page count.
+    await asyncio.gather(*(
+        loop.run_in_executor(executor, time.sleep, 0) for _ in range(settings.resume_parse_workers)
+    ))
+
+    print(
+        f"{'pages':>6} {'inline ms':>10} {'stall ms':>9} {'pool ms':>8} {'stall ms':>9} "
+        f"{'capped ms':>10} {'stall ms':>9}"
+    )
+    for pages in PAGE_COUNTS:
+        fd, path = tempfile.mkstemp(suffix='.pdf')
+        with os.fdopen(fd, 'wb') as handle:
+            handle.write(make_pdf(pages))
+        try:
+            async def inline():
+                resumes.extract_pdf_text(path, pages, budget)
+
+            async def pool(max_pages=pages):
+                await loop.run_in_executor(executor, resumes.extract_pdf_text, path, max_pages, budget)
+
+            inline_ms, inline_stall = await timed(inline, iterations)
+            pool_ms, pool_stall = await timed(pool, iterations)
+            capped_ms, capped_stall = await timed(lambda: pool(settings.resume_max_pages), iterations)
+            print(
+                f'{pages:>6} {inline_ms:>10.1f} {inline_stall:>9.1f} {pool_ms:>8.1f} {pool_stall:>9.1f} '
+                f'{capped_ms:>10.1f} {capped_stall:>9.1f}'
+            )
+        finally:
+            os.unlink(path)
+    resumes.shutdown_resume_parser()
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    asyncio.run(main_async(iterations))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Serialization cost per page for GET /jobs.
+Run: python -m benchmarks.bench_serialization [ITERATIONS]
+
+Builds in-memory Job rows (no database needed) and times, per page size:
+  pydantic  - the previous path: JobResponse.model_validate + model_dump per
+              row, PaginatedResponse(...).model_dump, FastAPI's response_model
+              re-validation and stdlib JSON encoding
+  orjson    - serialize_jobs_page(), used on a cache miss
+  cache hit - a cached payload is returned as-is, so there is nothing to time
+"""
+import json
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+from app.models import EmploymentType, Job, JobStatus
+from app.pagination import Page
+from app.schemas import JobResponse, PaginatedResponse
+from app.serialization import serialize_jobs_page
+
+PAGE_SIZES = [10, 50, 100]
+
+
+def make_page(size: int) -> Page:
+    jobs = [
+        Job(
+            id=uuid.uuid4(),
+            employer_id=uuid.uuid4(),
+            title=f'Senior Engineer {i}',
+            company='Acme',
+            location='Remote',
+            description='Build and operate services. ' * 20,
+            employment_type=EmploymentType.full_time,
+            remote=True,
+            status=JobStatus.active,
+            created_at=datetime.now(timezone.utc),
+        )
+        for i in range(size)
+    ]
+    return Page(items=jobs, page=1, page_size=size, total=10_000, has_more=True, next_cursor=None)
+
+
+def pydantic_path(page: Page) -> bytes:
+    items = [JobResponse.model_validate(item).model_dump(by_alias=True, mode='json') for item in page.items]
+    body = PaginatedResponse(
+        items=items,
+        page=page.page,
+        pageSize=page.page_size,
+        total=page.total,
+        hasMore=page.has_more,
+        nextCursor=page.next_cursor,
+    ).model_dump(mode='json')
+    validated = PaginatedResponse.model_validate(body).model_dump(mode='json')
+    return json.dumps(validated).encode()
+
+
+def timed(fn, page: Page, iterations: int) -> float:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn(page)
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    print(f"{'page size':>10} {'pydantic us':>12} {'orjson us':>10} {'speedup':>8} {'bytes':>8}")
+    for size in PAGE_SIZES:
+        page = make_page(size)
+        slow = timed(pydantic_path, page, iterations)
+        fast = timed(serialize_jobs_page, page, iterations)
+        print(f'{size:>10} {slow:>12.1f} {fast:>10.1f} {slow / fast:>7.1f}x {len(serialize_jobs_page(page)):>8}')
+
+
+if __name__ == '__main__':
+    main()
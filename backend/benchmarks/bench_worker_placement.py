@@ -0,0 +1,115 @@
+"""
+GET /jobs latency with the queue worker embedded in the API process vs. separate.
+Run: python -m benchmarks.bench_worker_placement [TASKS]
+
+Registers a throwaway applicant in the database pointed to by DATABASE_URL,
+enqueues TASKS fake tasks (default 200) whose handler burns CPU_MS of CPU
+parsing JSON, like screening responses do, and polls GET /jobs in-process
+while they are consumed:
+  idle      - no worker running
+  embedded  - a ConcurrentWorker on the API's event loop
+  separate  - the same worker in its own process (python -m app.worker)
+"""
+import asyncio
+import json
+import multiprocessing
+import statistics
+import sys
+import time
+import uuid
+
+from httpx import AsyncClient
+from sqlalchemy import delete, select
+
+from app import worker
+from app.db import SessionLocal, close_redis, engine, get_redis
+from app.main import app
+from app.models import AuditLog, User
+from app.queue import QUEUE_KEY, enqueue
+
+TASK_TYPE = 'bench.cpu'
+CPU_MS = 20
+CONCURRENCY = 8
+PASSWORD = 'password123'
+DOCUMENT = json.dumps({'skills': [{'name': f'skill-{i}', 'score': i} for i in range(200)]})
+
+
+async def cpu_handler(_session, _payload) -> None:
+    deadline = time.perf_counter() + CPU_MS / 1000
+    while time.perf_counter() < deadline:
+        json.loads(DOCUMENT)
+
+
+def _separate_worker() -> None:
+    worker.TASK_HANDLERS[TASK_TYPE] = cpu_handler
+    asyncio.run(worker.ConcurrentWorker(concurrency=CONCURRENCY, batch_size=CONCURRENCY).run())
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def poll_jobs(client: AsyncClient, headers: dict, tasks: int) -> list[float]:
+    samples = []
+    for i in range(tasks):
+        await enqueue(TASK_TYPE, {'n': i})
+    started = time.perf_counter()
+    while True:
+        start = time.perf_counter()
+        await client.get('/jobs', headers=headers)
+        samples.append((time.perf_counter() - start) * 1000)
+        if tasks and not await get_redis().llen(QUEUE_KEY):
+            break
+        if not tasks and time.perf_counter() - started > 2:
+            break
+    return samples
+
+
+async def main(tasks: int) -> None:
+    worker.TASK_HANDLERS[TASK_TYPE] = cpu_handler
+    email = f'bench-{uuid.uuid4()}@example.com'
+    try:
+        async with AsyncClient(app=app, base_url='http://bench') as client:
+            await client.post('/auth/register', json={'email': email, 'password': PASSWORD, 'role': 'applicant'})
+            login = await client.post('/auth/login', json={'email': email, 'password': PASSWORD})
+            headers = {'Authorization': f"Bearer {login.json()['accessToken']}"}
+
+            print(f'{tasks} tasks of {CPU_MS} ms CPU, worker concurrency {CONCURRENCY}, GET /jobs latency in ms')
+            print(f"{'scenario':>10} {'requests':>9} {'p50':>8} {'p99':>8} {'max':>8}")
+
+            def report(name: str, samples: list[float]) -> None:
+                print(
+                    f'{name:>10} {len(samples):>9} {statistics.median(samples):>8.1f} '
+                    f'{percentile(samples, 0.99):>8.1f} {max(samples):>8.1f}'
+                )
+
+            report('idle', await poll_jobs(client, headers, 0))
+
+            embedded = worker.ConcurrentWorker(concurrency=CONCURRENCY, batch_size=CONCURRENCY)
+            running = asyncio.create_task(embedded.run())
+            report('embedded', await poll_jobs(client, headers, tasks))
+            embedded.stop()
+            await running
+
+            process = multiprocessing.get_context('spawn').Process(target=_separate_worker)
+            process.start()
+            try:
+                report('separate', await poll_jobs(client, headers, tasks))
+            finally:
+                process.terminate()
+                process.join()
+    finally:
+        async with SessionLocal() as session:
+            user_id = (await session.execute(select(User.id).where(User.email == email))).scalar_one_or_none()
+            if user_id is not None:
+                await session.execute(delete(AuditLog).where(AuditLog.actor_id == user_id))
+                await session.execute(delete(User).where(User.id == user_id))
+                await session.commit()
+        await get_redis().delete(QUEUE_KEY)
+        await close_redis()
+        await engine.dispose()
+
+
+if __name__ == '__main__':
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200))
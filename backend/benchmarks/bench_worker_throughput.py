@@ -0,0 +1,58 @@
+"""
+Worker throughput with a fake slow handler.
+Run: python -m benchmarks.bench_worker_throughput [TASKS]
+
+Enqueues TASKS tasks (default 200) on the Redis queue pointed to by REDIS_URL,
+each handled by a fake handler that sleeps HANDLER_SECONDS like an LLM call
+would, then times how long ConcurrentWorker takes to drain the queue at
+increasing concurrency. Concurrency 1 is the old one-task-at-a-time loop.
+"""
+import asyncio
+import sys
+import time
+
+from app import worker
+from app.db import close_redis, get_redis
+from app.queue import QUEUE_KEY, enqueue
+
+HANDLER_SECONDS = 0.2
+CONCURRENCY = [1, 4, 16, 64]
+TASK_TYPE = 'bench.slow'
+
+
+async def slow_handler(_session, _payload) -> None:
+    await asyncio.sleep(HANDLER_SECONDS)
+
+
+async def drain(tasks: int, concurrency: int) -> float:
+    for i in range(tasks):
+        await enqueue(TASK_TYPE, {'n': i})
+    runner = worker.ConcurrentWorker(concurrency=concurrency, batch_size=concurrency)
+    start = time.perf_counter()
+    running = asyncio.create_task(runner.run())
+    while await get_redis().llen(QUEUE_KEY) or runner.inflight:
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - start
+    runner.stop()
+    await running
+    return elapsed
+
+
+async def main(tasks: int) -> None:
+    worker.TASK_HANDLERS[TASK_TYPE] = slow_handler
+    try:
+        print(f'{tasks} tasks, {HANDLER_SECONDS * 1000:.0f} ms handler')
+        print(f"{'concurrency':>12} {'seconds':>9} {'tasks/s':>9} {'speedup':>8}")
+        baseline = None
+        for concurrency in CONCURRENCY:
+            count = min(tasks, 25) if concurrency == 1 else tasks
+            elapsed = await drain(count, concurrency)
+            rate = count / elapsed
+            baseline = baseline or rate
+            print(f'{concurrency:>12} {elapsed:>9.2f} {rate:>9.1f} {rate / baseline:>7.1f}x')
+    finally:
+        await close_redis()
+
+
+if __name__ == '__main__':
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200))
@@ -0,0 +1,28 @@
+"""add keyset pagination indexes
+
+Revision ID: 0003_keyset_pagination_indexes
+Revises: 0002_ai_screenings
+Create Date: 2026-10-16 00:00:00
+"""
+from alembic import op
+
+revision = '0003_keyset_pagination_indexes'
+down_revision = '0002_ai_screenings'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Listings order by (created_at DESC, id DESC) behind an equality filter;
+    # these indexes let cursor pages start with an index seek.
+    op.create_index('ix_jobs_status_created_at_id', 'jobs', ['status', 'created_at', 'id'])
+    op.create_index('ix_jobs_employer_id_created_at_id', 'jobs', ['employer_id', 'created_at', 'id'])
+    op.create_index('ix_applications_job_id_created_at_id', 'applications', ['job_id', 'created_at', 'id'])
+    op.create_index('ix_applications_applicant_id_created_at_id', 'applications', ['applicant_id', 'created_at', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_applications_applicant_id_created_at_id', table_name='applications')
+    op.drop_index('ix_applications_job_id_created_at_id', table_name='applications')
+    op.drop_index('ix_jobs_employer_id_created_at_id', table_name='jobs')
+    op.drop_index('ix_jobs_status_created_at_id', table_name='jobs')
@@ -0,0 +1,27 @@
+"""add full-text search vector to jobs
+
+Revision ID: 0004_job_search_vector
+Revises: 0003_keyset_pagination_indexes
+Create Date: 2026-10-16 00:00:00
+"""
+from alembic import op
+
+revision = '0004_job_search_vector'
+down_revision = '0003_keyset_pagination_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "ALTER TABLE jobs ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+        ") STORED"
+    )
+    op.create_index('ix_jobs_search_vector', 'jobs', ['search_vector'], postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_jobs_search_vector', table_name='jobs')
+    op.drop_column('jobs', 'search_vector')
@@ -0,0 +1,98 @@
+"""add employer analytics rollup tables
+
+Revision ID: 0005_analytics_rollups
+Revises: 0004_job_search_vector
+Create Date: 2026-10-16 00:00:00
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision = '0005_analytics_rollups'
+down_revision = '0004_job_search_vector'
+branch_labels = None
+depends_on = None
+
+COUNTER_COLUMNS = [
+    'application_count',
+    'status_applied',
+    'status_reviewed',
+    'status_interview',
+    'status_rejected',
+    'status_accepted',
+    'score_count',
+    'score_0_20',
+    'score_21_40',
+    'score_41_60',
+    'score_61_80',
+    'score_81_100',
+]
+
+
+def upgrade() -> None:
+    op.create_table(
+        'job_stats',
+        sa.Column('job_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('jobs.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('employer_id', postgresql.UUID(as_uuid=True), nullable=False),
+        *[sa.Column(name, sa.Integer(), server_default='0', nullable=False) for name in COUNTER_COLUMNS],
+        sa.Column('score_sum', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index('ix_job_stats_employer_id', 'job_stats', ['employer_id'])
+
+    op.create_table(
+        'job_daily_applications',
+        sa.Column('job_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('jobs.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('day', sa.Date(), primary_key=True),
+        sa.Column('employer_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('application_count', sa.Integer(), server_default='0', nullable=False),
+    )
+    op.create_index('ix_job_daily_applications_employer_id_day', 'job_daily_applications', ['employer_id', 'day'])
+
+    # Backfill from the base tables, mirroring reconcile_rollups(), so the
+    # dashboard never reads partial rollups built only from new applications.
+    op.execute(
+        """
+        INSERT INTO job_stats (
+            job_id, employer_id, application_count,
+            status_applied, status_reviewed, status_interview, status_rejected, status_accepted,
+            score_count, score_sum, score_0_20, score_21_40, score_41_60, score_61_80, score_81_100
+        )
+        SELECT
+            j.id,
+            j.employer_id,
+            count(a.id),
+            count(a.id) FILTER (WHERE a.status = 'applied'),
+            count(a.id) FILTER (WHERE a.status = 'reviewed'),
+            count(a.id) FILTER (WHERE a.status = 'interview'),
+            count(a.id) FILTER (WHERE a.status = 'rejected'),
+            count(a.id) FILTER (WHERE a.status = 'accepted'),
+            count(s.score),
+            coalesce(sum(s.score), 0),
+            count(s.score) FILTER (WHERE s.score <= 20),
+            count(s.score) FILTER (WHERE s.score > 20 AND s.score <= 40),
+            count(s.score) FILTER (WHERE s.score > 40 AND s.score <= 60),
+            count(s.score) FILTER (WHERE s.score > 60 AND s.score <= 80),
+            count(s.score) FILTER (WHERE s.score > 80)
+        FROM jobs j
+        LEFT JOIN applications a ON a.job_id = j.id
+        LEFT JOIN ai_screenings s ON s.application_id = a.id
+        GROUP BY j.id
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO job_daily_applications (job_id, day, employer_id, application_count)
+        SELECT a.job_id, CAST(a.created_at AS date), j.employer_id, count(*)
+        FROM applications a
+        JOIN jobs j ON j.id = a.job_id
+        GROUP BY a.job_id, CAST(a.created_at AS date), j.employer_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_job_daily_applications_employer_id_day', table_name='job_daily_applications')
+    op.drop_table('job_daily_applications')
+    op.drop_index('ix_job_stats_employer_id', table_name='job_stats')
+    op.drop_table('job_stats')
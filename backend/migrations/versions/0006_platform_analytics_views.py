@@ -0,0 +1,27 @@
+"""add materialized views for admin platform analytics
+
+Revision ID: 0006_platform_analytics_views
+Revises: 0005_analytics_rollups
+Create Date: 2026-10-16 00:00:00
+"""
+from alembic import op
+
+from app.platform_views import PLATFORM_VIEWS
+
+revision = '0006_platform_analytics_views'
+down_revision = '0005_analytics_rollups'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    for view, (query, _) in PLATFORM_VIEWS.items():
+        op.execute(f'CREATE MATERIALIZED VIEW {view} AS {query}')
+    # REFRESH MATERIALIZED VIEW CONCURRENTLY requires a unique index on each view.
+    for view, (_, key) in PLATFORM_VIEWS.items():
+        op.create_index(f'ux_{view}_{key}', view, [key], unique=True)
+
+
+def downgrade() -> None:
+    for view in reversed(PLATFORM_VIEWS):
+        op.execute(f'DROP MATERIALIZED VIEW IF EXISTS {view}')
@@ -0,0 +1,54 @@
+"""add composite and partial indexes for the hot query shapes
+
+Revision ID: 0007_query_shape_indexes
+Revises: 0006_platform_analytics_views
+Create Date: 2026-10-16 00:00:00
+"""
+from alembic import op
+
+revision = '0007_query_shape_indexes'
+down_revision = '0006_platform_analytics_views'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Employer pipeline filtered by status, newest first.
+    op.create_index(
+        'ix_applications_job_id_status_created_at_id', 'applications', ['job_id', 'status', 'created_at', 'id'],
+    )
+    # Application detail timeline.
+    op.create_index('ix_status_history_application_id_changed_at', 'status_history', ['application_id', 'changed_at'])
+    # Admin audit log, unfiltered and filtered by actor, newest first.
+    op.create_index('ix_audit_logs_created_at_id', 'audit_logs', ['created_at', 'id'])
+    op.create_index('ix_audit_logs_actor_id_created_at_id', 'audit_logs', ['actor_id', 'created_at', 'id'])
+    # Rescreen backlog: a small slice of ai_screenings, read oldest first.
+    op.create_index(
+        'ix_ai_screenings_unfinished_created_at',
+        'ai_screenings',
+        ['created_at'],
+        postgresql_where="status IN ('pending', 'failed')",
+        postgresql_include=['application_id'],
+    )
+
+    # Leading-column prefixes of the composite indexes above or of 0003's; they
+    # only add write cost.
+    op.drop_index('ix_applications_job_id', table_name='applications')
+    op.drop_index('ix_applications_applicant_id', table_name='applications')
+    op.drop_index('ix_status_history_application_id', table_name='status_history')
+    op.drop_index('ix_audit_logs_actor_id', table_name='audit_logs')
+    op.drop_index('ix_jobs_employer_id', table_name='jobs')
+
+
+def downgrade() -> None:
+    op.create_index('ix_jobs_employer_id', 'jobs', ['employer_id'])
+    op.create_index('ix_audit_logs_actor_id', 'audit_logs', ['actor_id'])
+    op.create_index('ix_status_history_application_id', 'status_history', ['application_id'])
+    op.create_index('ix_applications_applicant_id', 'applications', ['applicant_id'])
+    op.create_index('ix_applications_job_id', 'applications', ['job_id'])
+
+    op.drop_index('ix_ai_screenings_unfinished_created_at', table_name='ai_screenings')
+    op.drop_index('ix_audit_logs_actor_id_created_at_id', table_name='audit_logs')
+    op.drop_index('ix_audit_logs_created_at_id', table_name='audit_logs')
+    op.drop_index('ix_status_history_application_id_changed_at', table_name='status_history')
+    op.drop_index('ix_applications_job_id_status_created_at_id', table_name='applications')
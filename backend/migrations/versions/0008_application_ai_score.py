@@ -0,0 +1,39 @@
+"""denormalize the screening score onto applications for ranked listings
+
+Revision ID: 0008_application_ai_score
+Revises: 0007_query_shape_indexes
+Create Date: 2026-10-16 00:00:00
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = '0008_application_ai_score'
+down_revision = '0007_query_shape_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('applications', sa.Column('ai_score', sa.Integer(), nullable=True))
+    op.execute(
+        """
+        UPDATE applications a
+        SET ai_score = s.score
+        FROM ai_screenings s
+        WHERE s.application_id = a.id AND s.score IS NOT NULL
+        """
+    )
+    # Candidates by score within a job; unscored rows rank last as -1.
+    op.create_index(
+        'ix_applications_job_id_score_rank_id',
+        'applications',
+        ['job_id', sa.text('coalesce(ai_score, -1)'), 'id'],
+    )
+    # Only served the join-then-sort ranking this replaces.
+    op.drop_index('ix_ai_screenings_score', table_name='ai_screenings')
+
+
+def downgrade() -> None:
+    op.create_index('ix_ai_screenings_score', 'ai_screenings', ['score'])
+    op.drop_index('ix_applications_job_id_score_rank_id', table_name='applications')
+    op.drop_column('applications', 'ai_score')
@@ -1,16 +1,21 @@
 import logging
 
-from fastapi import APIRouter, Depends
-from sqlalchemy import func, select
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
+from app.cache import PLATFORM_ANALYTICS_SCOPE, get_generation, get_or_compute
+from app.config import get_settings
 from app.db import get_redis, get_session
 from app.deps import require_roles
-from app.metrics import snapshot
+from app.metrics import merge, published_snapshots, snapshot
 from app.models import AuditLog, UserRole
-from app.queue import dlq_size, queue_depth
+from app.pagination import TotalMode, apply_keyset, count_total, split_page
+from app.queue import dlq_size, inflight_count, queue_depth, scheduled_count
 from app.schemas import HealthComponent, HealthResponse, PaginatedResponse, AuditLogResponse
+from app.serialization import dumps
+from app.services.platform_analytics import get_platform_analytics
 from app.utils import paginate
 
 logger = logging.getLogger(__name__)
@@ -77,6 +82,8 @@ async def list_audit_logs(
     action: str | None = None,
     page: int | None = None,
     pageSize: int | None = None,
+    cursor: str | None = None,
+    total_mode: TotalMode = Query(default=TotalMode.exact, alias='totalMode'),
     session: AsyncSession = Depends(get_session),
     _user=Depends(require_roles(UserRole.admin)),
 ):
@@ -87,25 +94,78 @@ async def list_audit_logs(
     if action:
         stmt = stmt.where(AuditLog.action.ilike(f'%{action}%'))
 
-    total_stmt = select(func.count()).select_from(stmt.subquery())
-    total = (await session.execute(total_stmt)).scalar_one()
+    total = await count_total(session, stmt, total_mode)
 
-    items = (await session.execute(
-        stmt.order_by(AuditLog.created_at.desc()).offset((page - 1) * page_size).limit(page_size)
-    )).scalars().all()
+    try:
+        page_stmt = apply_keyset(
+            stmt,
+            created_col=AuditLog.created_at,
+            id_col=AuditLog.id,
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Invalid cursor') from exc
+    rows = (await session.execute(page_stmt)).scalars().all()
+    items, has_more, next_cursor = split_page(rows, page_size, lambda log: (log.created_at, log.id))
 
     response_items = [AuditLogResponse.model_validate(item).model_dump(by_alias=True) for item in items]
-    return PaginatedResponse(items=response_items, page=page, pageSize=page_size, total=total)
+    return PaginatedResponse(
+        items=response_items,
+        page=page,
+        pageSize=page_size,
+        total=total,
+        hasMore=has_more,
+        nextCursor=next_cursor,
+    )
 
 
 @router.get('/metrics')
 async def metrics_endpoint(_user=Depends(require_roles(UserRole.admin))):
+    """This process's metrics merged with those queue consumers publish to Redis.
+
+    Screenings run in worker processes, so their dispatcher gauges and
+    counters only show up here through the published snapshots.
+    """
     data = snapshot()
+    try:
+        others = await published_snapshots(get_redis())
+        data = merge(data, others)
+        data['worker_processes_reporting'] = len(others)
+    except Exception:
+        logger.warning('Failed to fetch worker metrics', exc_info=True)
+        data['worker_processes_reporting'] = 0
     try:
         data['queue_depth'] = await queue_depth()
         data['dlq_size'] = await dlq_size()
+        data['queue_inflight'] = await inflight_count()
+        data['retry_scheduled'] = await scheduled_count()
     except Exception:
         logger.warning('Failed to fetch queue metrics', exc_info=True)
         data['queue_depth'] = 0
         data['dlq_size'] = 0
+        data['queue_inflight'] = 0
+        data['retry_scheduled'] = 0
     return data
+
+
+@router.get('/analytics')
+async def platform_analytics(
+    days: int = Query(default=30, ge=1, le=365),
+    _user=Depends(require_roles(UserRole.admin)),
+):
+    """Applications per day, screening score trends and the hiring funnel across all employers.
+
+    Served from materialized views the worker refreshes; responses stay cached
+    until the next refresh bumps the generation.
+    """
+    generation = await get_generation(PLATFORM_ANALYTICS_SCOPE)
+    cache_key = f'platform:analytics:g{generation}:{days}'
+
+    async def compute(db: AsyncSession) -> bytes:
+        return dumps(await get_platform_analytics(db, days))
+
+    ttl = max(int(get_settings().platform_analytics_refresh_seconds), 60)
+    payload = await get_or_compute(cache_key, compute, ttl=ttl)
+    return Response(content=payload, media_type='application/json')
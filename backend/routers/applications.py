@@ -1,17 +1,18 @@
 import logging
 
-import io
-from fastapi import APIRouter, Depends, Header, HTTPException, UploadFile, File, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, UploadFile, File, status
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
 from app.config import get_settings
 from app.db import get_session
 from app.deps import get_current_user, require_roles
-from app.models import AIScreening, Application, Job, ScreeningStatus, User, UserRole, StatusHistory
+from app.models import SCREENING_UNFINISHED, AIScreening, Application, Job, ScreeningStatus, User, UserRole, StatusHistory
 from app.metrics import increment
-from app.queue import enqueue
+from app.pagination import TotalMode
+from app.queue import enqueue, queue_depth, release_screenings, reserve_screenings
 from app.schemas import (
     AIScreeningResult,
     AIScreeningSkillsMatch,
@@ -28,6 +29,7 @@ from app.services.applications import (
     list_applications,
     update_application_status,
 )
+from app.services.resumes import parse_resume_upload
 from app.services.screening import get_screening_for_application
 
 logger = logging.getLogger(__name__)
@@ -35,6 +37,14 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix='/applications', tags=['applications'])
 
 
+async def _release_quietly(application_ids: list[str]) -> None:
+    """Drop queued-screening markers for tasks that never made it onto the queue."""
+    try:
+        await release_screenings(application_ids)
+    except Exception:
+        logger.warning('Failed to release screening reservations for %s', application_ids, exc_info=True)
+
+
 @router.post('', response_model=ApplicationResponse, response_model_exclude_none=True, status_code=status.HTTP_201_CREATED)
 async def create_application(
     payload: ApplicationCreate,
@@ -61,6 +71,18 @@ async def create_application(
             raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail='Application already exists') from exc
         raise
 
+    settings = get_settings()
+    screening_enabled = settings.ai_screening_enabled and bool(settings.ai_api_key)
+    created_screening = False
+    if screening_enabled:
+        # An idempotent retry returns the existing application, which already has its screening row.
+        created_screening = (await session.execute(
+            pg_insert(AIScreening)
+            .values(application_id=application.id, status=ScreeningStatus.pending)
+            .on_conflict_do_nothing(index_elements=[AIScreening.application_id])
+            .returning(AIScreening.id)
+        )).scalar_one_or_none() is not None
+
     await session.commit()
     increment('application_submissions', 1)
     try:
@@ -68,28 +90,17 @@ async def create_application(
     except Exception:
         logger.warning('Failed to enqueue application.submitted event for application %s', application.id, exc_info=True)
 
-    # Run AI screening inline (fire-and-forget background task)
-    settings = get_settings()
-    if settings.ai_screening_enabled and settings.ai_api_key:
-        import asyncio
-        from app.services.screening import run_screening
-
-        async def _run_screening_bg(app_id):
-            from app.db import SessionLocal
-            try:
-                async with SessionLocal() as bg_session:
-                    # Create screening record
-                    screening = AIScreening(application_id=app_id, status=ScreeningStatus.pending)
-                    bg_session.add(screening)
-                    await bg_session.commit()
-                    # Run the actual screening
-                    await run_screening(bg_session, app_id)
-                    await bg_session.commit()
-                    logger.info('AI screening completed for application %s', app_id)
-            except Exception:
-                logger.warning('AI screening failed for application %s', app_id, exc_info=True)
-
-        asyncio.create_task(_run_screening_bg(application.id))
+    if created_screening:
+        # Screening runs on the worker; if enqueueing fails the pending row is picked up by rescreen-pending.
+        reserved = []
+        try:
+            reserved = await reserve_screenings([str(application.id)])
+            if reserved:
+                await enqueue('application.screen_resume', {'applicationId': str(application.id)})
+        except Exception:
+            logger.warning('Failed to enqueue screening for application %s', application.id, exc_info=True)
+            if reserved:
+                await _release_quietly(reserved)
 
     return ApplicationResponse(
         id=application.id,
@@ -106,15 +117,25 @@ async def create_application(
 async def list_my_applications(
     page: int | None = None,
     pageSize: int | None = None,
+    cursor: str | None = None,
+    total_mode: TotalMode = Query(default=TotalMode.exact, alias='totalMode'),
     session: AsyncSession = Depends(get_session),
     user: User = Depends(require_roles(UserRole.applicant)),
 ):
-    items, page, page_size, total = await list_applications(
-        session,
-        user=user,
-        page=page,
-        page_size=pageSize,
-    )
+    try:
+        result = await list_applications(
+            session,
+            user=user,
+            page=page,
+            page_size=pageSize,
+            cursor=cursor,
+            total_mode=total_mode,
+        )
+    except ValueError as exc:
+        if str(exc) == 'invalid_cursor':
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Invalid cursor') from exc
+        raise
+    items = result.items
     # Fetch job titles for all applications
     job_ids = list({item.job_id for item in items})
     jobs_map = {}
@@ -135,7 +156,21 @@ async def list_my_applications(
         data['jobTitle'] = job.title if job else None
         data['jobCompany'] = job.company if job else None
         response_items.append(data)
-    return PaginatedResponse(items=response_items, page=page, pageSize=page_size, total=total)
+    return PaginatedResponse(
+        items=response_items,
+        page=result.page,
+        pageSize=result.page_size,
+        total=result.total,
+        hasMore=result.has_more,
+        nextCursor=result.next_cursor,
+    )
+
+
+def _size_label(size: int) -> str:
+    for unit, scale in (('MB', 1024 * 1024), ('KB', 1024)):
+        if size >= scale:
+            return f'{size / scale:.3g}{unit}'
+    return f'{size} bytes'
 
 
 @router.post('/parse-resume')
@@ -147,21 +182,14 @@ async def parse_resume(
     if not file.filename or not file.filename.lower().endswith('.pdf'):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Only PDF files are accepted')
 
-    contents = await file.read()
-    if len(contents) > 5 * 1024 * 1024:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='File must be under 5MB')
-
     try:
-        from pypdf import PdfReader
-        reader = PdfReader(io.BytesIO(contents))
-        text_parts = []
-        for page in reader.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text_parts.append(page_text)
-        text = '\n'.join(text_parts).strip()
-    except Exception as exc:
-        logger.warning('PDF parse failed: %s', exc)
+        text = await parse_resume_upload(file.file)
+    except ValueError as exc:
+        if str(exc) == 'file_too_large':
+            limit = _size_label(get_settings().resume_max_bytes)
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f'File must be under {limit}') from exc
+        if str(exc) == 'parse_timeout':
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail='PDF took too long to process') from exc
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail='Could not extract text from PDF') from exc
 
     if not text:
@@ -316,30 +344,54 @@ async def rescreen_pending_applications(
     session: AsyncSession = Depends(get_session),
     user: User = Depends(require_roles(UserRole.admin, UserRole.employer)),
 ):
-    """Trigger AI screening for all pending applications. Temporary admin utility."""
-    import asyncio
-    from app.services.screening import run_screening
-    from app.db import SessionLocal
+    """Queue AI screening for pending applications at low priority. Temporary admin utility.
 
+    Fresh submissions are screened first; this only adds work while the queue
+    backlog is under SCREENING_MAX_BACKLOG and skips applications already queued.
+    """
     settings = get_settings()
     if not settings.ai_screening_enabled or not settings.ai_api_key:
         raise HTTPException(status_code=400, detail='AI screening not configured')
 
-    stmt = select(AIScreening).where(AIScreening.status.in_([ScreeningStatus.pending, ScreeningStatus.failed]))
-    pending = (await session.execute(stmt)).scalars().all()
-
-    async def _screen(app_id):
+    stmt = (
+        select(AIScreening.application_id, Application.job_id)
+        .join(Application, Application.id == AIScreening.application_id)
+        .where(SCREENING_UNFINISHED)
+        .order_by(AIScreening.created_at)
+    )
+    pending = (await session.execute(stmt)).all()
+
+    capacity = max(settings.screening_max_backlog - await queue_depth(), 0)
+    candidates = [(str(app_id), str(job_id)) for app_id, job_id in pending]
+    reserved = set(await reserve_screenings([app_id for app_id, _ in candidates[:capacity]]))
+    to_queue = [(app_id, job_id) for app_id, job_id in candidates if app_id in reserved]
+
+    batch_size = settings.ai_screening_batch_size
+    tasks: list[tuple[str, dict, list[str]]] = []
+    if batch_size > 1:
+        by_job: dict[str, list[str]] = {}
+        for app_id, job_id in to_queue:
+            by_job.setdefault(job_id, []).append(app_id)
+        for job_id, app_ids in by_job.items():
+            for start in range(0, len(app_ids), batch_size):
+                chunk = app_ids[start:start + batch_size]
+                tasks.append(('application.screen_batch', {'jobId': job_id, 'applicationIds': chunk}, chunk))
+    else:
+        tasks = [('application.screen_resume', {'applicationId': app_id}, [app_id]) for app_id, _ in to_queue]
+
+    queued = 0
+    for index, (task_type, task_payload, app_ids) in enumerate(tasks):
         try:
-            async with SessionLocal() as bg_session:
-                await run_screening(bg_session, app_id)
-                await bg_session.commit()
-                logger.info('Re-screening completed for %s', app_id)
+            await enqueue(task_type, task_payload, priority='low')
         except Exception:
-            logger.warning('Re-screening failed for %s', app_id, exc_info=True)
-
-    count = 0
-    for screening in pending:
-        asyncio.create_task(_screen(screening.application_id))
-        count += 1
-
-    return {'message': f'Triggered re-screening for {count} applications'}
+            logger.warning('Failed to enqueue re-screening; releasing the remaining reservations', exc_info=True)
+            # Unqueued applications must stay eligible for the next rescreen.
+            await _release_quietly([app_id for _, _, remaining in tasks[index:] for app_id in remaining])
+            break
+        queued += len(app_ids)
+
+    return {
+        'message': f'Queued re-screening for {queued} applications',
+        'queued': queued,
+        'skipped': len(pending) - queued,
+    }
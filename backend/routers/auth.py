@@ -2,11 +2,11 @@ from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth import create_access_token, hash_password, verify_password
+from app.auth import create_access_token, hash_password_async, verify_password_async
 from app.db import get_session
 from app.models import User, UserRole
 from app.schemas import LoginRequest, RegisterRequest, TokenResponse, UserResponse
-from app.deps import get_current_user
+from app.deps import get_verified_user
 from app.services.audit import create_audit_log
 
 router = APIRouter(prefix='/auth', tags=['auth'])
@@ -25,7 +25,7 @@ async def register(payload: RegisterRequest, request: Request, session: AsyncSes
 
     user = User(
         email=payload.email,
-        password_hash=hash_password(payload.password),
+        password_hash=await hash_password_async(payload.password),
         role=payload.role,
     )
     session.add(user)
@@ -47,7 +47,7 @@ async def register(payload: RegisterRequest, request: Request, session: AsyncSes
 async def login(payload: LoginRequest, request: Request, session: AsyncSession = Depends(get_session)):
     result = await session.execute(select(User).where(User.email == payload.email))
     user = result.scalar_one_or_none()
-    if not user or not verify_password(payload.password, user.password_hash):
+    if not user or not await verify_password_async(payload.password, user.password_hash):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Invalid credentials')
 
     token = create_access_token(user_id=user.id, email=user.email, role=user.role.value)
@@ -65,5 +65,5 @@ async def login(payload: LoginRequest, request: Request, session: AsyncSession =
 
 
 @router.get('/me', response_model=UserResponse)
-async def me(current_user: User = Depends(get_current_user)):
+async def me(current_user: User = Depends(get_verified_user)):
     return UserResponse.model_validate(current_user)
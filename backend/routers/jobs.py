@@ -1,12 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
-from app.cache import get_cached, invalidate_jobs_cache, set_cached
+from app.cache import get_generation, get_or_compute, invalidate_jobs_cache, invalidate_screening_results, jobs_cache_scope
 from app.db import get_session
 from app.deps import get_current_user, require_roles
-from app.models import User, UserRole
+from app.models import JobStatus, User, UserRole
+from app.pagination import TotalMode
 from app.schemas import JobCreate, JobResponse, JobUpdate, PaginatedResponse
+from app.serialization import serialize_job, serialize_jobs_page
 from app.services.jobs import create_job, get_job, list_jobs, update_job
 
 router = APIRouter(prefix='/jobs', tags=['jobs'])
@@ -19,47 +21,54 @@ async def list_jobs_endpoint(
     company: str | None = None,
     page: int | None = None,
     pageSize: int | None = None,
-    session: AsyncSession = Depends(get_session),
+    cursor: str | None = None,
+    total_mode: TotalMode = Query(default=TotalMode.exact, alias='totalMode'),
     user: User = Depends(get_current_user),
 ):
     user_key = str(user.id) if user.role == UserRole.employer else 'global'
-    cache_key = f"jobs:list:{user.role.value}:{user_key}:{query or ''}:{location or ''}:{company or ''}:{page or 1}:{pageSize or 10}"
-    cached = await get_cached(cache_key)
-    if cached is not None:
-        return cached
+    generation = await get_generation(jobs_cache_scope(user.role.value, user_key))
+    cache_key = f"jobs:list:{user.role.value}:{user_key}:g{generation}:{query or ''}:{location or ''}:{company or ''}:{page or 1}:{pageSize or 10}:{cursor or ''}:{total_mode.value}"
 
-    items, page, page_size, total = await list_jobs(
-        session,
-        user=user,
-        query=query,
-        location=location,
-        company=company,
-        page=page,
-        page_size=pageSize,
-    )
-    response_items = [JobResponse.model_validate(item).model_dump(by_alias=True) for item in items]
-    response = PaginatedResponse(items=response_items, page=page, pageSize=page_size, total=total).model_dump()
-    await set_cached(cache_key, response)
-    return response
+    async def compute(db: AsyncSession) -> bytes:
+        result = await list_jobs(
+            db,
+            user=user,
+            query=query,
+            location=location,
+            company=company,
+            page=page,
+            page_size=pageSize,
+            cursor=cursor,
+            total_mode=total_mode,
+        )
+        return serialize_jobs_page(result)
+
+    try:
+        payload = await get_or_compute(cache_key, compute)
+    except ValueError as exc:
+        if str(exc) == 'invalid_cursor':
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Invalid cursor') from exc
+        raise
+    return Response(content=payload, media_type='application/json')
 
 
 @router.get('/{job_id}', response_model=JobResponse)
 async def get_job_endpoint(
     job_id: UUID,
-    session: AsyncSession = Depends(get_session),
     user: User = Depends(get_current_user),
 ):
     user_key = str(user.id) if user.role == UserRole.employer else 'global'
-    cache_key = f"jobs:detail:{user.role.value}:{user_key}:{job_id}"
-    cached = await get_cached(cache_key)
-    if cached is not None:
-        return cached
-    job = await get_job(session, job_id=job_id, user=user)
-    if not job:
+    generation = await get_generation(jobs_cache_scope(user.role.value, user_key))
+    cache_key = f"jobs:detail:{user.role.value}:{user_key}:g{generation}:{job_id}"
+
+    async def compute(db: AsyncSession) -> bytes | None:
+        job = await get_job(db, job_id=job_id, user=user)
+        return serialize_job(job) if job else None
+
+    payload = await get_or_compute(cache_key, compute)
+    if payload is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Job not found')
-    response = JobResponse.model_validate(job).model_dump(by_alias=True)
-    await set_cached(cache_key, response)
-    return response
+    return Response(content=payload, media_type='application/json')
 
 
 @router.post('', response_model=JobResponse, status_code=status.HTTP_201_CREATED)
@@ -82,7 +91,7 @@ async def create_job_endpoint(
         },
     )
     await session.commit()
-    await invalidate_jobs_cache()
+    await invalidate_jobs_cache(job.employer_id, public=job.status == JobStatus.active)
     return JobResponse.model_validate(job)
 
 
@@ -99,6 +108,8 @@ async def update_job_endpoint(
     if user.role == UserRole.employer and job.employer_id != user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail='Forbidden')
 
+    was_public = job.status == JobStatus.active
+    scored_fields = (job.title, job.company, job.description)
     updated = await update_job(
         session,
         job=job,
@@ -114,5 +125,7 @@ async def update_job_endpoint(
         },
     )
     await session.commit()
-    await invalidate_jobs_cache()
+    await invalidate_jobs_cache(updated.employer_id, public=was_public or updated.status == JobStatus.active)
+    if (updated.title, updated.company, updated.description) != scored_fields:
+        await invalidate_screening_results(updated.id)
     return JobResponse.model_validate(updated)
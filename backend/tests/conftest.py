@@ -7,6 +7,8 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_asyn
 from app.db import Base
 from app.main import app
 from app.db import get_session, get_redis
+from app.cache import local_cache
+from benchmarks.bench_resume_parse import make_pdf as build_pdf
 
 
 @pytest.fixture(scope='session')
@@ -50,6 +52,7 @@ async def override_session(session):
 async def flush_redis():
     redis_client = get_redis()
     await redis_client.flushdb()
+    local_cache.clear()
     yield
 
 
@@ -57,3 +60,8 @@ async def flush_redis():
 async def client():
     async with AsyncClient(app=app, base_url='http://test') as client:
         yield client
+
+
+@pytest.fixture()
+def make_pdf():
+    return build_pdf
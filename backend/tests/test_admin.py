@@ -47,3 +47,92 @@ async def test_admin_audit_logs_filter(client, session):
     logs = await client.get('/admin/audit-logs?action=auth.register', headers={'Authorization': f'Bearer {token}'})
     assert logs.status_code == 200
     assert logs.json()['total'] >= 1
+
+
+@pytest.mark.asyncio
+async def test_db_pool_metrics_and_pgbouncer_options():
+    from sqlalchemy import text
+
+    from app import metrics
+    from app.config import get_settings
+    from app.db import SessionLocal, engine_options
+
+    before = metrics.snapshot()['db_pool_checkouts']
+    async with SessionLocal() as db:
+        await db.execute(text('SELECT 1'))
+        assert metrics.snapshot()['db_pool_checked_out'] >= 1
+    data = metrics.snapshot()
+    assert data['db_pool_checkouts'] == before + 1
+    assert isinstance(data['db_pool_wait_us'], int)
+    assert data['db_pool_size'] == get_settings().db_pool_size
+
+    settings = get_settings().model_copy(update={'db_pgbouncer_mode': True})
+    connect_args = engine_options(settings)['connect_args']
+    assert connect_args['statement_cache_size'] == 0
+    assert connect_args['prepared_statement_cache_size'] == 0
+
+
+@pytest.mark.asyncio
+async def test_platform_analytics_cached_until_views_refresh(client, session):
+    from datetime import date
+
+    from app.services.platform_analytics import refresh_platform_views
+
+    await create_admin(session, 'admin-analytics@example.com')
+    login = await client.post('/auth/login', json={"email": 'admin-analytics@example.com', "password": "password123"})
+    headers = {'Authorization': f"Bearer {login.json()['accessToken']}"}
+
+    def applied_today(payload):
+        today = date.today().isoformat()
+        return sum(row['applications'] for row in payload['applicationsPerDay'] if row['date'] == today)
+
+    await refresh_platform_views(session)
+    before = (await client.get('/admin/analytics', headers=headers)).json()
+    assert [stage['stage'] for stage in before['funnel']] == ['applied', 'reviewed', 'interview', 'accepted']
+
+    await client.post('/auth/register', json={"email": 'mv-employer@example.com', "password": "password123", "role": "employer"})
+    employer_login = await client.post('/auth/login', json={"email": 'mv-employer@example.com', "password": "password123"})
+    job = await client.post('/jobs', json={
+        "title": "MV Role", "company": "Acme", "location": "Remote", "description": "Views",
+        "employmentType": "full_time", "remote": True, "status": "active",
+    }, headers={'Authorization': f"Bearer {employer_login.json()['accessToken']}"})
+    await client.post('/auth/register', json={"email": 'mv-applicant@example.com', "password": "password123", "role": "applicant"})
+    applicant_login = await client.post('/auth/login', json={"email": 'mv-applicant@example.com', "password": "password123"})
+    await client.post('/applications', json={"jobId": job.json()['id'], "resumeText": "Resume", "coverLetter": "Cover"},
+                      headers={'Authorization': f"Bearer {applicant_login.json()['accessToken']}", 'Idempotency-Key': 'mv-1'})
+
+    cached = (await client.get('/admin/analytics', headers=headers)).json()
+    assert cached == before
+
+    await refresh_platform_views(session)
+    after = (await client.get('/admin/analytics', headers=headers)).json()
+    assert applied_today(after) == applied_today(before) + 1
+
+
+@pytest.mark.asyncio
+async def test_admin_metrics_merge_worker_snapshots(client, session):
+    from app import metrics
+    from app.db import get_redis
+
+    email = 'admin-metrics@example.com'
+    await create_admin(session, email)
+    login = await client.post('/auth/login', json={"email": email, "password": "password123"})
+    token = login.json()['accessToken']
+
+    # What a worker process elsewhere would have published.
+    redis_client = get_redis()
+    await redis_client.hset(f'{metrics.PROCESS_SNAPSHOT_KEY_PREFIX}worker-host:4242', mapping={
+        'screening_llm_calls': 7,
+        'screening_inflight': 2,
+        'screening_concurrency_limit': 3,
+        'screening_rpm_available': 12.5,
+    })
+    local = metrics.snapshot()
+
+    resp = await client.get('/admin/metrics', headers={'Authorization': f'Bearer {token}'})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data['worker_processes_reporting'] == 1
+    assert data['screening_llm_calls'] == local['screening_llm_calls'] + 7
+    assert data['screening_inflight'] == local.get('screening_inflight', 0) + 2
+    assert data['screening_rpm_available'] <= 12.5
@@ -40,6 +40,44 @@ async def test_application_idempotency(client):
     assert apply_repeat.json()['id'] == apply_resp.json()['id']
 
 
+@pytest.mark.asyncio
+async def test_application_idempotent_retry_with_screening_enabled(client, monkeypatch):
+    import json
+
+    from app.config import get_settings
+    from app.db import get_redis
+    from app.queue import QUEUE_KEY
+
+    monkeypatch.setattr(get_settings(), 'ai_screening_enabled', True)
+    monkeypatch.setattr(get_settings(), 'ai_provider', 'openai')
+    monkeypatch.setattr(get_settings(), 'openai_api_key', 'sk-test')
+
+    employer_token = await register_and_login(client, 'employer_idem_screen@example.com', 'employer')
+    job_resp = await client.post('/jobs', json={
+        "title": "Screened Role",
+        "company": "Acme",
+        "location": "Remote",
+        "description": "Screened",
+        "employmentType": "full_time",
+        "remote": True,
+        "status": "active",
+    }, headers={'Authorization': f'Bearer {employer_token}'})
+    job_id = job_resp.json()['id']
+
+    applicant_token = await register_and_login(client, 'applicant_idem_screen@example.com', 'applicant')
+    headers = {'Authorization': f'Bearer {applicant_token}', 'Idempotency-Key': 'screen-retry'}
+    body = {"jobId": job_id, "resumeText": "Resume", "coverLetter": "Cover"}
+    first = await client.post('/applications', json=body, headers=headers)
+    repeat = await client.post('/applications', json=body, headers=headers)
+    assert first.status_code == repeat.status_code == 201
+    assert repeat.json()['id'] == first.json()['id']
+
+    tasks = [json.loads(raw) for raw in await get_redis().lrange(QUEUE_KEY, 0, -1)]
+    assert [task['payload'] for task in tasks if task['type'] == 'application.screen_resume'] == [
+        {'applicationId': first.json()['id']}
+    ]
+
+
 @pytest.mark.asyncio
 async def test_application_duplicate_conflict(client):
     employer_token = await register_and_login(client, 'employer4@example.com', 'employer')
@@ -70,3 +108,29 @@ async def test_application_duplicate_conflict(client):
         "coverLetter": "Cover",
     }, headers={**headers, 'Idempotency-Key': 'key2'})
     assert second.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_parse_resume_limits_pages_and_caches_text(client, monkeypatch, make_pdf):
+    from app import metrics
+    from app.config import get_settings
+
+    monkeypatch.setattr(get_settings(), 'resume_max_pages', 2)
+    token = await register_and_login(client, 'resume-applicant@example.com', 'applicant')
+    headers = {'Authorization': f'Bearer {token}'}
+    pdf = make_pdf(5, lines_per_page=2)
+
+    first = await client.post('/applications/parse-resume', files={'file': ('cv.pdf', pdf, 'application/pdf')}, headers=headers)
+    assert first.status_code == 200
+    assert 'Page 2, line 2.' in first.json()['text']
+    assert 'Page 3' not in first.json()['text']
+
+    hits = metrics.snapshot()['resume_text_cache_hits']
+    again = await client.post('/applications/parse-resume', files={'file': ('cv.pdf', pdf, 'application/pdf')}, headers=headers)
+    assert again.json() == first.json()
+    assert metrics.snapshot()['resume_text_cache_hits'] == hits + 1
+
+    monkeypatch.setattr(get_settings(), 'resume_max_bytes', len(pdf) - 1)
+    too_big = await client.post('/applications/parse-resume', files={'file': ('cv.pdf', pdf, 'application/pdf')}, headers=headers)
+    assert too_big.status_code == 400
+    assert too_big.json()['detail'] == f'File must be under {(len(pdf) - 1) / 1024:.3g}KB'
@@ -17,3 +17,78 @@ async def test_register_login_me(client):
     me = await client.get('/auth/me', headers={'Authorization': f'Bearer {token}'})
     assert me.status_code == 200
     assert me.json()['email'] == payload['email']
+
+
+@pytest.mark.asyncio
+async def test_principal_cached_and_invalidated_on_role_change(client, session):
+    from sqlalchemy import select
+
+    from app.cache import get_principal, invalidate_principal
+    from app.models import User, UserRole
+
+    payload = {"email": "user2@example.com", "password": "password123", "role": "applicant"}
+    await client.post('/auth/register', json=payload)
+    login = await client.post('/auth/login', json={"email": payload['email'], "password": payload['password']})
+    token = login.json()['accessToken']
+    user_id = login.json()['user']['id']
+    headers = {'Authorization': f'Bearer {token}'}
+
+    assert await get_principal(user_id) is None
+    await client.get('/auth/me', headers=headers)
+    assert (await get_principal(user_id))['role'] == 'applicant'
+
+    user = (await session.execute(select(User).where(User.email == payload['email']))).scalar_one()
+    user.role = UserRole.admin
+    await session.commit()
+    await invalidate_principal(user.id)
+
+    me = await client.get('/auth/me', headers=headers)
+    assert me.json()['role'] == 'admin'
+
+
+@pytest.mark.asyncio
+async def test_trust_token_role_still_honours_revocation(client, monkeypatch):
+    import uuid
+
+    from app.auth import create_access_token
+    from app.config import get_settings
+
+    monkeypatch.setattr(get_settings(), 'auth_trust_token_role', True)
+    ghost = create_access_token(user_id=uuid.uuid4(), email='ghost@example.com', role='applicant')
+    me = await client.get('/auth/me', headers={'Authorization': f'Bearer {ghost}'})
+    assert me.status_code == 401
+
+    # A token still claiming admin for a user who is (no longer) one doesn't open admin endpoints.
+    await client.post('/auth/register', json={"email": "demoted@example.com", "password": "password123", "role": "applicant"})
+    login = await client.post('/auth/login', json={"email": "demoted@example.com", "password": "password123"})
+    user_id = uuid.UUID(login.json()['user']['id'])
+    stale_admin = create_access_token(user_id=user_id, email='demoted@example.com', role='admin')
+    metrics = await client.get('/admin/metrics', headers={'Authorization': f'Bearer {stale_admin}'})
+    assert metrics.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_password_hashing_runs_off_event_loop():
+    import threading
+
+    from app import auth, metrics
+
+    loop_thread = threading.get_ident()
+    seen = []
+
+    def record(password):
+        seen.append(threading.get_ident())
+        return auth.hash_password(password)
+
+    hashed = await auth._run_hashing(record, 'password123')
+    assert seen and seen[0] != loop_thread
+    assert await auth.verify_password_async('password123', hashed)
+    assert not await auth.verify_password_async('wrong-password', hashed)
+    snapshot = metrics.snapshot()
+    assert snapshot['password_hash_queued'] == 0
+    assert snapshot['password_hash_running'] == 0
+
+    # A later lifespan in the same process gets a fresh pool after shutdown.
+    auth.shutdown_hashing()
+    assert await auth.verify_password_async('password123', hashed)
+    auth.shutdown_hashing()
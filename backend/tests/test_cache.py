@@ -35,7 +35,7 @@ async def test_jobs_list_cache_hit(client, session):
     list_resp = await client.get('/jobs', headers=headers)
     assert list_resp.status_code == 200
 
-    cache_key = f"jobs:list:employer:{user_id}::::1:10"
+    cache_key = f"jobs:list:employer:{user_id}:g1::::1:10::exact"
     cached = await redis_client.get(cache_key)
     assert cached is not None
 
@@ -50,7 +50,7 @@ async def test_jobs_list_cache_hit(client, session):
 @pytest.mark.asyncio
 async def test_jobs_cache_invalidation_on_update(client):
     redis_client = get_redis()
-    token, _user_id = await register_and_login(client, 'cache-employer2@example.com', 'employer')
+    token, user_id = await register_and_login(client, 'cache-employer2@example.com', 'employer')
     headers = {'Authorization': f'Bearer {token}'}
 
     job_resp = await client.post(
@@ -69,8 +69,9 @@ async def test_jobs_cache_invalidation_on_update(client):
     job_id = job_resp.json()['id']
 
     await client.get('/jobs', headers=headers)
-    keys = [key async for key in redis_client.scan_iter(match='jobs:*')]
+    keys = [key async for key in redis_client.scan_iter(match='jobs:list:*')]
     assert len(keys) > 0
+    generation = int(await redis_client.get(f'jobs:gen:employer:{user_id}'))
 
     await client.patch(
         f'/jobs/{job_id}',
@@ -78,5 +79,147 @@ async def test_jobs_cache_invalidation_on_update(client):
         headers=headers,
     )
 
-    keys_after = [key async for key in redis_client.scan_iter(match='jobs:*')]
-    assert len(keys_after) == 0
+    # Invalidation is a generation bump; old entries are orphaned, not deleted.
+    assert int(await redis_client.get(f'jobs:gen:employer:{user_id}')) == generation + 1
+    refreshed = await client.get('/jobs', headers=headers)
+    assert refreshed.json()['items'][0]['title'] == 'Updated'
+
+
+@pytest.mark.asyncio
+async def test_archived_job_edit_keeps_applicant_scope():
+    from app.cache import get_generation, invalidate_jobs_cache
+
+    global_before = await get_generation('global')
+    employer_before = await get_generation('employer:abc')
+
+    await invalidate_jobs_cache('abc', public=False)
+
+    assert await get_generation('global') == global_before
+    assert await get_generation('employer:abc') == employer_before + 1
+
+
+@pytest.mark.asyncio
+async def test_local_cache_lru_eviction_and_ttl():
+    from app import metrics
+    from app.cache import LocalCache
+
+    cache = LocalCache(max_entries=2, ttl_seconds=60)
+    before = metrics.snapshot()['cache_l1_evictions']
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1  # 'a' becomes most recently used
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert metrics.snapshot()['cache_l1_evictions'] == before + 1
+
+    expiring = LocalCache(max_entries=2, ttl_seconds=0)
+    expiring.set('a', 1)
+    assert expiring.get('a') is None
+
+
+@pytest.mark.asyncio
+async def test_local_cache_invalidated_via_pubsub():
+    import asyncio
+    from app.cache import INVALIDATION_CHANNEL, listen_for_invalidations, local_cache
+
+    listener = asyncio.create_task(listen_for_invalidations())
+    try:
+        local_cache.set('jobs:list:applicant:global:x', {'items': []})
+        redis_client = get_redis()
+        for _ in range(50):
+            if await redis_client.publish(INVALIDATION_CHANNEL, 'jobs:'):
+                break
+            await asyncio.sleep(0.02)
+        for _ in range(50):
+            if local_cache.get('jobs:list:applicant:global:x') is None:
+                break
+            await asyncio.sleep(0.02)
+        assert local_cache.get('jobs:list:applicant:global:x') is None
+    finally:
+        listener.cancel()
+
+
+@pytest.mark.asyncio
+async def test_get_or_compute_coalesces_concurrent_misses(session):
+    import asyncio
+    import json
+    from app.cache import get_or_compute
+
+    calls = 0
+
+    async def compute(db):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return json.dumps({'value': calls}).encode()
+
+    results = await asyncio.gather(*(get_or_compute('coalesce:key', compute) for _ in range(10)))
+    assert calls == 1
+    assert all(json.loads(result) == {'value': 1} for result in results)
+    assert await get_redis().get('lock:coalesce:key') is None
+
+
+@pytest.mark.asyncio
+async def test_get_or_compute_serves_stale_while_refreshing(session):
+    import asyncio
+    import json
+    from app.cache import STALE_TTL_SECONDS, get_or_compute, local_cache
+
+    redis_client = get_redis()
+    await redis_client.set('stale:key', json.dumps({'value': 'old'}), ex=STALE_TTL_SECONDS - 1)
+
+    async def compute(db):
+        return json.dumps({'value': 'new'}).encode()
+
+    assert json.loads(await get_or_compute('stale:key', compute)) == {'value': 'old'}
+    for _ in range(50):
+        if json.loads(await redis_client.get('stale:key')) == {'value': 'new'}:
+            break
+        await asyncio.sleep(0.02)
+    assert json.loads(await redis_client.get('stale:key')) == {'value': 'new'}
+    assert json.loads(local_cache.get('stale:key')) == {'value': 'new'}
+
+
+@pytest.mark.asyncio
+async def test_get_or_compute_uses_its_own_session_and_stops_waiting_on_empty_fill(session):
+    import asyncio
+    import time
+    from app.cache import FILL_LOCK_TTL_SECONDS, get_or_compute
+
+    redis_client = get_redis()
+    # Another process holds the fill lock and finds nothing to cache.
+    await redis_client.set('lock:missing:key', 'other', ex=FILL_LOCK_TTL_SECONDS)
+    sessions = []
+
+    async def compute(db):
+        sessions.append(db)
+        return None
+
+    async def release():
+        await asyncio.sleep(0.1)
+        await redis_client.delete('lock:missing:key')
+
+    start = time.monotonic()
+    releaser = asyncio.create_task(release())
+    assert await get_or_compute('missing:key', compute) is None
+    await releaser
+    assert time.monotonic() - start < FILL_LOCK_TTL_SECONDS / 2
+    assert len(sessions) == 1 and sessions[0] is not session
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_not_promoted_to_local_cache_as_fresh():
+    import json
+    from app.cache import FILL_LOCK_TTL_SECONDS, STALE_TTL_SECONDS, get_or_compute, local_cache
+
+    redis_client = get_redis()
+    await redis_client.set('stale:locked', json.dumps({'value': 'old'}), ex=STALE_TTL_SECONDS - 1)
+    # Another process is already refreshing, so ours loses the lock and waits.
+    await redis_client.set('lock:stale:locked', 'other', ex=FILL_LOCK_TTL_SECONDS)
+
+    async def compute(db):
+        return json.dumps({'value': 'new'}).encode()
+
+    assert json.loads(await get_or_compute('stale:locked', compute)) == {'value': 'old'}
+    assert local_cache.get('stale:locked') is None
@@ -67,3 +67,143 @@ async def test_applicant_lists_active_jobs_only(client):
     data = list_resp.json()
     assert data['total'] == 1
     assert data['items'][0]['title'] == 'Active Role'
+
+
+@pytest.mark.asyncio
+async def test_jobs_cursor_pagination(client):
+    employer_token = await register_and_login(client, 'employer-cursor@example.com', 'employer')
+    headers = {'Authorization': f'Bearer {employer_token}'}
+
+    for title in ('First', 'Second', 'Third'):
+        await client.post('/jobs', json={
+            "title": title,
+            "company": "Acme",
+            "location": "Remote",
+            "description": "Paged",
+            "employmentType": "full_time",
+            "remote": True,
+            "status": "active",
+        }, headers=headers)
+
+    first = (await client.get('/jobs?pageSize=2', headers=headers)).json()
+    assert [item['title'] for item in first['items']] == ['Third', 'Second']
+    assert first['hasMore'] is True
+    assert first['nextCursor']
+
+    second = (await client.get(f"/jobs?pageSize=2&cursor={first['nextCursor']}", headers=headers)).json()
+    assert [item['title'] for item in second['items']] == ['First']
+    assert second['hasMore'] is False
+    assert second['nextCursor'] is None
+
+    invalid = await client.get('/jobs?cursor=not-a-cursor', headers=headers)
+    assert invalid.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_jobs_total_modes(client):
+    employer_token = await register_and_login(client, 'employer-totals@example.com', 'employer')
+    headers = {'Authorization': f'Bearer {employer_token}'}
+
+    for title in ('One', 'Two'):
+        await client.post('/jobs', json={
+            "title": title,
+            "company": "Acme",
+            "location": "Remote",
+            "description": "Counted",
+            "employmentType": "full_time",
+            "remote": True,
+            "status": "active",
+        }, headers=headers)
+
+    skipped = (await client.get('/jobs?pageSize=1&totalMode=none', headers=headers)).json()
+    assert skipped['total'] is None
+    assert skipped['hasMore'] is True
+
+    cached = (await client.get('/jobs?totalMode=cached', headers=headers)).json()
+    assert cached['total'] == 2
+
+    estimated = (await client.get('/jobs?totalMode=estimated', headers=headers)).json()
+    assert isinstance(estimated['total'], int)
+
+    # Filter values travel as bound parameters, quotes and all.
+    params = {'totalMode': 'estimated', 'location': "O'Brien'; --"}
+    quoted = await client.get('/jobs', params=params, headers=headers)
+    assert quoted.status_code == 200
+    assert isinstance(quoted.json()['total'], int)
+
+    # Cached counts are keyed by parameter values, not just the SQL shape.
+    filtered = (await client.get('/jobs', params={'totalMode': 'cached', 'company': 'Nobody'}, headers=headers)).json()
+    assert filtered['total'] == 0
+
+    invalid = await client.get('/jobs?totalMode=bogus', headers=headers)
+    assert invalid.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_jobs_search_ranks_title_matches_first(client):
+    employer_token = await register_and_login(client, 'employer-search@example.com', 'employer')
+    headers = {'Authorization': f'Bearer {employer_token}'}
+
+    for title, description in (
+        ('Platform Engineer', 'Own the deployment pipeline'),
+        ('Backend Developer', 'Work closely with the platform team'),
+        ('Designer', 'Draw things'),
+    ):
+        await client.post('/jobs', json={
+            "title": title,
+            "company": "Acme",
+            "location": "Remote",
+            "description": description,
+            "employmentType": "full_time",
+            "remote": True,
+            "status": "active",
+        }, headers=headers)
+
+    resp = await client.get('/jobs?query=platf', headers=headers)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data['total'] == 2
+    assert [item['title'] for item in data['items']] == ['Platform Engineer', 'Backend Developer']
+    assert data['nextCursor'] is None
+
+    # Ranked pages hand out cursors that continue in relevance order.
+    first = (await client.get('/jobs?query=platf&pageSize=1', headers=headers)).json()
+    assert first['hasMore'] is True and first['nextCursor']
+    second = (await client.get(f"/jobs?query=platf&pageSize=1&cursor={first['nextCursor']}", headers=headers)).json()
+    assert [item['title'] for item in first['items'] + second['items']] == ['Platform Engineer', 'Backend Developer']
+    assert second['hasMore'] is False and second['nextCursor'] is None
+
+    # Only stopwords: no tsquery terms left, so the substring match applies.
+    stopwords = (await client.get('/jobs?query=the', headers=headers)).json()
+    assert sorted(item['title'] for item in stopwords['items']) == ['Backend Developer', 'Platform Engineer']
+
+
+@pytest.mark.asyncio
+async def test_job_payloads_match_response_schema(client):
+    token = await register_and_login(client, 'serialize-employer@example.com', 'employer')
+    headers = {'Authorization': f'Bearer {token}'}
+    created = await client.post(
+        '/jobs',
+        json={
+            "title": "Serializer Role",
+            "company": "Acme",
+            "location": "Remote",
+            "description": "Checks the raw JSON path",
+            "employmentType": "contract",
+            "remote": False,
+            "status": "active",
+        },
+        headers=headers,
+    )
+    assert created.status_code == 201
+    expected = created.json()
+
+    detail = await client.get(f"/jobs/{expected['id']}", headers=headers)
+    assert detail.status_code == 200
+    assert detail.headers['content-type'] == 'application/json'
+    assert detail.json() == expected
+
+    listing = await client.get('/jobs', headers=headers, params={'totalMode': 'none'})
+    body = listing.json()
+    assert body['items'] == [expected]
+    assert set(body) == {'items', 'page', 'pageSize', 'total', 'hasMore', 'nextCursor'}
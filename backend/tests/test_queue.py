@@ -75,3 +75,232 @@ async def test_worker_retry_and_dlq(client, monkeypatch):
     dlq_items = await redis_client.lrange(DLQ_KEY, 0, -1)
     assert len(dlq_items) == 1
     assert await redis_client.llen(QUEUE_KEY) == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_worker_respects_limits_and_drains(monkeypatch):
+    import asyncio
+
+    running = {'total': 0, 'slow': 0}
+    peak = {'total': 0, 'slow': 0}
+    done = []
+
+    def handler(kind):
+        async def _handle(_session, payload):
+            running['total'] += 1
+            running[kind] = running.get(kind, 0) + 1
+            peak['total'] = max(peak['total'], running['total'])
+            peak[kind] = max(peak.get(kind, 0), running[kind])
+            await asyncio.sleep(0.05)
+            running['total'] -= 1
+            running[kind] -= 1
+            done.append(payload['n'])
+        return _handle
+
+    monkeypatch.setitem(worker.TASK_HANDLERS, 'test.slow', handler('slow'))
+    monkeypatch.setitem(worker.TASK_HANDLERS, 'test.fast', handler('fast'))
+    redis_client = get_redis()
+    for n in range(12):
+        task_type = 'test.slow' if n % 2 else 'test.fast'
+        await redis_client.rpush(QUEUE_KEY, json.dumps({'id': str(n), 'type': task_type, 'payload': {'n': n}, 'attempts': 0}))
+
+    runner = worker.ConcurrentWorker(concurrency=4, batch_size=4, type_limits={'test.slow': 1})
+    consumer = asyncio.create_task(runner.run())
+    while await redis_client.llen(QUEUE_KEY):
+        await asyncio.sleep(0.01)
+    runner.stop()
+    await consumer
+
+    assert sorted(done) == list(range(12))
+    assert peak['total'] <= 4
+    assert peak['slow'] == 1
+    assert peak['total'] > 1
+
+
+@pytest.mark.asyncio
+async def test_drain_timeout_requeues_unclaimed_tasks(monkeypatch):
+    import asyncio
+
+    from app.queue import LOW_PRIORITY_QUEUE_KEY, enqueue
+
+    started = asyncio.Event()
+
+    async def hang(_session, _payload):
+        started.set()
+        await asyncio.sleep(60)
+
+    monkeypatch.setitem(worker.TASK_HANDLERS, 'test.hang', hang)
+    task = await enqueue('test.hang', {'n': 1}, priority='low')
+
+    # A free slot keeps the loop polling the queue, so it notices stop() promptly.
+    runner = worker.ConcurrentWorker(concurrency=2, batch_size=1)
+    consumer = asyncio.create_task(runner.run(shutdown_timeout=0.05))
+    await started.wait()
+    runner.stop()
+    await consumer
+
+    redis_client = get_redis()
+    requeued = [json.loads(raw) for raw in await redis_client.lrange(LOW_PRIORITY_QUEUE_KEY, 0, -1)]
+    assert [item['id'] for item in requeued] == [task['id']]
+
+
+def test_parse_type_limits():
+    assert worker.parse_type_limits('') == {}
+    assert worker.parse_type_limits('application.screen_resume=2, application.submitted=8') == {
+        'application.screen_resume': 2,
+        'application.submitted': 8,
+    }
+
+
+@pytest.mark.asyncio
+async def test_reliable_queue_recovers_tasks_from_crashed_consumer():
+    import time
+
+    from app.queue import CLAIMS_KEY, PROCESSING_KEY_PREFIX, ack, claim_batch, enqueue, reap_expired_claims
+
+    redis_client = get_redis()
+    await enqueue('application.submitted', {'applicationId': 'crash-1'})
+    await enqueue('application.submitted', {'applicationId': 'crash-2'})
+
+    # A consumer claims both tasks, acks one and then "crashes".
+    claims = await claim_batch('crashed-worker', 2, timeout=1)
+    assert [claim.task['payload']['applicationId'] for claim in claims] == ['crash-1', 'crash-2']
+    assert await redis_client.llen(QUEUE_KEY) == 0
+    assert await redis_client.zcard(CLAIMS_KEY) == 2
+    await ack(claims[0])
+    assert await redis_client.llen(f'{PROCESSING_KEY_PREFIX}crashed-worker') == 1
+
+    # Nothing is returned while the claim is still inside its visibility timeout.
+    assert await reap_expired_claims() == 0
+
+    assert await reap_expired_claims(now=time.time() + 10_000) == 1
+    queued = [json.loads(raw) for raw in await redis_client.lrange(QUEUE_KEY, 0, -1)]
+    assert [task['payload']['applicationId'] for task in queued] == ['crash-2']
+    assert await redis_client.llen(f'{PROCESSING_KEY_PREFIX}crashed-worker') == 0
+    assert await redis_client.zcard(CLAIMS_KEY) == 0
+
+
+@pytest.mark.asyncio
+async def test_claim_batch_waits_for_work_without_taking_it_unclaimed():
+    import asyncio
+
+    from app.queue import CLAIMS_KEY, PROCESSING_KEY_PREFIX, claim_batch, enqueue
+
+    async def enqueue_later():
+        await asyncio.sleep(0.1)
+        await enqueue('application.submitted', {'applicationId': 'late'})
+
+    producer = asyncio.create_task(enqueue_later())
+    claims = await claim_batch('waiting-worker', 1, timeout=2)
+    await producer
+
+    assert [claim.task['payload']['applicationId'] for claim in claims] == ['late']
+    redis_client = get_redis()
+    assert await redis_client.zscore(CLAIMS_KEY, claims[0].member) is not None
+    assert await redis_client.llen(f'{PROCESSING_KEY_PREFIX}waiting-worker') == 1
+    assert await claim_batch('waiting-worker', 1, timeout=0) == []
+
+
+@pytest.mark.asyncio
+async def test_reliable_worker_acks_handled_tasks(monkeypatch):
+    import asyncio
+
+    from app.queue import CLAIMS_KEY
+
+    handled = []
+
+    async def record(_session, payload):
+        handled.append(payload['n'])
+
+    monkeypatch.setitem(worker.TASK_HANDLERS, 'test.reliable', record)
+    redis_client = get_redis()
+    for n in range(3):
+        await redis_client.rpush(QUEUE_KEY, json.dumps({'id': str(n), 'type': 'test.reliable', 'payload': {'n': n}, 'attempts': 0}))
+
+    runner = worker.ConcurrentWorker(concurrency=2, batch_size=2, reliable=True, consumer='test-consumer')
+    consumer = asyncio.create_task(runner.run())
+    while len(handled) < 3:
+        await asyncio.sleep(0.01)
+    runner.stop()
+    await consumer
+
+    assert sorted(handled) == [0, 1, 2]
+    assert await redis_client.zcard(CLAIMS_KEY) == 0
+    assert await redis_client.llen('queue:processing:test-consumer') == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_task_waits_in_delay_queue_until_due(monkeypatch):
+    import time
+
+    from app.queue import DELAYED_KEY, promote_due_tasks, scheduled_count
+
+    async def failing_handler(_session, _payload):
+        raise RuntimeError('boom')
+
+    monkeypatch.setitem(worker.TASK_HANDLERS, 'application.submitted', failing_handler)
+    monkeypatch.setattr(worker, 'BACKOFF_SECONDS', [30])
+    redis_client = get_redis()
+
+    task = {'id': 'delayed-1', 'type': 'application.submitted', 'payload': {}, 'attempts': 0}
+    assert await worker.handle_task(task) is False
+    assert await scheduled_count() == 1
+    assert await redis_client.llen(QUEUE_KEY) == 0
+
+    assert await promote_due_tasks() == 0
+    assert await promote_due_tasks(now=time.time() + 60) == 1
+    assert await redis_client.zcard(DELAYED_KEY) == 0
+    promoted = json.loads(await redis_client.lpop(QUEUE_KEY))
+    assert promoted['attempts'] == 1
+    assert promoted['history'] == [
+        {'attempt': 1, 'error': 'boom', 'failedAt': promoted['history'][0]['failedAt']},
+    ]
+
+
+def test_retry_delay_applies_jitter(monkeypatch):
+    from app.config import get_settings
+
+    monkeypatch.setattr(worker, 'BACKOFF_SECONDS', [10, 20])
+    monkeypatch.setattr(get_settings(), 'worker_retry_jitter', 0.5)
+    delays = [worker.retry_delay(5) for _ in range(50)]
+    assert all(10 <= delay <= 30 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_worker_cli_process_count():
+    assert worker.parse_args(['--processes', '3']).processes == 3
+    assert worker.parse_args([]).processes >= 1
+
+
+@pytest.mark.asyncio
+async def test_low_priority_lane_drains_after_normal_lane():
+    import time
+
+    from app.queue import LOW_PRIORITY_QUEUE_KEY, claim_batch, dequeue_batch, enqueue, promote_due_tasks, queue_depth, schedule_retry
+
+    await enqueue('application.screen_resume', {'applicationId': 'rescreen-1'}, priority='low')
+    await enqueue('application.submitted', {'applicationId': 'fresh-1'})
+    await enqueue('application.submitted', {'applicationId': 'fresh-2'})
+    assert await queue_depth() == 3
+
+    tasks = await dequeue_batch(2, timeout=1)
+    assert [task['payload']['applicationId'] for task in tasks] == ['fresh-1', 'fresh-2']
+    claims = await claim_batch('lane-consumer', 2, timeout=1)
+    assert [claim.task['payload']['applicationId'] for claim in claims] == ['rescreen-1']
+
+    # Retries go back to the lane they came from.
+    await schedule_retry(claims[0].task, 5)
+    assert await promote_due_tasks(now=time.time() + 10) == 1
+    redis_client = get_redis()
+    assert await redis_client.llen(QUEUE_KEY) == 0
+    assert await redis_client.llen(LOW_PRIORITY_QUEUE_KEY) == 1
+
+
+@pytest.mark.asyncio
+async def test_screenings_are_deduplicated_until_picked_up():
+    from app.queue import release_screenings, reserve_screenings
+
+    assert await reserve_screenings(['app-1', 'app-2']) == ['app-1', 'app-2']
+    assert await reserve_screenings(['app-2', 'app-3']) == ['app-3']
+    await release_screenings(['app-2'])
+    assert await reserve_screenings(['app-1', 'app-2']) == ['app-2']
@@ -1,9 +1,9 @@
 import pytest
 from unittest.mock import AsyncMock, patch
 
-from app.queue import enqueue, dequeue, push_dlq, queue_depth, dlq_size, requeue, QUEUE_KEY, DLQ_KEY
+from app.queue import enqueue, dequeue, push_dlq, queue_depth, dlq_size, requeue, QUEUE_KEY, DLQ_KEY, DELAYED_KEY
 from app.worker import process_once, MAX_RETRIES
-from app.cache import get_cached, set_cached, invalidate_jobs_cache
+from app.cache import get_generation, get_or_compute, invalidate_jobs_cache
 
 
 async def register_and_login(client, email, role):
@@ -120,13 +120,16 @@ async def test_worker_retries_on_failure():
     redis = get_redis()
     await redis.rpush(QUEUE_KEY, json.dumps(task))
     
-    # First attempt should fail and requeue
+    # First attempt should fail and schedule a delayed retry
     result = await process_once()
     assert result is False
     
-    # Task should be back in queue with incremented attempts
-    depth = await queue_depth()
-    assert depth >= 1
+    # Task should wait in the delayed queue with incremented attempts
+    scheduled = await redis.zrange(DELAYED_KEY, 0, -1)
+    assert len(scheduled) == 1
+    retried = json.loads(scheduled[0])
+    assert retried['attempts'] == 1
+    assert retried['history'][0]['attempt'] == 1
 
 
 @pytest.mark.asyncio
@@ -154,18 +157,22 @@ async def test_worker_pushes_to_dlq_after_max_retries():
 
 @pytest.mark.asyncio
 async def test_cache_set_and_get():
-    """Test setting and getting cached values"""
-    await set_cached('test:key', {'foo': 'bar'})
-    
-    result = await get_cached('test:key')
-    assert result == {'foo': 'bar'}
+    """Test that a computed payload is cached and served without recomputing"""
+    compute = AsyncMock(return_value=b'{"foo":"bar"}')
+
+    assert await get_or_compute('test:key', compute) == b'{"foo":"bar"}'
+    assert await get_or_compute('test:key', compute) == b'{"foo":"bar"}'
+    assert compute.await_count == 1
 
 
 @pytest.mark.asyncio
 async def test_cache_returns_none_for_missing():
-    """Test that cache returns None for missing keys"""
-    result = await get_cached('nonexistent:key')
-    assert result is None
+    """Test that a None result is returned but not cached"""
+    compute = AsyncMock(return_value=None)
+
+    assert await get_or_compute('nonexistent:key', compute) is None
+    assert await get_or_compute('nonexistent:key', compute) is None
+    assert compute.await_count == 2
 
 
 @pytest.mark.asyncio
@@ -265,14 +272,18 @@ async def test_cache_invalidation_on_job_update(client):
 @pytest.mark.asyncio
 async def test_invalidate_jobs_cache():
     """Test the invalidate_jobs_cache function directly"""
-    # Set some job cache entries
-    await set_cached('jobs:list:employer:123:query', {'items': []})
-    await set_cached('jobs:detail:employer:123:456', {'id': '456'})
-    
-    # Invalidate all job caches
-    await invalidate_jobs_cache()
-    
-    # Both should be gone
-    assert await get_cached('jobs:list:employer:123:query') is None
-    assert await get_cached('jobs:detail:employer:123:456') is None
-
+    # Set some job cache entries under the current generation
+    compute = AsyncMock(return_value=b'{"items":[]}')
+    generation = await get_generation('employer:123')
+    await get_or_compute(f'jobs:list:employer:123:g{generation}:query', compute)
+    await get_or_compute(f'jobs:detail:employer:123:g{generation}:456', compute)
+    assert compute.await_count == 2
+
+    # Invalidate the employer's job caches
+    await invalidate_jobs_cache('123')
+
+    # Keys built from the new generation miss and are computed again
+    generation = await get_generation('employer:123')
+    await get_or_compute(f'jobs:list:employer:123:g{generation}:query', compute)
+    await get_or_compute(f'jobs:detail:employer:123:g{generation}:456', compute)
+    assert compute.await_count == 4
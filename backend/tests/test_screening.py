@@ -0,0 +1,182 @@
+import json
+
+import pytest
+from sqlalchemy import select
+
+from app.auth import hash_password
+from app.models import AIScreening, Application, EmploymentType, Job, ScreeningStatus, User, UserRole
+from app.services import screening
+
+RESULT = {
+    'score': 80,
+    'recommendation': 'good_match',
+    'skills_match': {'matched': ['python'], 'missing': [], 'bonus': []},
+    'experience_assessment': 'Relevant experience.',
+    'strengths': ['APIs'],
+    'concerns': [],
+}
+
+
+async def create_job_with_applications(session, count):
+    employer = User(email='batch-employer@example.com', password_hash=hash_password('password123'), role=UserRole.employer)
+    session.add(employer)
+    await session.flush()
+    job = Job(
+        employer_id=employer.id,
+        title='Batch Role',
+        company='Acme',
+        location='Remote',
+        description='Python services',
+        employment_type=EmploymentType.full_time,
+    )
+    session.add(job)
+    await session.flush()
+    applications = []
+    for i in range(count):
+        applicant = User(email=f'batch-applicant-{i}@example.com', password_hash='x', role=UserRole.applicant)
+        session.add(applicant)
+        await session.flush()
+        application = Application(job_id=job.id, applicant_id=applicant.id, resume_text=f'Resume {i}')
+        session.add(application)
+        applications.append(application)
+    await session.commit()
+    return job, applications
+
+
+@pytest.mark.asyncio
+async def test_batch_screening_splits_results_and_falls_back(session, monkeypatch):
+    job, applications = await create_job_with_applications(session, 3)
+    prompts = []
+
+    async def fake_llm(_system_prompt, user_prompt, max_tokens=1024):
+        prompts.append(user_prompt)
+        if 'Candidate C1 Resume:' in user_prompt:
+            # The batch answer covers C1 and C2 only; C3 must be re-screened on its own.
+            return json.dumps({'results': [
+                {'candidate_id': 'C1', **RESULT, 'score': 91},
+                {'candidate_id': 'C2', **RESULT, 'score': 55},
+            ]})
+        return '```json\n' + json.dumps(RESULT) + '\n```'
+
+    monkeypatch.setattr(screening, '_call_llm', fake_llm)
+    completed = await screening.run_batch_screening(session, job.id, [app.id for app in applications])
+    await session.commit()
+
+    assert len(completed) == 3
+    assert len(prompts) == 2
+    assert prompts[0].count('Job Description:') == 1
+    rows = (await session.execute(select(AIScreening))).scalars().all()
+    scores = {row.application_id: row.score for row in rows}
+    assert scores == {applications[0].id: 91, applications[1].id: 55, applications[2].id: 80}
+    assert all(row.status == ScreeningStatus.completed for row in rows)
+
+
+def test_parse_batch_result_skips_unknown_and_malformed_entries():
+    raw = json.dumps({'results': [
+        {'candidate_id': 'C1', **RESULT},
+        {'candidate_id': 'C9', **RESULT},
+        {'candidate_id': 'C2', **RESULT, 'score': 'high'},
+        'garbage',
+    ]})
+    parsed = screening._parse_batch_result(raw, {'C1', 'C2'})
+    assert set(parsed) == {'C1'}
+    assert screening._parse_batch_result('not json', {'C1'}) == {}
+
+
+@pytest.mark.asyncio
+async def test_provider_clients_are_reused_and_closed():
+    first = screening.get_client('openai', 'key-1')
+    assert screening.get_client('openai', 'key-1') is first
+    assert screening.get_client('openai', 'key-2') is not first
+
+    await screening.close_clients()
+    assert screening._clients == {}
+    assert screening.get_client('openai', 'key-1') is not first
+    await screening.close_clients()
+
+
+@pytest.mark.asyncio
+async def test_screening_cache_reuses_identical_pairs_and_invalidates_on_job_edit(session, monkeypatch):
+    from app import metrics
+    from app.cache import invalidate_screening_results
+
+    job, applications = await create_job_with_applications(session, 2)
+    applications[1].resume_text = '  Resume   0 '  # same content as applications[0] after normalization
+    await session.commit()
+    calls = []
+
+    async def fake_llm(_system_prompt, user_prompt, max_tokens=1024):
+        calls.append(user_prompt)
+        return json.dumps(RESULT)
+
+    monkeypatch.setattr(screening, '_call_llm', fake_llm)
+    hits = metrics.snapshot()['screening_cache_hits']
+
+    await screening.run_screening(session, applications[0].id)
+    await screening.run_screening(session, applications[1].id)
+    assert len(calls) == 1
+    assert metrics.snapshot()['screening_cache_hits'] == hits + 1
+
+    await invalidate_screening_results(job.id)
+    await screening.run_screening(session, applications[1].id)
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_halves_concurrency_on_rate_limit_and_recovers():
+    from app.services.dispatch import ScreeningDispatcher
+
+    class RateLimited(Exception):
+        status_code = 429
+
+    dispatcher = ScreeningDispatcher(
+        requests_per_minute=0,
+        tokens_per_minute=0,
+        initial_concurrency=8,
+        min_concurrency=1,
+        max_concurrency=8,
+    )
+    with pytest.raises(RateLimited):
+        async with dispatcher.slot(100):
+            raise RateLimited()
+    assert dispatcher.snapshot()['screening_concurrency_limit'] == 4
+
+    with pytest.raises(ValueError):
+        async with dispatcher.slot(100):
+            raise ValueError('not an overload')
+    assert dispatcher.snapshot()['screening_concurrency_limit'] == 4
+
+    for _ in range(8):
+        async with dispatcher.slot(100):
+            pass
+    assert dispatcher.snapshot()['screening_concurrency_limit'] == 5
+    assert dispatcher.snapshot()['screening_inflight'] == 0
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_paces_requests():
+    import time
+
+    from app.services.dispatch import TokenBucket
+
+    bucket = TokenBucket(rate_per_minute=600)  # 10 per second, 600 burst
+    bucket.available = 0
+    start = time.monotonic()
+    await bucket.acquire(2)
+    assert time.monotonic() - start >= 0.15
+
+
+@pytest.mark.asyncio
+async def test_shared_token_bucket_budget_spans_processes():
+    import time
+
+    from app.services.dispatch import SharedTokenBucket
+
+    # Two dispatchers (as in two worker processes) draw from the same budget.
+    first = SharedTokenBucket('test', rate_per_minute=600)
+    second = SharedTokenBucket('test', rate_per_minute=600)
+    await first.acquire(600)
+    start = time.monotonic()
+    await second.acquire(2)
+    assert time.monotonic() - start >= 0.15
+    assert second.available < 10
@@ -157,6 +157,8 @@ export interface PaginatedResponse<T> {
   page: number;
   pageSize: number;
   total: number;
+  hasMore?: boolean;
+  nextCursor?: string | null;
 }
 
 export interface PaginationParams {